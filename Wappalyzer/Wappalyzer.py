@@ -1,13 +1,229 @@
+import hashlib
 import json
 import logging
+import os
+import pickle
 import re
+import sys
+import tempfile
+import threading
 import warnings
 
 import pkg_resources
 from bs4 import BeautifulSoup
 
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+try:
+    import ahocorasick
+except ImportError:  # optional, LiteralScanner falls back to a regex
+    ahocorasick = None
+
 logger = logging.getLogger(name=__name__)
 
+# Bump whenever the layout of a prepared Wappalyzer instance changes, so that
+# caches written by older versions are rebuilt instead of loaded.
+CACHE_FORMAT = 3
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'urlscan')
+
+# Literals shorter than this are too common to be worth prefiltering on.
+MIN_LITERAL = 3
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter.
+_FOLD_TABLE = {0x130: 'i', 0x131: 'i', 0x17f: 's', 0x212a: 'k'}
+
+_REPEATS = tuple(getattr(sre_constants, name) for name in
+                 ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+                 if hasattr(sre_constants, name))
+
+
+def fold(text):
+    """
+    Case-fold `text` the way prefilter literals are folded.
+    """
+    return text.translate(_FOLD_TABLE).lower()
+
+
+def required_literals(pattern):
+    """
+    Return the literal strings a case-insensitive match of `pattern` must
+    contain, as a tuple of frozensets of folded strings: every match contains
+    at least one string from each set. Returns None if no useful literal is
+    required, in which case the pattern must always be evaluated.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.I)
+    except (re.error, RecursionError):
+        return None
+    exact, required = _literals(parsed)
+    if exact is not None:
+        required = [frozenset([exact])] if len(exact) >= MIN_LITERAL else []
+    return tuple(required) or None
+
+
+def _is_foldable(char):
+    # Cased non-ASCII characters may match several others under
+    # re.IGNORECASE, which plain lower() does not model.
+    return char < '\x80' or char.lower() == char == char.upper()
+
+
+def _literals(items):
+    """
+    Walk a parsed pattern, returning ``(exact, required)`` where `exact` is
+    the only string the pattern can match (or None) and `required` a list of
+    literal sets as described in `required_literals`.
+    """
+    required = []
+    run = []
+    exact = True
+
+    def end_run():
+        literal = ''.join(run)
+        if len(literal) >= MIN_LITERAL:
+            required.append(frozenset([literal]))
+        del run[:]
+
+    for op, av in items:
+        if op is sre_constants.LITERAL and _is_foldable(chr(av)):
+            run.append(chr(av).lower())
+            continue
+        if op is sre_constants.AT:
+            # Zero-width anchors keep the literals around them adjacent
+            continue
+        if op is sre_constants.SUBPATTERN:
+            sub_exact, sub_required = _literals(av[-1])
+            if sub_exact is not None:
+                run.append(sub_exact)
+                continue
+        exact = False
+        if op is sre_constants.SUBPATTERN:
+            end_run()
+            required.extend(sub_required)
+        elif op in _REPEATS:
+            low, high, body = av
+            sub_exact, sub_required = _literals(body)
+            if low == 0:
+                end_run()
+            elif sub_exact is not None:
+                # The first repetition ends the run before the repeat and the
+                # last one starts the run after it
+                run.append(sub_exact)
+                end_run()
+                run.append(sub_exact)
+            else:
+                end_run()
+                required.extend(sub_required)
+        elif op is sre_constants.BRANCH:
+            end_run()
+            alternatives = set()
+            for branch in av[1]:
+                sub_exact, sub_required = _literals(branch)
+                if sub_exact is not None and len(sub_exact) >= MIN_LITERAL:
+                    alternatives.add(sub_exact)
+                elif sub_required:
+                    alternatives.update(min(sub_required, key=len))
+                else:
+                    alternatives = None
+                    break
+            if alternatives:
+                required.append(frozenset(alternatives))
+        else:
+            end_run()
+
+    if exact:
+        return ''.join(run), []
+    end_run()
+    return None, required
+
+
+class LiteralScanner(object):
+    """
+    Multi-pattern matcher that finds which of a set of literals occur in a
+    folded text in a single pass.
+
+    With `pyahocorasick` installed the literals are compiled into an
+    Aho-Corasick automaton. Otherwise they are compiled into one trie-shaped
+    alternation inside a lookahead, so the regex engine tries the longest
+    literal at every position of the text, and literals that are prefixes of
+    a longer match are added from a precomputed table.
+    """
+
+    def __init__(self, literals):
+        self.literals = sorted(set(literals))
+        self.prefixes = {}
+        known = set(self.literals)
+        for literal in self.literals:
+            found = [literal[:i] for i in range(MIN_LITERAL, len(literal))
+                     if literal[:i] in known]
+            if found:
+                self.prefixes[literal] = found
+        self._regex = None
+        self._automaton = None
+
+    def __getstate__(self):
+        return self.literals, self.prefixes
+
+    def __setstate__(self, state):
+        self.literals, self.prefixes = state
+        self._regex = None
+        self._automaton = None
+
+    @staticmethod
+    def _trie_pattern(literals):
+        trie = {}
+        for literal in literals:
+            node = trie
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[''] = None
+
+        def build(node):
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            pattern = branches[0] if len(branches) == 1 else '(?:%s)' % '|'.join(branches)
+            if '' in node:
+                pattern = '(?:%s)?' % pattern
+            return pattern
+
+        return build(trie)
+
+    @property
+    def regex(self):
+        if self._regex is None:
+            self._regex = re.compile('(?=(%s))' % self._trie_pattern(self.literals))
+        return self._regex
+
+    @property
+    def automaton(self):
+        if self._automaton is None:
+            automaton = ahocorasick.Automaton()
+            for literal in self.literals:
+                automaton.add_word(literal, literal)
+            automaton.make_automaton()
+            self._automaton = automaton
+        return self._automaton
+
+    def scan(self, text):
+        """
+        Return the set of literals occurring in the folded `text`.
+        """
+        if not self.literals:
+            return set()
+        if ahocorasick is not None:
+            return {literal for _, literal in self.automaton.iter(text)}
+        found = set(self.regex.findall(text))
+        for literal in list(found):
+            found.update(self.prefixes.get(literal, ()))
+        return found
+
 
 class WappalyzerError(Exception):
     """
@@ -16,13 +232,77 @@ class WappalyzerError(Exception):
     pass
 
 
+class Pattern(object):
+    """
+    Case-insensitive regular expression that is compiled on first use.
+
+    Only the source is pickled, so prepared apps can be cached on disk
+    without paying for thousands of compilations when the cache is loaded.
+
+    `literals` optionally holds the prefilter computed by
+    `required_literals`.
+    """
+    __slots__ = ('pattern', 'literals', '_regex')
+
+    def __init__(self, pattern, literals=None):
+        self.pattern = pattern
+        self.literals = literals
+        self._regex = None
+
+    def __getstate__(self):
+        return self.pattern, self.literals
+
+    def __setstate__(self, state):
+        self.pattern, self.literals = state
+        self._regex = None
+
+    def possible(self, found):
+        """
+        Return False if the pattern cannot match a text in which only the
+        literals in `found` occur.
+        """
+        if self.literals is None:
+            return True
+        for choices in self.literals:
+            if found.isdisjoint(choices):
+                return False
+        return True
+
+    @property
+    def regex(self):
+        regex = self._regex
+        if regex is None:
+            try:
+                regex = re.compile(self.pattern, re.I)
+            except re.error as e:
+                warnings.warn(
+                    "Caught '{error}' compiling regex: {regex}"
+                        .format(error=e, regex=self.pattern)
+                )
+                # regex that never matches:
+                # http://stackoverflow.com/a/1845097/413622
+                regex = re.compile(r'(?!x)x')
+            self._regex = regex
+        return regex
+
+    def search(self, string):
+        return self.regex.search(string)
+
+    def findall(self, string):
+        return self.regex.findall(string)
+
+
 class WebPage(object):
     """
     Simple representation of a web page, decoupled
     from any particular HTTP library's API.
+
+    The page is parsed once; the parse tree, script sources, meta map,
+    decoded text and lowercased headers can be shared by every consumer
+    of the response.
     """
 
-    def __init__(self, url, html, headers):
+    def __init__(self, url, html, headers, cookies=None):
         """
         Initialize a new WebPage object.
 
@@ -34,24 +314,28 @@ class WebPage(object):
         html : str
             The web page content (HTML)
         headers : dict
-            The HTTP response headers
+            The HTTP response headers, stored with lowercased names
+        cookies : dict, optional
+            The cookies set by the response
         """
         self.url = url
         self.html = html
-        self.headers = headers
 
         try:
-            self.headers.keys()
+            headers.keys()
         except AttributeError:
             raise ValueError("Headers must be a dictionary-like object")
 
+        self.headers = {k.lower(): v for k, v in headers.items()}
+        self.cookies = {k.lower(): v for k, v in (cookies or {}).items()}
+
         self._parse_html()
 
     def _parse_html(self):
         """
         Parse the HTML with BeautifulSoup to find <script> and <meta> tags.
         """
-        self.parsed_html = soup = BeautifulSoup(self.html, 'html.parser')
+        self.parsed_html = soup = BeautifulSoup(self.html, 'lxml')
         self.scripts = [script['src'] for script in
                         soup.findAll('script', src=True)]
         self.meta = {
@@ -89,14 +373,21 @@ class WebPage(object):
 
         response : requests.Response object
         """
-        return cls(response.url, html=response.text, headers=response.headers)
+        return cls(response.url, html=response.text, headers=response.headers,
+                   cookies=response.cookies.get_dict())
 
 
 class Wappalyzer(object):
     """
     Python Wappalyzer driver.
+
+    Once constructed an instance is never modified, so a single instance
+    can be shared by any number of threads (see `Wappalyzer.shared`).
     """
 
+    _shared = None
+    _shared_lock = threading.Lock()
+
     def __init__(self, categories, apps):
         """
         Initialize a new Wappalyzer instance.
@@ -111,24 +402,135 @@ class Wappalyzer(object):
         """
         self.categories = categories
         self.apps = apps
-        self.app_version = {}
 
         for name, app in self.apps.items():
             self._prepare_app(app)
 
+        self._build_index()
+
+    def _build_index(self):
+        """
+        Index the apps by the header, meta and cookie names and the prefilter
+        literals their signatures reference, so that analysis only visits the
+        apps that can match a given page.
+        """
+        self._app_list = list(self.apps.items())
+        self._always = []
+        self._index = {key: {} for key in ['headers', 'meta', 'cookies', 'literals']}
+        for i, (name, app) in enumerate(self._app_list):
+            always = bool(app['url'])
+            for key in ['headers', 'meta', 'cookies']:
+                for key_name in app[key]:
+                    self._index[key].setdefault(key_name, []).append(i)
+            for regex in app['script'] + app['html']:
+                if regex.literals is None:
+                    always = True
+                    continue
+                for choices in regex.literals:
+                    for literal in choices:
+                        apps = self._index['literals'].setdefault(literal, [])
+                        if not apps or apps[-1] != i:
+                            apps.append(i)
+            if always:
+                self._always.append(i)
+        self._scanner = LiteralScanner(self._index['literals'])
+
     @classmethod
-    def latest(cls, apps_file=None):
+    def latest(cls, apps_file=None, cache_dir=CACHE_DIR):
         """
         Construct a Wappalyzer instance using a apps db path passed in via
         apps_file, or alternatively the default in data/apps.json
+
+        The prepared apps are cached in `cache_dir`, keyed on the content of
+        the apps db and the Python version, and reused by later runs. Pass
+        ``cache_dir=None`` to always build from scratch.
         """
         if apps_file:
-            with open(apps_file, 'r') as fd:
-                obj = json.load(fd)
+            with open(apps_file, 'rb') as fd:
+                raw = fd.read()
         else:
-            obj = json.loads(pkg_resources.resource_string(__name__, "data/apps.json"))
+            raw = pkg_resources.resource_string(__name__, "data/apps.json")
+
+        cache_file = None
+        if cache_dir:
+            cache_file = cls._cache_file(raw, cache_dir)
+            instance = cls._load_cache(cache_file)
+            if instance is not None:
+                return instance
+
+        obj = json.loads(raw)
+        instance = cls(categories=obj['categories'], apps=obj['apps'])
+        if cache_file:
+            instance._save_cache(cache_file)
+        return instance
+
+    @staticmethod
+    def _cache_file(raw, cache_dir):
+        """
+        Return the cache path for the apps db content `raw`.
+        """
+        digest = hashlib.sha256(raw).hexdigest()[:32]
+        name = 'wappalyzer-{format}-{tag}-{digest}.pickle'.format(
+            format=CACHE_FORMAT, tag=sys.implementation.cache_tag, digest=digest)
+        return os.path.join(cache_dir, name)
 
-        return cls(categories=obj['categories'], apps=obj['apps'])
+    @classmethod
+    def _load_cache(cls, cache_file):
+        """
+        Load a prepared instance from `cache_file`, or return None if it is
+        missing or unusable.
+        """
+        try:
+            with open(cache_file, 'rb') as fd:
+                instance = pickle.load(fd)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache %s: %s", cache_file, e)
+            return None
+        if not isinstance(instance, cls):
+            return None
+        return instance
+
+    def _save_cache(self, cache_file):
+        """
+        Atomically write this instance to `cache_file` and drop the stale
+        caches it replaces. Failures are logged and otherwise ignored.
+        """
+        cache_dir, name = os.path.split(cache_file)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, cache_file)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            logger.warning("Could not write cache %s: %s", cache_file, e)
+            return
+
+        prefix = name.rsplit('-', 1)[0] + '-'
+        for other in os.listdir(cache_dir):
+            if other.startswith(prefix) and other != name:
+                try:
+                    os.unlink(os.path.join(cache_dir, other))
+                except OSError:
+                    pass
+
+    @classmethod
+    def shared(cls):
+        """
+        Return the process-wide Wappalyzer instance built from the default
+        apps db, constructing it on first use.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls.latest()
+        return cls._shared
 
     def _prepare_app(self, app):
         """
@@ -146,7 +548,7 @@ class Wappalyzer(object):
                     app[key] = [value]
 
         # Ensure these keys exist
-        for key in ['headers', 'meta']:
+        for key in ['headers', 'meta', 'cookies']:
             try:
                 value = app[key]
             except KeyError:
@@ -158,40 +560,38 @@ class Wappalyzer(object):
             app['meta'] = {'generator': obj}
 
         # Ensure keys are lowercase
-        for key in ['headers', 'meta']:
+        for key in ['headers', 'meta', 'cookies']:
             obj = app[key]
             app[key] = {k.lower(): v for k, v in obj.items()}
 
         # Prepare regular expression patterns
         for key in ['url', 'html', 'script']:
-            app[key] = [self._prepare_pattern(pattern) for pattern in app[key]]
+            app[key] = [self._prepare_pattern(pattern, prefilter=key != 'url')
+                        for pattern in app[key]]
 
-        for key in ['headers', 'meta']:
+        for key in ['headers', 'meta', 'cookies']:
             obj = app[key]
             for name, pattern in obj.items():
                 obj[name] = self._prepare_pattern(obj[name])
 
-    def _prepare_pattern(self, pattern):
+    def _prepare_pattern(self, pattern, prefilter=False):
         """
-        Strip out key:value pairs from the pattern and compile the regular
-        expression.
+        Strip out key:value pairs from the pattern and wrap the regular
+        expression, which is compiled when first used. With `prefilter`, the
+        literals a match requires are extracted too.
         """
         regex, _, rest = pattern.partition('\\;')
         # regex = pattern
-        try:
-            return re.compile(regex, re.I)
-        except re.error as e:
-            warnings.warn(
-                "Caught '{error}' compiling regex: {regex}"
-                    .format(error=e, regex=regex)
-            )
-            # regex that never matches:
-            # http://stackoverflow.com/a/1845097/413622
-            return re.compile(r'(?!x)x')
-
-    def _has_app(self, app, webpage):
+        literals = required_literals(regex) if prefilter else None
+        return Pattern(regex, literals)
+
+    def _has_app(self, app, webpage, html_literals=None, script_literals=None):
         """
         Determine whether the web page matches the app signature.
+
+        `html_literals` and `script_literals` are the prefilter literals found
+        in the page HTML and script sources; patterns whose required literals
+        are missing are skipped without running the regex.
         """
         # Search the easiest things first and save the full-text search of the
         # HTML for last
@@ -208,7 +608,14 @@ class Wappalyzer(object):
                     # print(version)
                     return True, version
 
+        for name, regex in app['cookies'].items():
+            if name in webpage.cookies:
+                if regex.search(webpage.cookies[name]):
+                    return True, version
+
         for regex in app['script']:
+            if script_literals is not None and not regex.possible(script_literals):
+                continue
             for script in webpage.scripts:
                 if regex.search(script):
                     return True, version
@@ -220,13 +627,18 @@ class Wappalyzer(object):
                     return True, version
 
         for regex in app['html']:
+            if html_literals is not None and not regex.possible(html_literals):
+                continue
             if regex.search(webpage.html):
                 return True, version
         return False, None
 
-    def _get_implied_apps(self, detected_apps, versions):
+    def _get_implied_apps(self, detected_apps, versions, app_version):
         """
         Get the set of apps implied by `detected_apps`.
+
+        `app_version` maps app names to the versions found so far during the
+        current analysis and is updated in place.
         """
 
         def __get_implied_apps(apps, version):
@@ -235,7 +647,7 @@ class Wappalyzer(object):
                 try:
                     app_info = self.apps[app]
                     if version:
-                        self.app_version[app] = version[0]
+                        app_version[app] = version[0]
 
                     # print(app_info)
                     if app_info['implies']:
@@ -244,7 +656,7 @@ class Wappalyzer(object):
                                 "name": t,
                                 "icon": self.apps[t]['icon'],
                                 "website": self.apps[t]['website'],
-                                "version": self.app_version[app],
+                                "version": app_version[app],
                             }
                             _implied_apps.append(_dirs)
                     else:
@@ -253,7 +665,7 @@ class Wappalyzer(object):
                             "name": app,
                             "icon": self.apps[app]['icon'],
                             "website": self.apps[app]['website'],
-                            "version": self.app_version[app]
+                            "version": app_version[app]
                         }
                         _implied_apps.append(_dirs)
                 except KeyError:
@@ -281,17 +693,34 @@ class Wappalyzer(object):
 
         return cat_names
 
+    def _candidates(self, webpage, literals):
+        """
+        Return the ``(name, app)`` pairs that may match the web page, in the
+        order of the apps db.
+        """
+        index = self._index
+        candidates = set(self._always)
+        for key in ['headers', 'meta', 'cookies']:
+            for name in getattr(webpage, key):
+                candidates.update(index[key].get(name, ()))
+        for literal in literals:
+            candidates.update(index['literals'][literal])
+        return [self._app_list[i] for i in sorted(candidates)]
+
     def analyze(self, webpage):
         """
         Return a list of applications that can be detected on the web page.
         """
         _detected_apps = set()
         detected_apps = []
-        for app_name, app in self.apps.items():
-            is_match, version = self._has_app(app, webpage)
+        app_version = {}
+        html_literals = self._scanner.scan(fold(webpage.html))
+        script_literals = self._scanner.scan(fold('\n'.join(webpage.scripts)))
+        for app_name, app in self._candidates(webpage, html_literals | script_literals):
+            is_match, version = self._has_app(app, webpage, html_literals, script_literals)
             if is_match:
                 _detected_apps.add(app_name)
-                detected_apps = self._get_implied_apps(_detected_apps, version)
+                detected_apps = self._get_implied_apps(_detected_apps, version, app_version)
 
         return detected_apps
 
@@ -0,0 +1,710 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# WgpSec Team
+"""
+性能基准测试，不访问外网
+
+    python benchmark.py startup     # 指纹库冷启动/热启动耗时
+    python benchmark.py analyze     # 单个页面指纹识别耗时
+    python benchmark.py parse       # 单个页面解析耗时（标题、指纹、WAF共用一次解析）
+    python benchmark.py waf         # 单个响应 identwaf(findall=True) 耗时
+    python benchmark.py fetch       # 线程池模式与asyncio模式每秒完成的URL数
+    python benchmark.py scheme      # 没有协议头的目标，依次尝试与同时尝试http/https的耗时
+    python benchmark.py deadline    # 慢速目标的单个目标总耗时是否受 target_time_out 限制
+    python benchmark.py pool        # 长连接复用省去的TCP/TLS握手次数及耗时
+    python benchmark.py stream      # 读取目标、提交任务、写出结果的内存峰值随目标数的变化
+    python benchmark.py write       # 逐行写入与写入线程批量写入 CSV、JSON Lines 结果的速度，以及扫描线程因写入等待的时间
+    python benchmark.py store       # SQLite 结果库的写入速度，以及查询两次扫描之间变化的耗时
+    python benchmark.py incremental # 完整扫描与增量扫描（页面未变化时跳过指纹、WAF识别）的耗时
+    python benchmark.py warc        # 保存 WARC 归档对扫描耗时的影响
+    python benchmark.py replay      # 离线重新识别 WARC 归档的速度
+    python benchmark.py dirscan     # 关键词逐个搜索与多线程限速搜索的耗时、请求数
+    python benchmark.py pipeline    # 主域名收集+URL探测：先搜索完再探测与边搜索边探测的总耗时
+    python benchmark.py resume      # 完成记录的额外耗时
+
+需要目标站点的测试使用本地 127.0.0.1 上的模拟服务器（tests/standin.py）。
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import csv
+import gzip
+import inspect
+import json
+import os
+import re
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+import warnings
+from concurrent import futures
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from scan import (CSV_FIELDS, CompletionJournal, CsvSink, Deadline, JsonlSink, ResultWriter, SqliteSink, UrlScan,
+                  aiohttp, scan_changes, zstandard)
+from Wappalyzer.Wappalyzer import Wappalyzer, WebPage
+from tests.standin import (SAMPLE_HEADERS, STAND_IN_SITES, StandInHandler, StandInTLSServer, StubUrlScan, sample_page,
+                           sample_response, stand_in_server)
+from wafw00f.main import WAFW00F
+
+
+def timeit(func, repeat):
+    """
+    运行 repeat 次，返回每次耗时（秒）的中位数
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_startup(args):
+    cache_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    webpage = WebPage('https://www.wgpsec.org/', sample_page(), dict(SAMPLE_HEADERS))
+
+    def nocache():
+        Wappalyzer.latest(cache_dir=None)
+
+    def cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        Wappalyzer.latest(cache_dir=cache_dir)
+
+    def warm():
+        Wappalyzer.latest(cache_dir=cache_dir)
+
+    def first_analyze():
+        Wappalyzer.latest(cache_dir=cache_dir).analyze(webpage)
+
+    try:
+        print(f'不使用缓存      {timeit(nocache, args.repeat) * 1000:8.1f} ms')
+        print(f'冷启动(写缓存)  {timeit(cold, args.repeat) * 1000:8.1f} ms')
+        warm()
+        print(f'热启动(读缓存)  {timeit(warm, args.repeat) * 1000:8.1f} ms')
+        print(f'热启动+首次识别 {timeit(first_analyze, args.repeat) * 1000:8.1f} ms')
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def bench_analyze(args):
+    wappalyzer = Wappalyzer.latest(cache_dir=None)
+    webpage = WebPage('https://www.wgpsec.org/', sample_page(), dict(SAMPLE_HEADERS))
+    wappalyzer.analyze(webpage)
+    elapsed = timeit(lambda: wappalyzer.analyze(webpage), args.repeat)
+    print(f'指纹识别 {len(webpage.html) // 1024} KB 页面 {elapsed * 1000:8.1f} ms')
+
+
+def bench_parse(args):
+    scan = UrlScan()
+    response = sample_response()
+    # 每次 identwaf(findall=True) 调用 matchContent 的次数
+    content_checks = sum(inspect.getsource(plugin.is_waf).count('matchContent(')
+                         for plugin in WAFW00F.plugin_dict.values())
+
+    def before():
+        # 标题、指纹各解析一次，WAF 每条正文规则都重新解码一次
+        BeautifulSoup(response.text, 'lxml').title
+        soup = BeautifulSoup(response.text, 'html.parser')
+        soup.findAll('script', src=True)
+        soup.findAll('meta', attrs=dict(name=True, content=True))
+        for _ in range(content_checks):
+            response.text
+
+    def after():
+        webpage = scan.get_webpage(response)
+        scan.get_title(webpage)
+        attacker = WAFW00F(response.url)
+        for _ in range(content_checks):
+            attacker.responseText(response)
+
+    print(f'页面大小 {len(response.content) // 1024} KB，WAF正文规则 {content_checks} 条')
+    old = timeit(before, args.repeat)
+    new = timeit(after, args.repeat)
+    print(f'分别解析 {old * 1000:8.1f} ms/页')
+    print(f'共用解析 {new * 1000:8.1f} ms/页')
+    print(f'节省     {(old - new) * 1000:8.1f} ms/页')
+
+
+class OfflineWAFW00F(WAFW00F):
+    """
+    使用给定的正常响应和攻击响应，不发出请求
+    """
+
+    def __init__(self, baseline, attack):
+        WAFW00F.__init__(self, baseline.url)
+        self.rq = baseline
+        self.attack = attack
+
+    def centralAttack(self):
+        return self.attack
+
+
+class UncompiledWAFW00F(OfflineWAFW00F):
+    """
+    旧的匹配方式：每次用正则字符串调用 re.search
+    """
+
+    def matchHeader(self, headermatch, attack=False):
+        r = self.attackres if attack else self.rq
+        header, match = headermatch
+        headerval = r.headers.get(header)
+        if headerval:
+            headervals = headerval.split(', ') if header == 'Set-Cookie' else [headerval]
+            for headerval in headervals:
+                if re.search(match, headerval, re.I):
+                    return True
+        return False
+
+    def matchContent(self, regex, attack=True):
+        r = self.attackres if attack else self.rq
+        return bool(re.search(regex, self.responseText(r), re.I))
+
+
+class PluginLoopWAFW00F(OfflineWAFW00F):
+    """
+    逐个调用插件的 is_waf()，不使用签名索引
+    """
+
+    def identwaf(self, findall=False):
+        self.attackres = self.centralAttack()
+        detected = []
+        for wafvendor in self.checklist:
+            if self.wafdetections[wafvendor](self):
+                detected.append(wafvendor)
+                if not findall:
+                    break
+        return detected
+
+
+def bench_waf(args):
+    baseline = sample_response()
+    attack = sample_response()
+    attack.status_code = 403
+
+    def identwaf(cls, purge=False):
+        if purge:
+            # 模拟 re 模块内部缓存被进程里其它正则挤掉
+            re.purge()
+        cls(baseline, attack).identwaf(findall=True)
+
+    identwaf(UncompiledWAFW00F)
+    identwaf(PluginLoopWAFW00F)
+    identwaf(OfflineWAFW00F)
+    print(f'签名 {len(WAFW00F.engine.vendors)} 个，插件正则 {len(WAFW00F.patterns)} 条（去重后）')
+    print(f're.search(字符串)，缓存命中 {timeit(lambda: identwaf(UncompiledWAFW00F), args.repeat) * 1000:8.1f} ms/响应')
+    print(f're.search(字符串)，缓存失效 {timeit(lambda: identwaf(UncompiledWAFW00F, True), args.repeat) * 1000:8.1f} ms/响应')
+    print(f'预编译正则表，逐个插件     {timeit(lambda: identwaf(PluginLoopWAFW00F), args.repeat) * 1000:8.1f} ms/响应')
+    print(f'预编译正则表，签名索引     {timeit(lambda: identwaf(OfflineWAFW00F), args.repeat) * 1000:8.1f} ms/响应')
+
+
+def bench_fetch(args):
+    scan = UrlScan()
+    Wappalyzer.shared()
+
+    def run(mode, urls):
+        scan.url_list = urls
+        rows = []
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            if mode == 'async':
+                asyncio.run(scan.url_scan_async(enumerate(urls), lambda index, row: rows.append(row)))
+            else:
+                scan.url_scan_threads(enumerate(urls), lambda index, row: rows.append(row))
+        return rows, time.perf_counter() - start
+
+    with contextlib.ExitStack() as stack:
+        # 多个模拟服务器，每个请求延迟 args.delay 秒，模拟响应慢的站点
+        servers = [stack.enter_context(stand_in_server(args.delay)) for _ in range(args.servers)]
+        urls = [f'{server.base_url}/{site}/{i}'
+                for i in range(args.targets) for server in servers for site in STAND_IN_SITES]
+        print(f'{len(urls)} 个目标，{len(servers)} 个模拟服务器，响应延迟 {args.delay * 1000:.0f} ms')
+        for mode, concurrency in (('threads', f'{scan.pool_max_workers} 线程'),
+                                  ('async', f'{scan.async_max_connections} 连接')):
+            rows, elapsed = run(mode, urls)
+            print(f'{mode:8} {concurrency:10} 耗时 {elapsed:6.2f} s，{len(rows) / elapsed:8.1f} URL/s')
+
+
+def bench_scheme(args):
+    scan = UrlScan()
+    scan.http_time_out = args.timeout
+
+    with StandInTLSServer(StandInHandler) as server:
+        host = server.base_url[len('http://'):]
+        targets = [f'{host}/plain/{i}' for i in range(args.targets)]
+        print(f'{len(targets)} 个只提供HTTPS的目标（明文HTTP无响应），请求超时 {args.timeout} s')
+        for race, name in ((False, '依次尝试'), (True, '同时尝试')):
+            scan.scheme_race = race
+            schemes = []
+
+            def probe(target):
+                start = time.perf_counter()
+                response, scheme = scan.check_http(target)
+                schemes.append(scheme)
+                return time.perf_counter() - start
+
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                with futures.ThreadPoolExecutor(max_workers=scan.pool_max_workers) as pool:
+                    elapsed = list(pool.map(probe, targets))
+            print(f'{name} 每个目标中位数 {statistics.median(elapsed):6.2f} s，'
+                  f'最慢 {max(elapsed):6.2f} s，成功协议 {dict(collections.Counter(schemes))}')
+
+
+def bench_deadline(args):
+    scan = UrlScan()
+    scan.target_time_out = args.timeout
+    scan.scheme_race = False
+    Wappalyzer.shared()
+
+    with stand_in_server(0.01) as server, StandInTLSServer(StandInHandler) as tls:
+        # 慢速发送内容、只提供HTTPS（明文HTTP无响应）、多次重定向、正常站点
+        kinds = {
+            'drip': f'{server.base_url}/drip/',
+            'https-only': tls.base_url[len('http://'):] + '/plain/',
+            'redirect': f'{server.base_url}/redirect/5/sucuri/',
+            'plain': f'{server.base_url}/plain/',
+        }
+        targets = [(kind, f'{url}{i}') for i in range(args.targets) for kind, url in kinds.items()]
+        print(f'{len(targets)} 个目标，每个目标总耗时上限 {args.timeout} s')
+
+        def timed(target):
+            start = time.perf_counter()
+            scan.action(target[1])
+            return target[0], time.perf_counter() - start
+
+        async def timed_async(session, target):
+            start = time.perf_counter()
+            deadline = Deadline(scan.target_time_out)
+            res, scheme = await scan.async_check_http(session, target[1], deadline)
+            if res is not None and not deadline.expired():
+                await scan.async_waf_attack(session, res.url, deadline)
+            return target[0], time.perf_counter() - start
+
+        async def run_async():
+            async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False)) as session:
+                return await asyncio.gather(*(timed_async(session, target) for target in targets))
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            with futures.ThreadPoolExecutor(max_workers=scan.pool_max_workers) as pool:
+                threaded = list(pool.map(timed, targets))
+            asynced = asyncio.run(run_async())
+
+    for mode, results in (('threads', threaded), ('async', asynced)):
+        for kind in kinds:
+            elapsed = [seconds for k, seconds in results if k == kind]
+            print(f'{mode:8} {kind:11} 中位数 {statistics.median(elapsed):6.2f} s，最慢 {max(elapsed):6.2f} s')
+
+
+class ClosingUrlScan(UrlScan):
+    """
+    每个请求都带 Connection: close，不复用连接
+    """
+
+    def make_session(self):
+        session = UrlScan.make_session(self)
+        session.headers['Connection'] = 'close'
+        return session
+
+
+def bench_pool(args):
+    Wappalyzer.shared()
+    with StandInTLSServer(StandInHandler) as server:
+        base_url = server.base_url.replace('http://', 'https://')
+        # 同一主机上的多个目标，每个目标请求首页并发出WAF攻击探测
+        urls = [f'{base_url}/{site}/{i}' for i in range(args.targets) for site in STAND_IN_SITES]
+        print(f'{len(urls)} 个HTTPS目标')
+        for name, cls in (('不复用连接', ClosingUrlScan), ('长连接复用', UrlScan)):
+            scan = cls()
+            scan.url_list = urls
+            rows = []
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scan.url_scan_threads(enumerate(urls), lambda index, row: rows.append(row))
+            elapsed = time.perf_counter() - start
+            print(f'{name} 耗时 {elapsed:6.2f} s')
+            print('  ' + scan.connection_stats.summary(len(urls)))
+
+
+class ListUrlScan(StubUrlScan):
+    """
+    旧的方式：readlines 读入全部目标，一次性提交所有任务
+    """
+
+    def get_url_list(self):
+        with open(self.url_file, 'r') as files:
+            self.url_list = [line.strip('\n') for line in files.readlines()]
+
+    def url_scan_threads(self, targets, write_row):
+        pool = futures.ThreadPoolExecutor(max_workers=self.pool_max_workers)
+        wait_for = {pool.submit(self.action, task_url): index for index, task_url in targets}
+        for fs in futures.as_completed(wait_for):
+            write_row(wait_for[fs], fs.result())
+        pool.shutdown()
+
+
+def bench_stream(args):
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    try:
+        for lines in (args.lines // 10, args.lines):
+            path = os.path.join(work_dir, f'domain-{lines}.txt')
+            with open(path, 'w') as f:
+                for i in range(lines):
+                    f.write(f'host{i}.example.com\n')
+            with open(path, 'rb') as f, gzip.open(path + '.gz', 'wb') as gz:
+                shutil.copyfileobj(f, gz)
+            for name, cls, url_file in (('一次性提交', ListUrlScan, path), ('流式窗口', StubUrlScan, path),
+                                        ('流式窗口.gz', StubUrlScan, path + '.gz')):
+                scan = cls()
+                scan.url_file = url_file
+                written = collections.Counter()
+                tracemalloc.start()
+                start = time.perf_counter()
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    scan.get_url_list()
+                    scan.url_scan_threads(enumerate(scan.url_list), lambda index, row: written.update(('rows',)))
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f'{lines:9} 个目标 {name:8} 内存峰值 {peak / 1024 / 1024:8.1f} MB，'
+                      f'耗时 {elapsed:6.2f} s，写出 {written["rows"]} 条')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_write(args):
+    fig = [{'icon': 'CloudFlare.svg', 'name': 'CloudFlare', 'version': '', 'website': 'http://www.cloudflare.com'},
+           {'icon': 'Nginx.svg', 'name': 'Nginx', 'version': '', 'website': 'http://nginx.org/en'}]
+    rows = [{'域名': f'host{i}.example.com', 'url': f'https://host{i}.example.com/', '标题': f'标题 {i}',
+             'http状态码': 200, 'web指纹': fig, 'WAF': 'Cloudflare (Cloudflare Inc.)', '协议': 'https'}
+            for i in range(args.lines)]
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    try:
+        path = os.path.join(work_dir, 'result.csv')
+        with open(path, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
+            start = time.perf_counter()
+            for row in rows:
+                writer.writerow(dict(row, web指纹=json.dumps(row['web指纹'], sort_keys=True, separators=(',', ':'))))
+            elapsed = time.perf_counter() - start
+        print(f'逐行写入           {len(rows)} 行，扫描线程等待 {elapsed:6.2f} s，{len(rows) / elapsed:9.0f} 行/s')
+
+        outputs = [('csv', False), ('csv', True), ('jsonl', False), ('jsonl.gz', False)]
+        if zstandard is not None:
+            outputs.append(('jsonl.zst', False))
+        for suffix, journal in outputs:
+            path = os.path.join(work_dir, f'result-{journal}.{suffix}')
+            sink = CsvSink(path) if suffix == 'csv' else JsonlSink(path)
+            completion = CompletionJournal(path + '.journal', 'bench').open() if journal else None
+            result_writer = ResultWriter([sink], completion)
+            start = time.perf_counter()
+            for index, row in enumerate(rows):
+                result_writer.put(index, row)
+            blocked = time.perf_counter() - start
+            result_writer.close()
+            elapsed = time.perf_counter() - start
+            sink.close()
+            if completion is not None:
+                completion.close(remove=True)
+            name = f'写入线程 {suffix}{"+完成记录" if journal else ""}'
+            print(f'{name:18} 扫描线程等待 {blocked:6.2f} s，全部写完 {elapsed:6.2f} s，'
+                  f'文件 {os.path.getsize(path) / 1024 / 1024:6.1f} MB')
+            print('  ' + result_writer.summary())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_store(args):
+    fig = [{'icon': 'CloudFlare.svg', 'name': 'CloudFlare', 'version': '', 'website': 'http://www.cloudflare.com'},
+           {'icon': 'Nginx.svg', 'name': 'Nginx', 'version': '1.18', 'website': 'http://nginx.org/en'}]
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    try:
+        path = os.path.join(work_dir, 'urlscan.db')
+        for run in range(3):
+            # 每次扫描有 1% 的目标状态码变化
+            rows = [{'目标': f'host{i}.example.com', '域名': f'host{i}.example.com',
+                     'url': f'https://host{i}.example.com/', '标题': f'标题 {i}',
+                     'http状态码': 500 if (i + run) % 100 == 0 else 200, 'web指纹': fig,
+                     'WAF': 'Cloudflare (Cloudflare Inc.)' if i % 3 == 0 else '', '协议': 'https'}
+                    for i in range(args.lines)]
+            store = SqliteSink(path, 'domain.txt')
+            result_writer = ResultWriter([store])
+            start = time.perf_counter()
+            for index, row in enumerate(rows):
+                result_writer.put(index, row)
+            result_writer.close()
+            elapsed = time.perf_counter() - start
+            store.finish()
+            store.close()
+            print(f'第 {run + 1} 次扫描 写入 {len(rows)} 个目标 {elapsed:6.2f} s，{len(rows) / elapsed:9.0f} 行/s')
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            old_run, new_run, changes = scan_changes(path)
+            timings.append(time.perf_counter() - start)
+        print(f'对比扫描 {old_run} 和 {new_run}：{len(changes)} 个目标有变化，'
+              f'查询耗时 {statistics.median(timings) * 1000:.1f} ms，数据库 {os.path.getsize(path) / 1024 / 1024:.1f} MB')
+        db = sqlite3.connect(path)
+        start = time.perf_counter()
+        count, = db.execute("SELECT count(*) FROM technologies WHERE name = 'Nginx' AND run_id = ?",
+                            (new_run,)).fetchone()
+        print(f'查询使用 Nginx 的目标 {count} 个，耗时 {(time.perf_counter() - start) * 1000:.1f} ms')
+        db.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_incremental(args):
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    try:
+        with stand_in_server(args.delay) as server:
+            path = os.path.join(work_dir, 'domain.txt')
+            with open(path, 'w') as f:
+                for i in range(args.targets):
+                    for site in ('plain', 'cloudflare', 'etag', 'changing'):
+                        f.write(f'{server.base_url}/{site}/{i}\n')
+            for name, incremental in (('完整扫描', False), ('增量扫描', True), ('再次增量', True)):
+                scan = UrlScan()
+                scan.url_file = path
+                scan.result_file = os.path.join(work_dir, f'{name}.csv')
+                scan.sqlite_file = os.path.join(work_dir, 'urlscan.db')
+                scan.incremental = incremental
+                StandInHandler.requests.clear()
+                start = time.perf_counter()
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    scan.get_url_list()
+                    scan.url_scan()
+                elapsed = time.perf_counter() - start
+                print(f'{name} 耗时 {elapsed:6.2f} s，页面请求 {StandInHandler.requests["page"]} 次，'
+                      f'WAF攻击探测 {StandInHandler.requests["attack"]} 次')
+                if incremental:
+                    print('  ' + scan.incremental_stats.summary())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_warc(args):
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    try:
+        with stand_in_server(args.delay) as server:
+            path = os.path.join(work_dir, 'domain.txt')
+            with open(path, 'w') as f:
+                for i in range(args.targets):
+                    for site in STAND_IN_SITES:
+                        f.write(f'{server.base_url}/{site}/{i}\n')
+            for name, warc_file in (('不归档', None), ('WARC', 'urlscan.warc'), ('WARC.gz', 'urlscan.warc.gz')):
+                scan = UrlScan()
+                scan.url_file = path
+                scan.result_file = os.path.join(work_dir, 'result.csv')
+                scan.warc_file = warc_file and os.path.join(work_dir, warc_file)
+                start = time.perf_counter()
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    scan.get_url_list()
+                    scan.url_scan()
+                elapsed = time.perf_counter() - start
+                print(f'{name:8} 扫描耗时 {elapsed:6.2f} s')
+                if scan.archive is not None:
+                    print('  ' + scan.archive.summary())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_replay(args):
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    try:
+        path = os.path.join(work_dir, 'domain.txt')
+        scan = UrlScan()
+        scan.url_file = path
+        scan.result_file = os.path.join(work_dir, 'online.csv')
+        scan.sqlite_file = os.path.join(work_dir, 'urlscan.db')
+        scan.warc_file = os.path.join(work_dir, 'urlscan.warc.gz')
+        with stand_in_server(0) as server:
+            with open(path, 'w') as f:
+                for i in range(args.targets):
+                    for site in STAND_IN_SITES:
+                        f.write(f'{server.base_url}/{site}/{i}\n')
+                f.write(f'{server.base_url}/redirect/2/cloudflare/0\n')
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scan.get_url_list()
+                scan.url_scan()
+            print(f'在线扫描 耗时 {time.perf_counter() - start:6.2f} s，'
+                  f'归档 {os.path.getsize(scan.warc_file) / 1024 / 1024:.1f} MB')
+
+        def rows(result_file):
+            with open(result_file) as f:
+                return sorted(f)
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            scan.replay_file = scan.warc_file
+            scan.replay_workers = workers
+            scan.result_file = os.path.join(work_dir, f'replay-{workers}.csv')
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scan.replay()
+            elapsed = time.perf_counter() - start
+            print(f'离线重新识别 {workers} 个进程 耗时 {elapsed:6.2f} s，{(len(rows(scan.result_file)) - 1) / elapsed:6.0f} 个/s')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+class SequentialDirUrlScan(UrlScan):
+    """
+    旧的方式：逐个搜索关键词，完整访问跳转后的目标网站
+    """
+
+    def dir_scan(self):
+        for task_keyword in self.dict_url:
+            self.dir_scan_action(task_keyword)
+
+    def dir_scan_action(self, task_keyword):
+        headers = self.gen_fake_header()
+        edu_response_url = None
+        try:
+            response = self.session.get(url=self.search_url.format(task_keyword), headers=headers, verify=False,
+                                        timeout=30)
+            edu_url = urljoin(response.url, etree.HTML(response.text).xpath('//*[@id="1"]/h3/a[1]/@href')[0])
+            edu_response_url = self.session.get(url=edu_url, verify=False, headers=headers).url
+            edu_response = re.findall(r'www.(.*?)/', edu_response_url)[0]
+        except:
+            edu_response = "None"
+        self.dir_result.append({"title": task_keyword, "domain": edu_response, "url": edu_response_url})
+        self.url_list.append(edu_response_url)
+
+
+def bench_dirscan(args):
+    keywords = [f'school{i}' for i in range(args.targets)]
+    with stand_in_server(args.delay) as server:
+        # 跳转后的目标网站也由模拟服务器提供
+        proxies = {'http': server.base_url}
+        for name, cls, rate_limit in (('逐个搜索', SequentialDirUrlScan, 0), ('多线程不限速', UrlScan, 0),
+                                      ('多线程限速', UrlScan, args.rate)):
+            scan = cls()
+            scan.search_url = server.base_url + '/s?wd={}'
+            scan.session.proxies.update(proxies)
+            scan.dict_url = keywords
+            scan.dir_rate_limit = rate_limit
+            scan.dir_delay = 0
+            StandInHandler.requests.clear()
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scan.dir_scan()
+            elapsed = time.perf_counter() - start
+            counts = StandInHandler.requests
+            limit = f'（每秒 {rate_limit} 个请求）' if rate_limit else ''
+            print(f'{name}{limit}：{len(keywords)} 个关键词耗时 {elapsed:6.2f} s，'
+                  f'搜索 {counts["search"]} 次，跳转 {counts["link"]} 次，访问目标网站 {counts["page"]} 次')
+
+
+def bench_pipeline(args):
+    keywords = [f'school{i}' for i in range(args.targets)]
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    environ = dict(os.environ)
+    try:
+        with stand_in_server(args.delay) as server:
+            # 搜索到的目标网站也由模拟服务器提供
+            os.environ.update(http_proxy=server.base_url, no_proxy='127.0.0.1')
+            for mode in ('threads', 'async'):
+                if mode == 'async' and aiohttp is None:
+                    print('没有安装aiohttp，跳过 async 模式')
+                    continue
+                for name in ('先搜索完再探测', '边搜索边探测'):
+                    scan = UrlScan()
+                    scan.async_mode = mode == 'async'
+                    scan.search_url = server.base_url + '/s?wd={}'
+                    scan.dict_url = keywords
+                    scan.dir_rate_limit = args.rate
+                    scan.dir_delay = 0
+                    scan.result_file = os.path.join(work_dir, f'{mode}-{name}.csv')
+                    start = time.perf_counter()
+                    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                        if name == '先搜索完再探测':
+                            scan.dir_scan()
+                            searched = time.perf_counter() - start
+                            scan.url_scan()
+                        else:
+                            scan.dir_url_scan()
+                            searched = None
+                    elapsed = time.perf_counter() - start
+                    with open(scan.result_file, encoding='utf-8') as f:
+                        rows = sum(1 for row in csv.DictReader(f) if row['http状态码'] == '200')
+                    search = f'（其中搜索 {searched:5.2f} s）' if searched is not None else ''
+                    print(f'{mode:7} {name}：{len(keywords)} 个关键词总耗时 {elapsed:6.2f} s{search}，'
+                          f'存活 {rows} 个')
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def bench_resume(args):
+    work_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+    lines = args.lines // 10
+    try:
+        path = os.path.join(work_dir, 'domain.txt')
+        with open(path, 'w') as f:
+            for i in range(lines):
+                f.write(f'host{i}.example.com\n')
+
+        def run(resume, result_file):
+            scan = StubUrlScan()
+            scan.url_file = path
+            scan.resume = resume
+            scan.result_file = result_file
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scan.get_url_list()
+                scan.url_scan()
+            return time.perf_counter() - start
+
+        for resume in (False, True):
+            elapsed = min(run(resume, os.path.join(work_dir, f'bench-{resume}-{i}.csv')) for i in range(args.repeat))
+            print(f'{lines} 个目标 {"有完成记录" if resume else "无完成记录"} 耗时 {elapsed:6.2f} s')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+    'analyze': bench_analyze,
+    'parse': bench_parse,
+    'waf': bench_waf,
+    'fetch': bench_fetch,
+    'scheme': bench_scheme,
+    'deadline': bench_deadline,
+    'pool': bench_pool,
+    'stream': bench_stream,
+    'write': bench_write,
+    'store': bench_store,
+    'incremental': bench_incremental,
+    'warc': bench_warc,
+    'replay': bench_replay,
+    'dirscan': bench_dirscan,
+    'pipeline': bench_pipeline,
+    'resume': bench_resume,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='UrlScan 性能基准测试')
+    parser.add_argument('name', choices=sorted(BENCHMARKS))
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='每项重复次数')
+    parser.add_argument('-n', '--targets', type=int, default=100, help='每种模拟站点的目标数')
+    parser.add_argument('--servers', type=int, default=4, help='模拟服务器数量')
+    parser.add_argument('--lines', type=int, default=200000, help='stream、resume、write、store 测试的最大目标数')
+    parser.add_argument('--delay', type=float, default=0.2, help='模拟服务器响应延迟（秒）')
+    parser.add_argument('--rate', type=float, default=20, help='dirscan、pipeline 测试的限速（每秒请求数）')
+    parser.add_argument('--timeout', type=float, default=3, help='scheme、deadline 测试的超时（秒）')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+    BENCHMARKS[args.name](args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,39 +1,1278 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 # WgpSec Team
+import asyncio
+import collections
+import contextlib
 import csv
 import datetime
+import gzip
+import hashlib
+import errno
+import http.client
+import http.cookiejar
+import http.cookies
+import io
+import itertools
 import json
 import multiprocessing
+import os
+import queue
 import random
 import re
+import socket
+import statistics
+import sqlite3
+import ssl
+import sys
+import threading
+import time
+import uuid
 from concurrent import futures
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+import urllib3
 from lxml import etree
 
 from Wappalyzer.Wappalyzer import Wappalyzer, WebPage
-from wafw00f.main import main
+from wafw00f.lib.evillib import def_headers
+from wafw00f.main import WAFW00F, buildResultRecord, main
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:  # 可选依赖，没有安装时只能使用线程池模式
+    aiohttp = None
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖，没有安装时不能写入 .zst 文件
+    zstandard = None
 
-requests.adapters.DEFAULT_RETRIES = 5
 requests.packages.urllib3.disable_warnings()
 
+# 百度搜索结果中第一条结果的链接
+SEARCH_RESULT_LINK = etree.XPath('//*[@id="1"]/h3/a[1]/@href')
+
+# asyncio模式下WAF攻击探测请求失败（或预算已用完没有发出），进程池中不再用阻塞请求重新发出
+ATTACK_FAILED = 'attack_failed'
+
+# 探测失败的原因
+FAILURE_LABELS = {
+    'dns': '域名解析失败',
+    'refused': '连接被拒绝',
+    'reset': '连接被重置',
+    'tls': 'TLS握手失败',
+    'timeout': '访问超时',
+    'http': 'HTTP响应错误',
+    'other': '其它错误',
+}
+
+
+def error_chain(error):
+    """
+    依次返回异常本身及其包装的底层异常
+    """
+    seen = set()
+    stack = [error]
+    while stack:
+        error = stack.pop()
+        if not isinstance(error, BaseException) or id(error) in seen:
+            continue
+        seen.add(id(error))
+        yield error
+        stack.extend(error.args)
+        stack.extend((getattr(error, 'reason', None), getattr(error, 'os_error', None),
+                      error.__cause__, error.__context__))
+
+
+def classify_failure(error):
+    """
+    把 requests 或 aiohttp 的请求异常归为 FAILURE_LABELS 中的一类
+    """
+    chain = list(error_chain(error))
+
+    def found(*types, errnos=()):
+        return any(isinstance(e, types) or (isinstance(e, OSError) and e.errno in errnos) for e in chain)
+
+    # NameResolutionError 只有 urllib3 2.x 才有，1.x 中域名解析失败只能从 socket.gaierror 看出
+    if found(socket.gaierror, getattr(urllib3.exceptions, 'NameResolutionError', ())):
+        return 'dns'
+    if found(ConnectionRefusedError, errnos=(errno.ECONNREFUSED,)):
+        return 'refused'
+    if found(ssl.SSLError, ssl.CertificateError, requests.exceptions.SSLError,
+             *((aiohttp.ClientSSLError,) if aiohttp else ())):
+        return 'tls'
+    if found(ConnectionResetError, ConnectionAbortedError, BrokenPipeError, http.client.RemoteDisconnected,
+             *((aiohttp.ServerDisconnectedError,) if aiohttp else ()),
+             errnos=(errno.ECONNRESET, errno.ECONNABORTED, errno.EPIPE)):
+        return 'reset'
+    # urllib3 的 NewConnectionError 也是 TimeoutError 的子类，所以只认具体的超时异常
+    if found(requests.exceptions.Timeout, TimeoutError, asyncio.TimeoutError, urllib3.exceptions.ReadTimeoutError):
+        return 'timeout'
+    if found(requests.exceptions.TooManyRedirects, requests.exceptions.ContentDecodingError,
+             requests.exceptions.ChunkedEncodingError, http.client.HTTPException, urllib3.exceptions.ProtocolError,
+             *((aiohttp.ClientResponseError, aiohttp.ClientPayloadError) if aiohttp else ())):
+        return 'http'
+    return 'other'
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    目标的总耗时预算已经用完
+    """
+
+
+class Deadline(object):
+    """
+    一个目标的总耗时预算，协议回退、重定向、WAF探测共用
+    """
+
+    def __init__(self, seconds):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(self.expires - time.monotonic(), 0.0)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, connect, read):
+        """
+        requests 的 (连接超时, 读取超时)，都不超过剩余时间
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded()
+        return min(connect, remaining), min(read, remaining)
+
+
+def abort_response(response):
+    """
+    从其它线程关闭响应的连接，正在读取响应内容的线程会立即出错返回
+    """
+    sock = getattr(getattr(response.raw, '_connection', None), 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def is_read_timeout(error):
+    """
+    超时发生在连接建立之后（服务器没有响应），而不是连接阶段
+    """
+    types = (requests.exceptions.ReadTimeout, urllib3.exceptions.ReadTimeoutError)
+    if aiohttp is not None and hasattr(aiohttp, 'SocketTimeoutError'):
+        types += (aiohttp.SocketTimeoutError,)
+    return any(isinstance(e, types) for e in error_chain(error))
+
+
+class Probe(object):
+    """
+    一个目标的探测状态机：待尝试的协议，以及每次失败的原因。
+
+    某次尝试失败后，只有还有剩余时间、换协议还可能成功时才继续尝试另一个协议：
+    域名解析失败时都不可能成功；连接被重置、TLS握手失败、HTTP响应错误、
+    连接后等不到响应，通常是协议用错了；连接被拒绝或连接超时，
+    只有换协议后端口也变了才可能成功
+    """
+
+    def __init__(self, target, preference='http', deadline=None):
+        self.target = target
+        self.deadline = deadline
+        scheme = urlparse(target).scheme
+        self.bare = scheme not in ('http', 'https')
+        if self.bare:
+            self.location = target
+            scheme = preference
+        else:
+            self.location = target[len(scheme) + len('://'):]
+        try:
+            self.explicit_port = urlparse('//' + self.location).port is not None
+        except ValueError:
+            self.explicit_port = False
+        self.pending = [scheme, 'https' if scheme == 'http' else 'http']
+        self.failures = []
+        self.hopeless = False
+
+    def url(self, scheme):
+        return f'{scheme}://{self.location}'
+
+    def next_scheme(self):
+        """
+        下一个要尝试的协议，没有了返回 None
+        """
+        if self.pending and not self.out_of_time():
+            return self.pending.pop(0)
+        return None
+
+    def __iter__(self):
+        while self.pending and not self.out_of_time():
+            yield self.pending.pop(0)
+
+    def out_of_time(self):
+        return self.deadline is not None and self.deadline.expired()
+
+    def failed(self, scheme, error):
+        """
+        记录一次失败，并决定是否还值得尝试其它协议
+        """
+        failure = classify_failure(error)
+        self.failures.append((scheme, failure, error))
+        if failure == 'dns' or self.out_of_time():
+            plausible = False
+        elif failure in ('reset', 'tls', 'http') or (failure == 'timeout' and is_read_timeout(error)):
+            plausible = True
+        else:
+            plausible = not self.explicit_port
+        if not plausible:
+            self.pending = []
+            self.hopeless = True
+        return failure
+
+
+class ProbeStats(object):
+    """
+    URL探测统计：每类失败原因的次数，以及因此放弃的目标数和耗时
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.succeeded = 0
+        self.succeeded_time = 0.0
+        self.attempts = collections.Counter()
+        self.dead = collections.Counter()
+        self.dead_time = collections.Counter()
+
+    def record(self, probe, ok, elapsed):
+        with self.lock:
+            for _, failure, _ in probe.failures:
+                self.attempts[failure] += 1
+            if ok:
+                self.succeeded += 1
+                self.succeeded_time += elapsed
+            elif probe.failures:
+                failure = probe.failures[-1][1]
+                self.dead[failure] += 1
+                self.dead_time[failure] += elapsed
+
+    def summary(self):
+        dead = sum(self.dead.values())
+        lines = [f'【探测统计】成功 {self.succeeded} 个，耗时 {self.succeeded_time:.1f} s；'
+                 f'失败 {dead} 个，耗时 {sum(self.dead_time.values()):.1f} s']
+        for failure, label in FAILURE_LABELS.items():
+            if self.attempts[failure]:
+                lines.append(f'  {label:8}\t请求失败 {self.attempts[failure]} 次，'
+                             f'放弃目标 {self.dead[failure]} 个，耗时 {self.dead_time[failure]:.1f} s')
+        return '\n'.join(lines)
+
+
+class ConnectionStats(object):
+    """
+    连接统计：发出的请求数和新建的连接数，两者之差就是复用连接省去的握手次数
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def request(self):
+        with self.lock:
+            self.requests += 1
+
+    def connection(self):
+        with self.lock:
+            self.connections += 1
+
+    def summary(self, targets):
+        saved = self.requests - self.connections
+        return (f'【连接统计】请求 {self.requests} 次，新建连接 {self.connections} 次，'
+                f'复用连接省去握手 {saved} 次（平均每个目标 {saved / max(targets, 1):.2f} 次）')
+
+
+class RateLimiter(object):
+    """
+    全局限速：所有线程合计每秒最多发出 rate 个请求，rate 为 0 时不限速
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next = time.monotonic()
+
+    def wait(self):
+        """
+        等到可以发出下一个请求，返回等待的秒数
+        """
+        if not self.interval:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            at = max(self.next, now)
+            self.next = at + self.interval
+        time.sleep(at - now)
+        return at - now
+
+
+class LatencyStats(object):
+    """
+    每个任务的耗时统计
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+
+    def record(self, elapsed):
+        with self.lock:
+            self.latencies.append(elapsed)
+
+    def summary(self, label):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return f'【{label}】没有任务'
+        p90 = latencies[min(int(len(latencies) * 0.9), len(latencies) - 1)]
+        return (f'【{label}】{len(latencies)} 个，单个耗时 中位数 {statistics.median(latencies):.2f} s，'
+                f'90% {p90:.2f} s，最长 {latencies[-1]:.2f} s')
+
+
+def counting_pool(pool_class, stats):
+    """
+    每建立一次连接（包括已关闭的连接重新连接）就记录一次的 urllib3 连接池
+    """
+
+    class CountingConnection(pool_class.ConnectionCls):
+        def connect(self):
+            stats.connection()
+            return pool_class.ConnectionCls.connect(self)
+
+    class CountingPool(pool_class):
+        ConnectionCls = CountingConnection
+
+    CountingConnection.__name__ = 'Counting' + pool_class.ConnectionCls.__name__
+    CountingPool.__name__ = 'Counting' + pool_class.__name__
+    return CountingPool
+
+
+class PooledAdapter(requests.adapters.HTTPAdapter):
+    """
+    保持长连接的连接池，统计请求数和新建连接数
+    """
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        requests.adapters.HTTPAdapter.__init__(self, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        requests.adapters.HTTPAdapter.init_poolmanager(self, *args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting_pool(pool_class, self.stats)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request, *args, **kwargs):
+        self.stats.request()
+        return requests.adapters.HTTPAdapter.send(self, request, *args, **kwargs)
+
+
+class CompletionJournal(object):
+    """
+    只追加的完成记录：每完成一个目标写一行它在目标文件中的行号（从0开始，不含空行），
+    中断后重新扫描时跳过已完成的目标。每 sync_every 条或每 sync_interval 秒才 fsync 一次，
+    读取时只在内存中保留“之前全部完成”的行号和少量乱序完成的行号
+    """
+
+    def __init__(self, path, source, sync_every=1000, sync_interval=5.0):
+        self.path = path
+        self.header = f'#urlscan {source} {self.identity(source)}\n'
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.low = 0  # 小于它的行号都已完成
+        self.completed = set()
+        self.resumed = 0
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+        self.file = None
+
+    @staticmethod
+    def identity(source):
+        """
+        目标文件的大小、修改时间和开头 64 KB 的哈希，目标文件修改过时不按旧的行号跳过目标
+        """
+        stat = os.stat(source)
+        with open(source, 'rb') as f:
+            head = hashlib.blake2b(f.read(65536), digest_size=8).hexdigest()
+        return f'{stat.st_size} {stat.st_mtime_ns} {head}'
+
+    def open(self):
+        if os.path.exists(self.path):
+            self.load()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if self.file.tell() == 0:
+            self.file.write(self.header)
+        return self
+
+    def load(self):
+        with open(self.path, 'rb+') as f:
+            if f.readline().decode('utf-8', 'ignore') != self.header:
+                # 不是同一个目标文件（或目标文件已修改）的记录，重新开始
+                f.truncate(0)
+                return
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # 中断时写了一半的行
+                    f.truncate(f.tell() - len(line))
+                    break
+                try:
+                    index = int(line)
+                except ValueError:
+                    continue
+                if index >= self.low and index not in self.completed:
+                    self.resumed += 1
+                    self.completed.add(index)
+                    while self.low in self.completed:
+                        self.completed.remove(self.low)
+                        self.low += 1
+
+    def done(self, index):
+        return index < self.low or index in self.completed
+
+    def record(self, index):
+        """
+        记录一个完成的目标，需要 fsync 时返回 True
+        """
+        self.file.write(f'{index}\n')
+        self.unsynced += 1
+        return self.unsynced >= self.sync_every or time.monotonic() - self.synced_at >= self.sync_interval
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+
+    def close(self, remove=False):
+        self.sync()
+        self.file.close()
+        if remove:
+            os.remove(self.path)
+
+
+# CSV 的列
+CSV_FIELDS = ['域名', 'url', '标题', 'http状态码', 'web指纹', 'WAF', '协议']
+
+# JSON Lines 记录的字段
+JSONL_FIELDS = {
+    '目标': 'target',
+    '域名': 'domain',
+    'url': 'url',
+    '标题': 'title',
+    'http状态码': 'status',
+    'web指纹': 'fingerprints',
+    'WAF': 'waf',
+    '协议': 'scheme',
+}
+
+
+def fingerprint_json(fig):
+    """
+    指纹序列化为 JSON 字符串，按名称排序：Wappalyzer 推导出的指纹顺序随哈希种子变化，不同进程的结果要能直接比较
+    """
+    return json.dumps(sorted(fig, key=lambda app: str(app.get('name'))), sort_keys=True, separators=(',', ':'))
+
+
+class CsvSink(object):
+    """
+    CSV 结果文件，指纹写成 JSON 字符串
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'a', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        # 注意header是个好东西，追加到已有的结果文件时不再重复写入
+        if self.file.tell() == 0:
+            self.writer.writeheader()
+
+    @staticmethod
+    def row(csv_res):
+        fig = csv_res.get('web指纹')
+        if fig is not None and not isinstance(fig, str):
+            csv_res = dict(csv_res, web指纹=fingerprint_json(fig))
+        return csv_res
+
+    def write(self, rows):
+        # 整批先写入内存再写入文件，出错时逐行重写，不会写出半批
+        buffer = io.StringIO()
+        try:
+            csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction='ignore').writerows(self.row(csv_res) for csv_res in rows)
+        except Exception:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            for csv_res in rows:
+                try:
+                    writer.writerow(self.row(csv_res))
+                except Exception as e:
+                    print(f'写入csv出错\n错误原因:{e}')
+        self.file.write(buffer.getvalue())
+
+    def flush(self):
+        self.file.flush()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlSink(object):
+    """
+    JSON Lines 结果文件，每个目标一行，指纹和WAF是嵌套的对象。
+    文件名以 .gz、.zst 结尾时压缩写入（追加写入时每次运行是一个新的压缩帧），'-' 表示写到标准输出
+    """
+
+    def __init__(self, path):
+        self.raw = None
+        self.zstd = None
+        if path == '-':
+            # 扫描时 sys.stdout 被改到标准错误，结果写到真正的标准输出
+            self.file = sys.__stdout__
+        elif path.endswith('.gz'):
+            self.raw = open(path, 'ab')
+            self.file = gzip.open(self.raw, 'wt', encoding='utf-8')
+        elif path.endswith('.zst'):
+            if zstandard is None:
+                # 不压缩写入的文件名仍以 .zst 结尾，读取时会出错
+                raise RuntimeError(f'没有安装zstandard，不能写入 {path}，请安装 zstandard 或换用 .gz')
+            self.raw = open(path, 'ab')
+            self.zstd = zstandard.ZstdCompressor().stream_writer(self.raw, closefd=False)
+            self.file = io.TextIOWrapper(self.zstd, encoding='utf-8')
+        else:
+            self.file = open(path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def record(csv_res):
+        record = {field: csv_res.get(key, '') for key, field in JSONL_FIELDS.items()}
+        if record['status'] == '':
+            record['status'] = None
+        record['scheme'] = record['scheme'] or None
+        record['title'] = record['title'] or None
+        if record['fingerprints'] == '':
+            record['fingerprints'] = None
+        waf = buildResultRecord(record['url'], record['waf'])
+        del waf['url']
+        record['waf'] = waf
+        return record
+
+    def write(self, rows):
+        lines = []
+        for csv_res in rows:
+            try:
+                lines.append(json.dumps(self.record(csv_res), ensure_ascii=False, separators=(',', ':')))
+            except Exception as e:
+                print(f'写入jsonl出错\n错误原因:{e}')
+        if lines:
+            self.file.write('\n'.join(lines) + '\n')
+
+    def flush(self):
+        self.file.flush()
+        if self.raw is not None:
+            if self.zstd is not None:
+                # 结束当前压缩块，已写出的记录可以被读取
+                self.zstd.flush(zstandard.FLUSH_BLOCK)
+            self.raw.flush()
+
+    def sync(self):
+        self.flush()
+        if self.file is not sys.__stdout__:
+            os.fsync((self.raw or self.file).fileno())
+
+    def close(self):
+        if self.file is sys.__stdout__:
+            self.file.flush()
+            return
+        self.file.close()
+        if self.raw is not None:
+            self.raw.close()
+
+
+class SqliteSink(object):
+    """
+    SQLite 结果库，保存每次扫描（runs）每个目标的结果（results）和识别出的指纹名称、版本（technologies），
+    用于对比不同时间的扫描结果。每批结果在一个事务中写入
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            source TEXT,
+            started TEXT NOT NULL,
+            finished TEXT
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            run_id INTEGER NOT NULL REFERENCES runs (id),
+            target TEXT NOT NULL,
+            domain TEXT,
+            url TEXT,
+            title TEXT,
+            status INTEGER,
+            waf TEXT,
+            scheme TEXT,
+            fingerprints TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            body_hash TEXT,
+            analyzed TEXT,
+            PRIMARY KEY (run_id, target)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS results_domain ON results (domain, run_id);
+        CREATE INDEX IF NOT EXISTS results_status ON results (status, run_id);
+        CREATE TABLE IF NOT EXISTS technologies (
+            run_id INTEGER NOT NULL REFERENCES runs (id),
+            target TEXT NOT NULL,
+            name TEXT NOT NULL,
+            version TEXT,
+            PRIMARY KEY (run_id, target, name)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS technologies_name ON technologies (name, run_id);
+    """
+
+    # 数据库结构的版本（PRAGMA user_version），以及从上一个版本升级的语句
+    SCHEMA_VERSION = 2
+    MIGRATIONS = {
+        # 增量扫描需要上次的指纹、缓存验证信息和内容哈希
+        2: ['ALTER TABLE results ADD COLUMN fingerprints TEXT',
+            'ALTER TABLE results ADD COLUMN etag TEXT',
+            'ALTER TABLE results ADD COLUMN last_modified TEXT',
+            'ALTER TABLE results ADD COLUMN body_hash TEXT',
+            'ALTER TABLE results ADD COLUMN analyzed TEXT'],
+    }
+
+    COLUMNS = ('run_id', 'target', 'domain', 'url', 'title', 'status', 'waf', 'scheme', 'fingerprints', 'etag',
+               'last_modified', 'body_hash', 'analyzed')
+
+    def __init__(self, path, source=None, resume=False):
+        # 连接在主线程创建，由写入线程使用，两者不会同时访问
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        # WAL 模式下进程崩溃不会丢失已提交的事务
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        migrate_store(self.db)
+        self.run_id = None
+        self.resumed = False
+        if resume:
+            # 继续上次中断的扫描时，结果仍记在那一次扫描中
+            row = self.db.execute('SELECT id FROM runs WHERE source IS ? AND finished IS NULL '
+                                  'ORDER BY id DESC LIMIT 1', (source,)).fetchone()
+            if row is not None:
+                self.run_id = row[0]
+                self.resumed = True
+        if self.run_id is None:
+            with self.db:
+                self.run_id = self.db.execute('INSERT INTO runs (source, started) VALUES (?, ?)',
+                                              (source, datetime.datetime.now().isoformat(' ', 'seconds'))).lastrowid
+
+    @staticmethod
+    def values(run_id, csv_res):
+        fig = csv_res.get('web指纹')
+        cache = csv_res.get('缓存') or {}
+        return (run_id, csv_res.get('目标') or csv_res.get('url'), csv_res.get('域名'), csv_res.get('url'),
+                csv_res.get('标题') or None, csv_res.get('http状态码') or None, csv_res.get('WAF') or None,
+                csv_res.get('协议') or None,
+                fingerprint_json(fig) if isinstance(fig, list) else None,
+                cache.get('etag'), cache.get('last_modified'), cache.get('body_hash'), cache.get('analyzed'))
+
+    def write(self, rows):
+        results = [self.values(self.run_id, csv_res) for csv_res in rows]
+        technologies = [(self.run_id, result[1], app.get('name'), app.get('version') or None)
+                        for csv_res, result in zip(rows, results)
+                        if isinstance(csv_res.get('web指纹'), list)
+                        for app in csv_res['web指纹'] if app.get('name')]
+        with self.db:
+            if self.resumed:
+                # 中断前可能已经写入过，重新写入
+                self.db.executemany('DELETE FROM technologies WHERE run_id = ? AND target = ?',
+                                    [result[:2] for result in results])
+            self.db.executemany('INSERT OR REPLACE INTO results (%s) VALUES (%s)' % (', '.join(self.COLUMNS), ', '.join('?' * len(self.COLUMNS))), results)
+            self.db.executemany('INSERT OR REPLACE INTO technologies VALUES (?, ?, ?, ?)', technologies)
+
+    def flush(self):
+        pass
+
+    def sync(self):
+        pass
+
+    def finish(self):
+        """
+        扫描正常结束，之后对比变化时才会用到这次扫描
+        """
+        with self.db:
+            self.db.execute('UPDATE runs SET finished = ? WHERE id = ?',
+                            (datetime.datetime.now().isoformat(' ', 'seconds'), self.run_id))
+
+    def close(self):
+        self.db.close()
+
+
+def migrate_store(db):
+    """
+    建表，或把旧版本的结果库升级到 SqliteSink.SCHEMA_VERSION
+    """
+    version, = db.execute('PRAGMA user_version').fetchone()
+    if version == 0 and db.execute("SELECT 1 FROM sqlite_master WHERE name = 'results'").fetchone():
+        # 第一个版本没有设置 user_version
+        version = 1
+    with db:
+        if version == 0:
+            db.executescript(SqliteSink.SCHEMA)
+            version = SqliteSink.SCHEMA_VERSION
+        for upgrade in range(version + 1, SqliteSink.SCHEMA_VERSION + 1):
+            for statement in SqliteSink.MIGRATIONS[upgrade]:
+                db.execute(statement)
+        db.execute(f'PRAGMA user_version = {SqliteSink.SCHEMA_VERSION}')
+
+
+class ScanHistory(object):
+    """
+    增量扫描时读取上一次正常结束的扫描中每个目标的结果，可被多个线程同时使用。
+    距离上次完整识别超过 max_age 秒的目标视为没有历史，重新识别
+    """
+
+    def __init__(self, path, max_age):
+        self.path = path
+        self.local = threading.local()
+        db = self.connect()
+        row = db.execute('SELECT max(id) FROM runs WHERE finished IS NOT NULL').fetchone()
+        self.run_id = row[0] if row else None
+        self.oldest = (datetime.datetime.now() - datetime.timedelta(seconds=max_age)).isoformat(' ', 'seconds')
+
+    def connect(self):
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            db = self.local.db = sqlite3.connect(self.path)
+        return db
+
+    def get(self, target):
+        if self.run_id is None:
+            return None
+        row = self.connect().execute(
+            'SELECT url, title, status, waf, fingerprints, etag, last_modified, body_hash, analyzed FROM results '
+            'WHERE run_id = ? AND target = ? AND status IS NOT NULL AND analyzed >= ?',
+            (self.run_id, target, self.oldest)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('url', 'title', 'status', 'waf', 'fingerprints', 'etag', 'last_modified', 'body_hash',
+                         'analyzed'), row))
+
+
+class IncrementalStats(object):
+    """
+    增量扫描统计：走了省时路径（304 未修改、内容哈希相同）和重新识别的目标数
+    """
+
+    LABELS = {
+        'not_modified': '304未修改',
+        'same_body': '内容未变',
+        'changed': '内容有变化',
+        'new': '没有历史',
+    }
+
+    def __init__(self):
+        self.counts = collections.Counter()
+
+    def record(self, csv_res):
+        if csv_res is not None and csv_res.get('缓存'):
+            self.counts[csv_res['缓存']['path']] += 1
+
+    def summary(self):
+        cheap = self.counts['not_modified'] + self.counts['same_body']
+        details = '，'.join(f'{label} {self.counts[path]} 个' for path, label in self.LABELS.items())
+        return f'【增量统计】跳过指纹、WAF识别 {cheap} 个（{details}）'
+
+
+def scan_changes(path, new_run=None, old_run=None):
+    """
+    对比两次正常结束的扫描（默认最近两次），返回 (旧扫描, 新扫描, 变化)，变化为状态码、标题、WAF或指纹有变化（changed）、
+    新出现（new）、消失（gone）的目标：(类型, 目标, 旧状态码, 新状态码, 旧标题, 新标题, 旧WAF, 新WAF, 旧指纹, 新指纹)，
+    指纹为按名称排序的 JSON 字符串
+    """
+    db = sqlite3.connect(path)
+    # 旧版本写入的指纹没有排序，比较前统一排序
+    db.create_function('fingerprint_json', 1, lambda text: fingerprint_json(json.loads(text)) if text else text,
+                       deterministic=True)
+    try:
+        runs = [run_id for run_id, in db.execute('SELECT id FROM runs WHERE finished IS NOT NULL ORDER BY id DESC')]
+        if new_run is None:
+            new_run = runs[0] if runs else None
+        if old_run is None:
+            older = [run_id for run_id in runs if new_run is not None and run_id < new_run]
+            old_run = older[0] if older else None
+        if new_run is None or old_run is None:
+            return old_run, new_run, []
+        changes = db.execute("""
+            SELECT CASE WHEN o.target IS NULL THEN 'new' ELSE 'changed' END,
+                   n.target, o.status, n.status, o.title, n.title, o.waf, n.waf,
+                   fingerprint_json(o.fingerprints), fingerprint_json(n.fingerprints)
+            FROM results n LEFT JOIN results o ON o.run_id = :old AND o.target = n.target
+            WHERE n.run_id = :new AND (o.target IS NULL OR o.status IS NOT n.status OR o.title IS NOT n.title
+                                       OR o.waf IS NOT n.waf
+                                       OR fingerprint_json(o.fingerprints) IS NOT fingerprint_json(n.fingerprints))
+            UNION ALL
+            SELECT 'gone', o.target, o.status, NULL, o.title, NULL, o.waf, NULL, fingerprint_json(o.fingerprints), NULL
+            FROM results o
+            WHERE o.run_id = :old AND NOT EXISTS (
+                SELECT 1 FROM results n WHERE n.run_id = :new AND n.target = o.target)
+        """, {'old': old_run, 'new': new_run}).fetchall()
+        return old_run, new_run, changes
+    finally:
+        db.close()
+
+
+class ResultWriter(object):
+    """
+    结果写入线程：从队列取出结果，攒够 batch_size 行或每隔 flush_interval 秒批量写入各个结果文件一次，
+    写入后再记入完成记录。put 从不阻塞，扫描线程不会因为写文件而等待
+    """
+
+    def __init__(self, sinks, journal=None, batch_size=500, flush_interval=1.0):
+        self.sinks = sinks
+        self.journal = journal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.rows = 0
+        self.batches = 0
+        self.busy_time = 0.0
+        self.max_backlog = 0
+        self.started = time.monotonic()
+        self.thread = threading.Thread(target=self.run, name='ResultWriter', daemon=True)
+        self.thread.start()
+
+    def put(self, index, csv_res):
+        self.queue.put((index, csv_res))
+
+    def run(self):
+        done = False
+        while not done:
+            batch = []
+            flush_at = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(flush_at - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+            if batch:
+                self.max_backlog = max(self.max_backlog, self.queue.qsize() + len(batch))
+                self.write(batch)
+
+    def write(self, batch):
+        start = time.perf_counter()
+        # 出错的目标没有结果，只记录完成
+        rows = [csv_res for _, csv_res in batch if csv_res is not None]
+        for sink in self.sinks:
+            try:
+                sink.write(rows)
+                sink.flush()
+            except Exception as e:
+                print(f'写入结果出错\n错误原因:{e}')
+        if self.journal is not None:
+            # 先把结果写入磁盘再记录完成，中断后最多重复写入最后一批结果
+            due = False
+            for index, _ in batch:
+                due = self.journal.record(index) or due
+            if due:
+                for sink in self.sinks:
+                    sink.sync()
+                self.journal.sync()
+        self.rows += len(rows)
+        self.batches += 1
+        self.busy_time += time.perf_counter() - start
+
+    def close(self):
+        """
+        写完队列中剩余的结果后结束写入线程
+        """
+        self.queue.put(None)
+        self.thread.join()
+        for sink in self.sinks:
+            if self.journal is not None:
+                sink.sync()
+            else:
+                sink.flush()
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (f'【写入统计】写出 {self.rows} 行，分 {self.batches} 批，写入耗时 {self.busy_time:.2f} s'
+                f'（占扫描时间 {self.busy_time / elapsed:.1%}，{self.rows / max(self.busy_time, 1e-9):.0f} 行/s），'
+                f'队列最多积压 {self.max_backlog} 行')
+
+
+class WarcWriter(object):
+    """
+    把原始的请求和响应（包括重定向和WAF攻击探测）保存为 WARC 文件，供指纹库、WAF签名更新后离线重新分析。
+    记录在后台线程中生成、压缩和写入；文件名以 .gz 结尾时每条记录单独压缩，符合 .warc.gz 的惯例。
+    每条记录带有 Urlscan-Target（扫描目标）和 Urlscan-Role（page、redirect、waf）字段
+    """
+
+    # 响应内容已经解压、合并分块，这些响应头改名保留
+    RENAMED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+    def __init__(self, path, max_backlog=1000):
+        self.compress = path.endswith('.gz')
+        self.file = open(path, 'ab')
+        # 队列满时等待写入，不丢弃记录，也不会无限占用内存
+        self.queue = queue.Queue(max_backlog)
+        self.records = 0
+        self.bytes = 0
+        self.busy_time = 0.0
+        self.write_record(self.record('warcinfo', None, 'application/warc-fields',
+                                      f'software: urlscan\r\nformat: WARC File Format 1.1\r\n'.encode('utf-8')))
+        self.thread = threading.Thread(target=self.run, name='WarcWriter', daemon=True)
+        self.thread.start()
+
+    def archive(self, target, response, role='page'):
+        """
+        保存一个响应（以及它经过的重定向）和对应的请求，response 的内容必须已经读取
+        """
+        for hop in getattr(response, 'history', None) or ():
+            self.queue.put((target, 'redirect', hop))
+        self.queue.put((target, role, response))
+
+    def hook(self, target, role='waf'):
+        """
+        requests 的 response 事件回调，用于保存 wafw00f 发出的请求
+        """
+
+        def on_response(response, *args, **kwargs):
+            # 在请求线程中读取内容，写入线程不会与之同时读取
+            response.content
+            self.archive(target, response, role)
+
+        return on_response
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            start = time.perf_counter()
+            try:
+                target, role, response = item
+                extra = {'Urlscan-Target': target, 'Urlscan-Role': role}
+                response_record = self.record('response', response.url, 'application/http;msgtype=response',
+                                              self.http_response(response), extra)
+                self.write_record(response_record)
+                if response.request is not None:
+                    extra['WARC-Concurrent-To'] = response_record[1]
+                    self.write_record(self.record('request', response.url, 'application/http;msgtype=request',
+                                                  self.http_request(response.request, response), extra))
+            except Exception as e:
+                print(f'写入WARC出错\n错误原因:{e}')
+            self.busy_time += time.perf_counter() - start
+
+    @staticmethod
+    def record(warc_type, uri, content_type, block, extra=None):
+        record_id = f'<urn:uuid:{uuid.uuid4()}>'
+        headers = [('WARC-Type', warc_type), ('WARC-Record-ID', record_id),
+                   ('WARC-Date', datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'))]
+        if uri:
+            headers.append(('WARC-Target-URI', uri))
+        headers.extend((extra or {}).items())
+        headers.extend((('Content-Type', content_type), ('Content-Length', str(len(block)))))
+        head = 'WARC/1.1\r\n' + ''.join(f'{name}: {value}\r\n' for name, value in headers) + '\r\n'
+        return head.encode('utf-8') + block + b'\r\n\r\n', record_id
+
+    def write_record(self, record):
+        data = record[0]
+        if self.compress:
+            data = gzip.compress(data, compresslevel=6)
+        self.file.write(data)
+        self.records += 1
+        self.bytes += len(data)
+
+    @classmethod
+    def http_response(cls, response):
+        body = response.content or b''
+        raw = response.raw
+        version = {10: 'HTTP/1.0'}.get(getattr(raw, 'version', None), 'HTTP/1.1')
+        # urllib3 的响应头保留了重复的字段（如多个 Set-Cookie）
+        headers = getattr(raw, 'headers', None) or response.headers
+        lines = [f'{version} {response.status_code} {response.reason or ""}']
+        for name, value in headers.items():
+            if name.lower() in cls.RENAMED_HEADERS:
+                name = 'X-Archive-Orig-' + name
+            lines.append(f'{name}: {value}')
+        lines.append(f'Content-Length: {len(body)}')
+        return cls.encode_head('\r\n'.join(lines) + '\r\n\r\n', response) + body
+
+    @staticmethod
+    def encode_head(head, response):
+        """
+        还原收到的请求头、响应头字节：http.client 按 latin-1 解码，aiohttp 按 utf-8 解码（解不开的字节保留为 surrogateescape）
+        """
+        if getattr(response, 'header_encoding', None) == 'utf-8':
+            return head.encode('utf-8', 'surrogateescape')
+        return head.encode('latin-1')
+
+    @classmethod
+    def http_request(cls, request, response=None):
+        url = urlparse(request.url)
+        lines = [f'{request.method} {request.path_url} HTTP/1.1']
+        if 'Host' not in request.headers:
+            lines.append(f'Host: {url.netloc}')
+        lines.extend(f'{name}: {value}' for name, value in request.headers.items())
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return cls.encode_head('\r\n'.join(lines) + '\r\n\r\n', response) + body
+
+    def close(self):
+        """
+        写完队列中剩余的记录后结束写入线程
+        """
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+
+    def summary(self):
+        return (f'【归档统计】写入 {self.records} 条 WARC 记录，{self.bytes / 1024 / 1024:.1f} MB，'
+                f'后台写入耗时 {self.busy_time:.2f} s')
+
+
+def read_warc(path):
+    """
+    逐条读取 WARC 文件（支持 .gz），返回 (WARC头, 内容)
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            if not line.startswith(b'WARC/'):
+                raise ValueError(f'{path} 不是有效的 WARC 文件：{line[:40]!r}')
+            headers = {}
+            for line in iter(f.readline, b''):
+                if not line.strip():
+                    break
+                name, _, value = line.decode('utf-8', 'replace').partition(':')
+                headers[name.strip()] = value.strip()
+            yield headers, f.read(int(headers.get('Content-Length', 0)))
+
+
+def warc_response(block, url, rewritten=False):
+    """
+    把 WARC 中保存的 HTTP 响应还原成 requests.Response，rewritten 表示响应头经过 WarcWriter 改写，
+    恢复为收到时的样子
+    """
+    head, _, body = block.partition(b'\r\n\r\n')
+    lines = head.decode('iso-8859-1').split('\r\n')
+    _, status, reason = (lines[0].split(' ', 2) + ['', ''])[:3]
+    headers = requests.structures.CaseInsensitiveDict()
+    cookies = http.cookies.SimpleCookie()
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        value = value.strip()
+        if rewritten:
+            if name.lower() == 'content-length':
+                # 归档时补上的实际长度
+                continue
+            if name.lower().startswith('x-archive-orig-'):
+                name = name[len('x-archive-orig-'):]
+        if name.lower() == 'set-cookie':
+            try:
+                cookies.load(value)
+            except http.cookies.CookieError:
+                pass
+        # 与 urllib3 一致，重复的响应头用逗号合并
+        headers[name] = f'{headers[name]}, {value}' if name in headers else value
+    response = requests.Response()
+    response.url = url
+    response.status_code = int(status) if status.isdigit() else 0
+    response.reason = reason
+    response.headers = headers
+    response.encoding = requests.utils.get_encoding_from_headers(headers)
+    response.cookies = requests.cookies.cookiejar_from_dict({name: morsel.value for name, morsel in cookies.items()})
+    response._content = body
+    return response
+
+
+def replay_groups(path, window=10000, skipped=None):
+    """
+    把 WARC 中同一个目标的记录归为一组，返回 (目标, 协议, 页面响应, WAF攻击探测响应, 响应头是否经过改写)，
+    响应为 (URL, 内容)。
+    WarcWriter 写入的记录按 Urlscan-Target 归组，其它工具写入的响应每条作为一个目标。
+    同一目标的记录在文件中相距不远，超过 window 个目标还没凑齐的按已有的记录处理；
+    没有页面或页面为 304 的目标无法重新识别，计入 skipped
+    """
+    pending = collections.OrderedDict()
+
+    def emit(target, group):
+        page = group.get('page')
+        if page is None or page[1].split(b' ', 2)[1:2] == [b'304']:
+            if skipped is not None:
+                skipped[target] += 1
+            return None
+        return target, urlparse(group['first']).scheme, page, group.get('waf'), group['rewritten']
+
+    for headers, block in read_warc(path):
+        if headers.get('WARC-Type') != 'response':
+            continue
+        url = headers.get('WARC-Target-URI', '')
+        target = headers.get('Urlscan-Target') or url
+        role = headers.get('Urlscan-Role', 'page')
+        group = pending.get(target)
+        if group is not None and (role in group or (role == 'redirect' and 'page' in group)):
+            # 同一目标的下一次扫描
+            item = emit(target, pending.pop(target))
+            if item is not None:
+                yield item
+            group = None
+        if group is None:
+            group = pending[target] = {'first': url, 'rewritten': 'Urlscan-Target' in headers}
+        if role != 'redirect':
+            group[role] = (url, block)
+        if 'page' in group and 'waf' in group:
+            item = emit(target, pending.pop(target))
+            if item is not None:
+                yield item
+        while len(pending) > window:
+            item = emit(*pending.popitem(last=False))
+            if item is not None:
+                yield item
+    while pending:
+        item = emit(*pending.popitem(last=False))
+        if item is not None:
+            yield item
+
+
+def quiet_stdout():
+    """
+    进程池的初始化函数：结果写到标准输出时，进程里打印的内容改到标准错误。
+    spawn、forkserver 启动的进程不继承主进程对 sys.stdout 的修改
+    """
+    sys.stdout = sys.stderr
+
+
+replay_scan = None
+
+
+def replay_batch(batch):
+    """
+    在进程池中离线重新识别一批目标，不发出任何请求
+    """
+    global replay_scan
+    if replay_scan is None:
+        replay_scan = UrlScan()
+        replay_scan._session = OfflineSession()
+    results = []
+    for target, scheme, (url, page), attack, rewritten in batch:
+        res = warc_response(page, url, rewritten)
+        attack = warc_response(attack[1], attack[0], rewritten) if attack else None
+        results.append(replay_scan.process(target, res, scheme, attack))
+    return results
+
+
+class OfflineSession(requests.Session):
+    """
+    离线重新识别时使用的会话，拒绝发出任何请求
+    """
+
+    def request(self, *args, **kwargs):
+        raise requests.exceptions.ConnectionError('离线模式不发出请求')
+
 
 class UrlScan(object):
     def __init__(self):
         self.version = "1.1"
-        self.http_time_out = 60  # 配置HTTP请求超时时间
+        self.http_time_out = 60  # 配置HTTP请求读取超时时间（等待响应数据）
+        self.connect_time_out = 10  # 配置HTTP请求连接超时时间
+        self.target_time_out = 90  # 每个目标的总耗时上限，协议回退、重定向、WAF探测共用
         self.pool_max_workers = 100  # 配置线程池
+        self.search_url = "https://www.baidu.com/s?wd={}&usm=3&rsv_idx=2&rsv_page=1"  # 关键词搜索地址
+        self.dir_max_workers = 8  # 同时搜索的关键词数
+        self.dir_rate_limit = 2  # 关键词搜索每秒最多发出的请求数（所有线程合计），0 为不限速
+        self.dir_delay = 1  # 每个线程搜索完一个关键词后的等待秒数
+        self.url_file = "domain.txt"  # 待探测的URL文件，一行一个，支持 .gz 压缩文件，'-' 表示从标准输入读取
+        self.task_window = 1000  # 同时在处理中的目标数上限，读取目标文件时保持内存占用不变
+        self.async_mode = False  # 使用asyncio探测URL（需要安装aiohttp），进程池负责标题、指纹、WAF识别
+        self.async_max_connections = 1000  # asyncio模式下同时进行的连接数
+        self.async_process_workers = os.cpu_count() or 1  # asyncio模式下标题、指纹、WAF识别的进程数
+        self.waf_time_out = 7  # WAF攻击探测请求超时时间，与wafw00f一致
+        self.scheme_race = True  # 没有协议头的目标同时尝试http和https，取最先成功的
+        self.scheme_preference = 'http'  # 优先尝试的协议
+        self.scheme_race_delay = 0.3  # 优先协议先行的秒数，期间失败则立即尝试另一个协议
+        self.pool_connections = 1000  # 连接池最多同时保留多少个主机的连接
+        self.pool_per_host = 10  # 每个主机最多保持的空闲连接数
+        self.result_file = '%s-urlCheck.csv' % datetime.date.today()  # 扫描结果文件
+        self.resume = True  # 记录已完成的目标，中断后重新运行时从上次的位置继续，正常结束后删除记录
+        self.journal_sync_every = 1000  # 完成记录每多少条写入磁盘一次
+        self.journal_sync_interval = 5  # 完成记录最多间隔多少秒写入磁盘一次
+        self.write_batch_size = 500  # 结果每攒够多少行写入一次
+        self.write_flush_interval = 1  # 结果最多间隔多少秒写入一次
+        self.sqlite_file = None  # 同时把结果记入 SQLite 数据库，如 'urlscan.db'，保存每次扫描的历史，用于对比变化
+        self.incremental = False  # 增量扫描（需要 sqlite_file）：页面与上次相同（304 或内容哈希相同）时沿用上次的指纹和WAF
+        self.incremental_max_age = 7  # 增量扫描时，距离上次完整识别超过多少天的目标重新识别
+        self.warc_file = None  # 把原始请求、响应（包括WAF攻击探测）保存为 WARC 文件，如 'urlscan.warc.gz'，供离线重新分析
+        self.replay_file = 'urlscan.warc.gz'  # 离线重新识别时读取的 WARC 归档
+        self.replay_workers = os.cpu_count() or 1  # 离线重新识别的进程数
+        self.replay_batch_size = 64  # 离线重新识别时每次交给进程的目标数
+        self.jsonl_file = None  # 同时写入 JSON Lines 结果，如 'result.jsonl'，支持 .gz、.zst 压缩，'-' 表示写到标准输出
+        self.probe_stats = ProbeStats()
+        self.connection_stats = ConnectionStats()
+        self.incremental_stats = IncrementalStats()
+        self.history = None
+        self.archive = None
+        self._session = None
+        self._session_lock = threading.Lock()
         self.url_list = []
+        self.url_source = None  # url_list 读取自哪个目标文件，只有来自目标文件（不是标准输入）时才能中断后继续
         self.dict_url = []
         self.dir_result = []
 
+    @property
+    def session(self):
+        """
+        扫描器和wafw00f共用的长连接会话，第一次使用时创建，可被多个线程同时使用
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self.make_session()
+        return self._session
+
+    def make_session(self):
+        session = requests.Session()
+        adapter = PooledAdapter(self.connection_stats, pool_connections=self.pool_connections,
+                                pool_maxsize=self.pool_per_host, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        # 会话不保存任何cookie，目标之间、同一目标的不同请求之间都不会互相带上cookie
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
     def main(self):
+        if self.jsonl_file == '-':
+            # 标准输出只留给结果，菜单和其它输出改到标准错误
+            with contextlib.redirect_stdout(sys.stderr):
+                return self.menu()
+        return self.menu()
+
+    def menu(self):
         self.get_show_banner()
         print('=' * 80)
-        print(""" 1、URL存活探测，默认为domain 2、百度主域名收集 3、主域名收集+URL探测 """)
+        print(""" 1、URL存活探测，默认为domain 2、百度主域名收集 3、主域名收集+URL探测 4、对比最近两次扫描的变化 5、离线重新识别WARC归档 """)
         print('=' * 80)
         choice = input(">")
         if choice == '1':
@@ -45,18 +1284,56 @@ class UrlScan(object):
             print(self.dir_result)
         if choice == '3':
             self.get_dir_list()
-            self.dir_scan()
-            print(self.dir_result)
-            self.url_scan()
+            self.dir_url_scan()
+        if choice == '4':
+            self.show_changes()
+        if choice == '5':
+            self.replay()
+
+    def show_changes(self):
+        if not self.sqlite_file or not os.path.exists(self.sqlite_file):
+            print("【没有扫描历史】请先设置 sqlite_file 并完成两次扫描")
+            return
+        start = time.perf_counter()
+        old_run, new_run, changes = scan_changes(self.sqlite_file)
+        if old_run is None:
+            print("【没有扫描历史】至少需要两次正常结束的扫描")
+            return
+        print(f"【扫描 {old_run} → 扫描 {new_run}】{len(changes)} 个目标有变化（查询耗时 "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms）")
+        labels = {'new': '新目标', 'gone': '已消失', 'changed': '有变化'}
+        for kind, target, old_status, new_status, old_title, new_title, old_waf, new_waf, old_fig, new_fig in changes:
+            print(f"【{labels[kind]}】{target}\t状态码 {old_status} → {new_status}\t标题 {old_title} → {new_title}\t"
+                  f"WAF {old_waf} → {new_waf}")
+            if kind == 'changed' and old_fig != new_fig:
+                old_apps, new_apps = (set(app['name'] for app in json.loads(fig or '[]')) for fig in (old_fig, new_fig))
+                print(f"\t指纹 新增 {sorted(new_apps - old_apps)} 减少 {sorted(old_apps - new_apps)}")
 
     def get_url_list(self):
-        paths = "domain.txt"
-        with open(paths, "r") as files:
-            file_data = files.readlines()  # 读取文件
-            for fi_s in file_data:
-                fi_s = fi_s.strip('\n')
-                self.url_list.append(fi_s)
-        print(f"URL探测任务读取完毕，识别到 {len(self.url_list)} 条任务信息")
+        # 目标在扫描过程中逐行读取，不一次性读入内存
+        self.url_list = self.read_targets(self.url_file)
+        self.url_source = self.url_file
+        print(f"URL探测任务从 {'标准输入' if self.url_file == '-' else self.url_file} 读取")
+
+    @staticmethod
+    def read_targets(paths):
+        """
+        逐行读取目标，支持 gzip 压缩文件和标准输入（'-'），跳过空行
+        """
+        if paths == '-':
+            files = sys.stdin
+        elif paths.endswith('.gz'):
+            files = gzip.open(paths, 'rt', encoding='utf-8', errors='ignore')
+        else:
+            files = open(paths, 'r', encoding='utf-8', errors='ignore')
+        try:
+            for fi_s in files:
+                fi_s = fi_s.strip()
+                if fi_s:
+                    yield fi_s
+        finally:
+            if files is not sys.stdin:
+                files.close()
 
     def get_dir_list(self):
         paths = "keyword.txt"
@@ -67,55 +1344,399 @@ class UrlScan(object):
                 self.dict_url.append(fi_s)
         print(f"关键词探测任务读取完毕，识别到 {len(self.dict_url)} 条任务信息")
 
+    def resolve_keywords(self):
+        """
+        多个线程同时搜索关键词，所有请求受 dir_rate_limit 限速，按完成的先后返回 (关键词序号, 结果)
+        """
+        limiter = RateLimiter(self.dir_rate_limit)
+        self.dir_latency = LatencyStats()
+        pool = futures.ThreadPoolExecutor(max_workers=self.dir_max_workers)
+        wait_for = {pool.submit(self.dir_scan_action, task_keyword, limiter, self.dir_latency): index
+                    for index, task_keyword in enumerate(self.dict_url)}
+        try:
+            for fs in futures.as_completed(wait_for):
+                yield wait_for[fs], fs.result()
+        finally:
+            # 中途停止时不再搜索剩下的关键词
+            for fs in wait_for:
+                fs.cancel()
+            pool.shutdown()
+
     def dir_scan(self):
+        """
+        主域名收集，结果按关键词的顺序保存
+        """
+        process_name = multiprocessing.current_process().name
+        print("【关键词线程启动】" + process_name)
+        results = [None] * len(self.dict_url)
+        for index, result in self.resolve_keywords():
+            results[index] = result
+        self.dir_result.extend(results)
+        self.url_list.extend(result['url'] for result in results)
+        print(self.dir_latency.summary('关键词搜索'))
+
+    def dir_url_scan(self):
+        """
+        主域名收集+URL探测：每个关键词搜索完成后立即交给URL探测，搜索与探测同时进行。
+        没有搜索到、重复的URL不再探测
+        """
         process_name = multiprocessing.current_process().name
         print("【关键词线程启动】" + process_name)
-        for task_url in self.dict_url:
-            self.dir_scan_action(task_url)
+        results = [None] * len(self.dict_url)
+
+        def discovered():
+            seen = set()
+            for index, result in self.resolve_keywords():
+                results[index] = result
+                if result['url'] is not None and result['url'] not in seen:
+                    seen.add(result['url'])
+                    yield result['url']
+
+        self.url_list = discovered()
+        self.url_source = None
+        self.url_scan()
+        self.dir_result.extend(result for result in results if result is not None)
+        print(self.dir_result)
+        print(self.dir_latency.summary('关键词搜索'))
 
-    def dir_scan_action(self, task_keyword):
-        print("【任务】" + task_keyword)
-        baidu_url = "https://www.baidu.com/s?wd=" + str(task_keyword) + "&usm=3&rsv_idx=2&rsv_page=1"
+    def dir_scan_action(self, task_keyword, limiter=None, latency=None):
+        start = time.perf_counter()
+        waited = 0.0
+        baidu_url = self.search_url.format(task_keyword)
         headers = self.gen_fake_header()
         edu_response_url = None
         try:
-            response = requests.get(url=baidu_url, headers=headers, verify=False, timeout=30)
+            if limiter is not None:
+                waited += limiter.wait()
+            response = self.session.get(url=baidu_url, headers=headers, verify=False,
+                                        timeout=(self.connect_time_out, 30))
             re_html = etree.HTML(response.text)
-            edu_url = re_html.xpath('//*[@id="1"]/h3/a[1]/@href')[0]
-            edu_response_url = requests.get(url=edu_url, verify=False, headers=headers).url
-            print(edu_response_url)
+            edu_url = urljoin(response.url, SEARCH_RESULT_LINK(re_html)[0])
+            if limiter is not None:
+                waited += limiter.wait()
+            # 搜索结果链接跳转到目标网站，只取跳转地址，不下载目标网站的页面
+            link = self.session.get(url=edu_url, verify=False, headers=headers, allow_redirects=False,
+                                    stream=True, timeout=(self.connect_time_out, 30))
+            link.close()
+            location = self.session.get_redirect_target(link)
+            if location is None:
+                # 不是跳转（如返回了 JavaScript 跳转页面），按原来的方式访问
+                edu_response_url = self.session.get(url=edu_url, verify=False, headers=headers,
+                                                    timeout=(self.connect_time_out, 30)).url
+            else:
+                edu_response_url = urljoin(edu_url, location)
             try:
                 edu_response = re.findall(r'www.(.*?)/', edu_response_url)[0]
             except:
                 edu_response = urlparse(edu_response_url).netloc
         except:
             edu_response = "None"
+        # 耗时不含等待限速的时间
+        elapsed = time.perf_counter() - start - waited
+        if latency is not None:
+            latency.record(elapsed)
+        print(f"【任务】{task_keyword} {edu_response_url} 耗时 {elapsed:.2f} s，等待限速 {waited:.2f} s")
+        if self.dir_delay:
+            time.sleep(self.dir_delay)
 
-        self.dir_result.append({
+        return {
             "title": task_keyword,
             "domain": edu_response,
             "url": edu_response_url
-        })
-        self.url_list.append(edu_response_url)
-        pass
+        }
 
     def url_scan(self):
-        process_name = multiprocessing.current_process().name
-        print("【URL扫描线程启动】" + process_name)
-        pool = futures.ThreadPoolExecutor(max_workers=self.pool_max_workers)
-        wait_for = [pool.submit(self.action, task_url) for task_url in self.url_list]
-        with open('%s-urlCheck.csv' % datetime.date.today(), 'a', newline='') as csvfile:
-            # csvfile.write(codecs.BOM_UTF8)
-            fieldnames = ['域名', 'url', '标题', 'http状态码', 'web指纹', 'WAF']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            # 注意header是个好东西
-            writer.writeheader()
-            for fs in futures.as_completed(wait_for):
+        with contextlib.ExitStack() as stack:
+            if self.jsonl_file == '-':
+                # 标准输出只留给结果，其它输出改到标准错误
+                stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+            process_name = multiprocessing.current_process().name
+            print("【URL扫描线程启动】" + process_name)
+            # 指纹库只加载一次，所有线程共用
+            Wappalyzer.shared()
+            self.probe_stats = ProbeStats()
+            journal = None
+            # 标准输入每次的内容都可能不同，不能中断后继续
+            if self.resume and self.url_source and self.url_source != '-':
+                journal = CompletionJournal(self.result_file + '.journal', self.url_source,
+                                            self.journal_sync_every, self.journal_sync_interval).open()
+                if journal.resumed:
+                    print(f"【继续上次的扫描】跳过已完成的目标 {journal.resumed} 个")
+            try:
+                sinks, store = self.open_sinks(stack, self.url_source,
+                                               resume=journal is not None and journal.resumed > 0)
+            except Exception:
+                if journal is not None:
+                    # 还没有开始扫描，只保留之前的完成记录
+                    journal.close(remove=not journal.resumed)
+                raise
+            self.history = None
+            if self.incremental and store is None:
+                print("【增量扫描需要设置 sqlite_file，进行完整扫描】")
+            if self.incremental and store is not None:
+                self.history = ScanHistory(self.sqlite_file, self.incremental_max_age * 86400)
+            self.incremental_stats = IncrementalStats()
+            self.archive = None
+            if self.warc_file:
+                self.archive = WarcWriter(self.warc_file)
+                stack.callback(self.archive.close)
+
+            def put(index, csv_res):
+                self.incremental_stats.record(csv_res)
+                result_writer.put(index, csv_res)
+
+            result_writer = ResultWriter(sinks, journal, self.write_batch_size, self.write_flush_interval)
+            targets = ((index, task_url) for index, task_url in enumerate(self.url_list)
+                       if journal is None or not journal.done(index))
+            try:
+                if self.async_mode and aiohttp is None:
+                    print("【没有安装aiohttp，使用线程池模式】")
+                if self.async_mode and aiohttp is not None:
+                    asyncio.run(self.url_scan_async(targets, put))
+                else:
+                    self.url_scan_threads(targets, put)
+            finally:
+                result_writer.close()
+                if journal is not None:
+                    # 正常结束后删除记录，下次运行重新扫描全部目标
+                    journal.close(remove=sys.exc_info()[0] is None)
+            if store is not None:
+                store.finish()
+            print(self.probe_stats.summary())
+            if self.history is not None:
+                print(self.incremental_stats.summary())
+            print(result_writer.summary())
+            if self.archive is not None:
+                print(self.archive.summary())
+            print(self.connection_stats.summary(self.probe_stats.succeeded + sum(self.probe_stats.dead.values())))
+
+    def open_sinks(self, stack, source, resume=False):
+        """
+        打开配置的结果文件（CSV、JSON Lines、SQLite），在 stack 退出时关闭，返回 (全部结果文件, SQLite 结果库)
+        """
+        # JSON Lines 文件可能因为没有安装 zstandard 不能写入，先于结果文件打开
+        jsonl = None
+        if self.jsonl_file:
+            jsonl = JsonlSink(self.jsonl_file)
+            stack.callback(jsonl.close)
+        sinks = [CsvSink(self.result_file)]
+        stack.callback(sinks[0].close)
+        if jsonl is not None:
+            sinks.append(jsonl)
+        store = None
+        if self.sqlite_file:
+            store = SqliteSink(self.sqlite_file, source, resume)
+            sinks.append(store)
+            stack.callback(store.close)
+        return sinks, store
+
+    def replay(self):
+        """
+        离线重新识别：从 WARC 归档读取保存的页面和WAF攻击探测响应，用当前的指纹库和WAF签名重新识别标题、指纹和WAF，
+        不发出任何请求，由多个进程并行处理。设置了 sqlite_file 时与上一次扫描的结果对比
+        """
+        with contextlib.ExitStack() as stack:
+            if self.jsonl_file == '-':
+                stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+            print(f"【离线重新识别】{self.replay_file}")
+            sinks, store = self.open_sinks(stack, 'replay:' + self.replay_file)
+            result_writer = ResultWriter(sinks, None, self.write_batch_size, self.write_flush_interval)
+            skipped = collections.Counter()
+            groups = replay_groups(self.replay_file, skipped=skipped)
+            batches = iter(lambda: list(itertools.islice(groups, self.replay_batch_size)), [])
+            start = time.perf_counter()
+            replayed = 0
+            try:
+                with futures.ProcessPoolExecutor(max_workers=self.replay_workers,
+                                                 initializer=quiet_stdout if self.jsonl_file == '-' else None) as pool:
+                    # 每个进程最多排队几批，WARC 再大内存占用也保持不变
+                    pending = set()
+                    for batch in batches:
+                        if len(pending) >= self.replay_workers * 4:
+                            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                            for fs in done:
+                                for csv_res in fs.result():
+                                    result_writer.put(None, csv_res)
+                                    replayed += 1
+                        pending.add(pool.submit(replay_batch, batch))
+                    for fs in futures.as_completed(pending):
+                        for csv_res in fs.result():
+                            result_writer.put(None, csv_res)
+                            replayed += 1
+            finally:
+                result_writer.close()
+            elapsed = time.perf_counter() - start
+            if store is not None:
+                store.finish()
+            print(f"【离线重新识别】{replayed} 个目标，耗时 {elapsed:.1f} s（{replayed / max(elapsed, 1e-9):.0f} 个/s），"
+                  f"{sum(skipped.values())} 个目标没有可识别的页面")
+            print(result_writer.summary())
+            if store is not None:
+                old_run, new_run, changes = scan_changes(self.sqlite_file, new_run=store.run_id)
+                if old_run is not None:
+                    kinds = collections.Counter(kind for kind, *_ in changes)
+                    fingerprints = sum(1 for change in changes if change[0] == 'changed' and change[8] != change[9])
+                    wafs = sum(1 for change in changes if change[0] == 'changed' and change[6] != change[7])
+                    print(f"【与扫描 {old_run} 对比】指纹变化 {fingerprints} 个，WAF变化 {wafs} 个，"
+                          f"新目标 {kinds['new']} 个，未重新识别 {kinds['gone']} 个，菜单 4 查看详细")
+
+    def url_scan_threads(self, targets, write_row):
+        """
+        线程池模式：每个线程完成一个URL的请求、指纹和WAF识别。
+        targets 为 (行号, URL)，由单独的线程读取并提交，读取很慢（标准输入、关键词搜索）时已完成的结果也会及时写出；
+        处理中的目标达到 task_window 个时，等有目标完成再继续读取
+        """
+        finished = queue.Queue()
+        slots = threading.Semaphore(self.task_window)
+        reading = {'stopped': False}
+
+        with futures.ThreadPoolExecutor(max_workers=self.pool_max_workers) as pool:
+            def feeder():
+                submitted = 0
                 try:
-                    writer.writerow(fs.result())
+                    for index, task_url in targets:
+                        slots.acquire()
+                        if reading['stopped']:
+                            return
+                        fs = pool.submit(self.action, task_url)
+                        fs.add_done_callback(lambda fs, index=index, task_url=task_url:
+                                             finished.put(('done', (fs, index, task_url))))
+                        submitted += 1
+                    finished.put(('end', submitted))
                 except Exception as e:
-                    print(f'写入csv出错\n错误原因:{e}')
-                    pass
+                    finished.put(('error', e))
+
+            threading.Thread(target=feeder, daemon=True).start()
+            written = 0
+            total = None
+            try:
+                while total is None or written < total:
+                    kind, value = finished.get()
+                    if kind == 'error':
+                        raise value
+                    if kind == 'end':
+                        total = value
+                        continue
+                    slots.release()
+                    written += 1
+                    write_row(*self.target_result(*value))
+            finally:
+                reading['stopped'] = True
+                slots.release()
+
+    @staticmethod
+    def target_result(fs, index, task_url):
+        """
+        取出一个目标的 (行号, 结果)，出错时只丢掉这个目标的结果，行号照常记入完成记录
+        """
+        try:
+            return index, fs.result()
+        except Exception as e:
+            print(f'【{task_url}】处理出错\n错误原因:{e}')
+            return index, None
+
+    async def url_scan_async(self, targets, write_row):
+        """
+        asyncio模式：请求都在事件循环里完成，同时保持大量连接，
+        标题、指纹、WAF识别是CPU密集的，交给进程池。处理中的目标同样不超过 task_window 个
+        """
+        loop = asyncio.get_running_loop()
+        pool = futures.ProcessPoolExecutor(max_workers=self.async_process_workers,
+                                           initializer=quiet_stdout if self.jsonl_file == '-' else None)
+        connector = aiohttp.TCPConnector(limit=self.async_max_connections, limit_per_host=self.pool_per_host,
+                                         ssl=False)
+        timeout = aiohttp.ClientTimeout(total=self.target_time_out, sock_connect=self.connect_time_out,
+                                        sock_read=self.http_time_out)
+        # 不同目标之间不共享cookie，与 requests.get 一致
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, trust_env=True,
+                                         cookie_jar=aiohttp.DummyCookieJar(),
+                                         trace_configs=[self.trace_config()]) as session:
+            async def probe(task_url):
+                deadline = Deadline(self.target_time_out)
+                previous = None
+                if self.history is not None:
+                    previous = await loop.run_in_executor(None, self.history.get, task_url)
+                res, scheme = await self.async_check_http(session, task_url, deadline, previous)
+                attack = None
+                changed = res is not None and self.unchanged(res, previous) is None
+                if changed:
+                    attack = ATTACK_FAILED
+                    if not deadline.expired():
+                        attack = await self.async_waf_attack(session, res.url, deadline)
+                if self.archive is not None and changed:
+                    # 队列满时在线程里等待，不阻塞事件循环；页面没有变化时不归档，与线程池模式相同
+                    for response, role in ((res, 'page'), (attack, 'waf')):
+                        if response is not None and response != ATTACK_FAILED:
+                            await loop.run_in_executor(None, self.archive.archive, task_url, response, role)
+                return await loop.run_in_executor(pool, process_target, task_url, res, scheme, attack,
+                                                  deadline, previous)
+
+            # 目标（可能来自标准输入或关键词搜索，读取很慢）由单独的线程读取，每读到一个就交给事件循环，
+            # 不阻塞事件循环，也不用等凑够一批；读取了但还没完成的目标不超过 task_window 个
+            batch = collections.deque()
+            arrived = asyncio.Event()
+            reading = {'exhausted': False, 'error': None, 'stopped': False}
+            slots = threading.Semaphore(self.task_window)
+
+            def arrive(item=None, error=None):
+                if item is not None:
+                    batch.append(item)
+                elif error is not None:
+                    reading['error'] = error
+                else:
+                    reading['exhausted'] = True
+                arrived.set()
+
+            def reader():
+                try:
+                    for item in targets:
+                        slots.acquire()
+                        if reading['stopped']:
+                            return
+                        loop.call_soon_threadsafe(arrive, item)
+                    loop.call_soon_threadsafe(arrive)
+                except Exception as e:
+                    loop.call_soon_threadsafe(arrive, None, e)
+
+            threading.Thread(target=reader, daemon=True).start()
+            pending = {}
+            try:
+                while True:
+                    while batch and len(pending) < self.task_window:
+                        index, task_url = batch.popleft()
+                        pending[asyncio.ensure_future(probe(task_url))] = index, task_url
+                    if reading['error'] is not None:
+                        raise reading['error']
+                    if reading['exhausted'] and not batch and not pending:
+                        break
+                    arrived.clear()
+                    waiting = asyncio.ensure_future(arrived.wait())
+                    done, _ = await asyncio.wait(set(pending) | {waiting}, return_when=asyncio.FIRST_COMPLETED)
+                    waiting.cancel()
+                    for fs in done - {waiting}:
+                        slots.release()
+                        write_row(*self.target_result(fs, *pending.pop(fs)))
+            finally:
+                reading['stopped'] = True
+                slots.release()
+        pool.shutdown()
+
+    def trace_config(self):
+        """
+        aiohttp 的请求数、新建连接数也记入 connection_stats
+        """
+        stats = self.connection_stats
+
+        async def on_request_start(session, context, params):
+            stats.request()
+
+        async def on_connection_create_end(session, context, params):
+            stats.connection()
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
 
     def get_show_banner(self):
         print("""\033[32m
@@ -154,7 +1775,6 @@ class UrlScan(object):
             'Accept-Encoding': 'gzip, deflate, br',
             'Accept-Language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
             'Cache-Control': 'max-age=0',
-            'Connection': 'close',
             'DNT': '1',
             'Cookie': 'BIDUPSID=564f939a8f8a5befa67d62bdf79e6fa5; PSTM=1605847972; BAIDUID=d9e45923b4fb84761b608da331c2d66c:FG=1;',
             'Referer': 'https://www.baidu.com/',
@@ -163,15 +1783,24 @@ class UrlScan(object):
         }
         return headers
 
-    def get_title(self, markup):
+    def get_webpage(self, response):
         """
-        获取网页标题
+        解析响应页面，标题、指纹和WAF识别共用这一份解析结果
         """
         try:
-            soup = BeautifulSoup(markup, 'lxml')
+            return WebPage.new_from_response(response)
         except Exception as e:
-            print(f"【无法获取标题】{e}")
+            print(f"【页面解析失败】{e}")
+            return None
+
+    def get_title(self, webpage):
+        """
+        获取网页标题
+        """
+        if webpage is None:
             return None
+        soup = webpage.parsed_html
+        markup = webpage.html
         title = soup.title
         if title:
             return title.text.strip()
@@ -197,78 +1826,313 @@ class UrlScan(object):
             return text.strip()
         return None
 
-    def get_banner(self, response):
+    def get_banner(self, webpage):
         banner = None
+        if webpage is None:
+            return None
         try:
-            w = Wappalyzer.latest()
-            webpage = WebPage.new_from_url(response)
+            w = Wappalyzer.shared()
             r = w.analyze(webpage)
             # banner = str({'Server': headers.get('Server'),
             #               'Via': headers.get('Via'),
             #               'X-Powered-By': headers.get('X-Powered-By')})
-            banner = json.dumps(r, sort_keys=True, separators=(',', ':'))
+            # 写入结果时再按输出格式序列化；按名称排序，不同进程识别同一页面的结果相同
+            banner = sorted(r, key=lambda app: str(app.get('name')))
         except Exception as e:
             print("【获取指纹信息失败】")
             print(e)
             return None
         return banner
 
-    def check_http(self, sql_ports):
-        '''HTTP服务探测'''
-        url = f'{sql_ports}'
+    def check_http(self, sql_ports, deadline=None, previous=None):
+        '''HTTP服务探测，返回 (响应, 实际使用的协议)，previous 为增量扫描时上次的结果'''
+        if deadline is None:
+            deadline = Deadline(self.target_time_out)
+        probe = Probe(f'{sql_ports}', self.scheme_preference, deadline)
         # 随机获取一个Header头
-        headers = self.gen_fake_header()
-        try:
-            response = requests.get(url, timeout=self.http_time_out, verify=False, headers=headers)
-        except requests.exceptions.Timeout:
-            print(f'{sql_ports} 无法访问【访问超时】')
-            return None
-        except requests.exceptions.SSLError:
-            st_sql_ports = urlparse(sql_ports).netloc
-            url = f'https://{st_sql_ports}'
+        headers = self.conditional_headers(self.gen_fake_header(), previous)
+        if probe.bare:
+            print("【没有HTTP头，自动添加】" + probe.target)
+        start = time.perf_counter()
+        if probe.bare and self.scheme_race:
+            response, scheme = self.race_http(probe, headers)
+        else:
+            response, scheme = self.fallback_http(probe, headers)
+        self.probe_done(probe, response, time.perf_counter() - start)
+        return response, scheme
+
+    def probe_done(self, probe, response, elapsed):
+        self.probe_stats.record(probe, response is not None, elapsed)
+        if response is None and probe.failures:
+            _, failure, error = probe.failures[-1]
+            print(f'{probe.target} 无法访问【{FAILURE_LABELS[failure]}】')
+            if failure == 'other':
+                print(error)
+
+    def fetch(self, url, headers, deadline):
+        """
+        在 deadline 内请求 url：连接、读取分别超时，手动跟随重定向，
+        预算用完时即使还在读取响应内容也立即放弃
+        """
+        session = self.session
+        # 共用会话不保存cookie，重定向过程中设置的cookie在这里传递
+        cookies = requests.cookies.RequestsCookieJar()
+        history = []
+        while True:
+            response = session.get(url, headers=headers, cookies=cookies, verify=False, stream=True,
+                                   allow_redirects=False,
+                                   timeout=deadline.timeout(self.connect_time_out, self.http_time_out))
+            watchdog = threading.Timer(deadline.remaining(), abort_response, (response,))
+            watchdog.daemon = True
+            watchdog.start()
             try:
-                response = requests.get(url, timeout=self.http_time_out, verify=False, headers=headers)
+                response.content
             except Exception as e:
-                return None
-            else:
-                return response
-        # 报错判断为没有加HTTP头
-        except Exception as e:
-            print("【没有HTTP头，自动添加】" + url)
-            # sql_ports = urlparse(sql_ports).netloc
-            url = f'http://{sql_ports}'
+                if deadline.expired():
+                    raise DeadlineExceeded() from e
+                raise
+            finally:
+                watchdog.cancel()
+                response.close()
+            location = session.get_redirect_target(response)
+            if location is None:
+                break
+            if len(history) >= session.max_redirects:
+                raise requests.exceptions.TooManyRedirects(
+                    f'Exceeded {session.max_redirects} redirects.', response=response)
+            history.append(response)
+            cookies.update(response.cookies)
+            url = urljoin(response.url, location)
+        response.history = history
+        return response
+
+    def fallback_http(self, probe, headers):
+        '''依次尝试各个协议'''
+        for scheme in probe:
             try:
-                response = requests.get(url, timeout=self.http_time_out, verify=False, headers=headers)
-            except requests.exceptions.Timeout:
-                print(f'{sql_ports} 无法访问【访问超时】')
-                return None
-            # SSL错误，说明要HTTPS访问
-            except requests.exceptions.SSLError:
-                url = f'https://{sql_ports}'
-                try:
-                    response = requests.get(url, timeout=self.http_time_out, verify=False, headers=headers)
-                except Exception as e:
-                    return None
-                else:
-                    return response
+                return self.fetch(probe.url(scheme), headers, probe.deadline), scheme
             except Exception as e:
-                url = f'https://{sql_ports}'
-                try:
-                    response = requests.get(url, timeout=self.http_time_out, verify=False, headers=headers)
-                except Exception as e:
-                    print("最终还是错误")
-                    print(e)
-                    return None
-                else:
-                    return response
+                probe.failed(scheme, e)
+        return None, None
+
+    def race_http(self, probe, headers):
+        """
+        同时尝试http和https：优先协议先发起，scheme_race_delay 秒后或优先协议失败时发起另一个，
+        返回最先成功的 (响应, 协议)。落后的请求不再等待，结束后直接丢弃
+        """
+        results = queue.Queue()
+
+        def attempt(scheme):
+            try:
+                results.put((scheme, self.fetch(probe.url(scheme), headers, probe.deadline), None))
+            except Exception as e:
+                results.put((scheme, None, e))
+
+        def start():
+            scheme = probe.next_scheme()
+            if scheme is None:
+                return 0
+            threading.Thread(target=attempt, args=(scheme,), daemon=True).start()
+            return 1
+
+        pending = start()
+        waiting = True
+        while pending:
+            timeout = probe.deadline.remaining()
+            if waiting:
+                timeout = min(timeout, self.scheme_race_delay)
+            try:
+                scheme, response, error = results.get(timeout=timeout)
+            except queue.Empty:
+                if probe.out_of_time():
+                    probe.failed(None, DeadlineExceeded())
+                    break
+                pending += start()
+                waiting = False
+                continue
+            pending -= 1
+            if response is not None:
+                return response, scheme
+            probe.failed(scheme, error)
+            if probe.hopeless:
+                break
+            if waiting:
+                pending += start()
+                waiting = False
+        return None, None
 
+    @staticmethod
+    def build_response(resp, body):
+        """
+        把 aiohttp 的响应转换成 requests.Response，后续处理与线程池模式共用
+        """
+        response = requests.Response()
+        response.url = str(resp.url)
+        response.status_code = resp.status
+        response.reason = resp.reason
+        # 与 urllib3 一致，重复的响应头（如 Set-Cookie）用逗号合并
+        headers = requests.structures.CaseInsensitiveDict()
+        for name, value in resp.headers.items():
+            if name in headers:
+                headers[name] = f'{headers[name]}, {value}'
             else:
-                return response
-        else:
+                headers[name] = value
+        response.headers = headers
+        response.encoding = requests.utils.get_encoding_from_headers(headers)
+        response.cookies = requests.cookies.cookiejar_from_dict(
+            {name: morsel.value for name, morsel in resp.cookies.items()})
+        response._content = body
+        # aiohttp 按 utf-8 解码响应头，保存 WARC 时按 utf-8 还原
+        response.header_encoding = 'utf-8'
+        info = resp.request_info
+        response.request = requests.Request(info.method, str(info.url), headers=dict(info.headers)).prepare()
+        return response
+
+    async def async_get(self, session, url, headers, **kwargs):
+        async with session.get(url, headers=headers, **kwargs) as resp:
+            body = await resp.read()
+            response = self.build_response(resp, body)
+            # 重定向响应的内容不读取
+            response.history = [self.build_response(hop, b'') for hop in resp.history]
             return response
 
+    def client_timeout(self, deadline, read=None):
+        """
+        aiohttp 的超时设置，总时间不超过剩余时间
+        """
+        remaining = deadline.remaining()
+        return aiohttp.ClientTimeout(total=remaining, sock_connect=min(self.connect_time_out, remaining),
+                                     sock_read=min(read or self.http_time_out, remaining))
+
+    async def async_check_http(self, session, sql_ports, deadline=None, previous=None):
+        """
+        HTTP服务探测（asyncio），协议回退规则与 check_http 相同
+        """
+        if deadline is None:
+            deadline = Deadline(self.target_time_out)
+        probe = Probe(f'{sql_ports}', self.scheme_preference, deadline)
+        headers = self.conditional_headers(self.gen_fake_header(), previous)
+        if probe.bare:
+            print("【没有HTTP头，自动添加】" + probe.target)
+        start = time.perf_counter()
+        if probe.bare and self.scheme_race:
+            response, scheme = await self.async_race_http(session, probe, headers)
+        else:
+            response, scheme = await self.async_fallback_http(session, probe, headers)
+        self.probe_done(probe, response, time.perf_counter() - start)
+        return response, scheme
+
+    async def async_fallback_http(self, session, probe, headers):
+        for scheme in probe:
+            try:
+                return await self.async_get(session, probe.url(scheme), headers,
+                                            timeout=self.client_timeout(probe.deadline)), scheme
+            except Exception as e:
+                probe.failed(scheme, e)
+        return None, None
+
+    async def async_race_http(self, session, probe, headers):
+        """
+        与 race_http 相同，落后的请求直接取消
+        """
+        attempts = {}
+
+        def start():
+            scheme = probe.next_scheme()
+            if scheme is not None:
+                task = asyncio.ensure_future(self.async_get(session, probe.url(scheme), headers,
+                                                            timeout=self.client_timeout(probe.deadline)))
+                attempts[task] = scheme
+
+        start()
+        waiting = True
+        try:
+            while attempts:
+                timeout = probe.deadline.remaining()
+                if waiting:
+                    timeout = min(timeout, self.scheme_race_delay)
+                done, _ = await asyncio.wait(attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done and probe.out_of_time():
+                    probe.failed(None, DeadlineExceeded())
+                    break
+                for task in done:
+                    scheme = attempts.pop(task)
+                    if task.exception() is None:
+                        return task.result(), scheme
+                    probe.failed(scheme, task.exception())
+                if probe.hopeless:
+                    break
+                if waiting:
+                    start()
+                    waiting = False
+        finally:
+            for task in attempts:
+                task.cancel()
+        return None, None
+
+    async def async_waf_attack(self, session, url, deadline):
+        """
+        提前发出 wafw00f 的攻击探测请求，请求参数与 WAFW00F.centralAttack 相同，失败时返回 ATTACK_FAILED
+        """
+        attacker = WAFW00F(url)
+        attack_url = requests.Request('GET', url, params=attacker.centralAttackParams()).prepare().url
+        timeout = self.client_timeout(deadline, read=self.waf_time_out)
+        timeout = aiohttp.ClientTimeout(total=min(timeout.total, self.waf_time_out),
+                                        sock_connect=timeout.sock_connect, sock_read=timeout.sock_read)
+        try:
+            return await self.async_get(session, yarl.URL(attack_url, encoded=True), dict(def_headers),
+                                        allow_redirects=False, timeout=timeout)
+        except Exception:
+            return ATTACK_FAILED
+
     def action(self, task_url):
-        res = self.check_http(task_url)
+        deadline = Deadline(self.target_time_out)
+        previous = self.history.get(task_url) if self.history is not None else None
+        res, scheme = self.check_http(task_url, deadline, previous)
+        # 页面没有变化时不归档：没有WAF攻击探测记录，离线重新识别会把上次的WAF结果当成没有WAF
+        if res is not None and self.archive is not None and self.unchanged(res, previous) is None:
+            self.archive.archive(task_url, res)
+        return self.process(task_url, res, scheme, deadline=deadline, previous=previous)
+
+    @staticmethod
+    def conditional_headers(headers, previous):
+        """
+        增量扫描时带上上次响应的 ETag、Last-Modified，页面没有变化时服务器只返回 304
+        """
+        if previous is not None:
+            if previous['etag']:
+                headers['If-None-Match'] = previous['etag']
+            if previous['last_modified']:
+                headers['If-Modified-Since'] = previous['last_modified']
+        return headers
+
+    @staticmethod
+    def body_hash(res):
+        return hashlib.blake2b(res.content, digest_size=16).hexdigest()
+
+    def unchanged(self, res, previous):
+        """
+        页面与上次相同时返回原因（'not_modified' 或 'same_body'），否则返回 None
+        """
+        if previous is None or res.url != previous['url']:
+            return None
+        if res.status_code == 304:
+            return 'not_modified'
+        if res.status_code == previous['status'] and self.body_hash(res) == previous['body_hash']:
+            return 'same_body'
+        return None
+
+    def waf_timeout(self, deadline):
+        if deadline is None or deadline.expired():
+            return self.waf_time_out
+        return deadline.timeout(self.connect_time_out, self.waf_time_out)
+
+    def process(self, task_url, res, scheme=None, attack=None, deadline=None, previous=None):
+        """
+        根据探测结果获取标题、指纹和WAF信息，scheme 为探测成功的协议，
+        attack 为已经发出的WAF攻击探测响应（ATTACK_FAILED 表示请求失败，不再识别WAF），deadline 为目标剩余的耗时预算，
+        previous 为增量扫描时上次的结果，页面没有变化时沿用上次的标题、指纹和WAF
+        """
         try:
             task_domain = urlparse(task_url)
             print("【任务URL】" + task_url)
@@ -276,37 +2140,87 @@ class UrlScan(object):
             fig = ""
             status_code = ""
             waf = ""
+            cache = None
+            unchanged = None if res is None else self.unchanged(res, previous)
             if res is None:
                 res_url = task_url
+            elif unchanged is not None:
+                # 页面没有变化，只确认存活
+                task_domain = urlparse(res.url)
+                res_url = res.url
+                res_title = previous['title']
+                fig = json.loads(previous['fingerprints']) if previous['fingerprints'] else None
+                status_code = previous['status']
+                waf = previous['waf'] or ''
+                cache = {
+                    'path': unchanged,
+                    'etag': res.headers.get('ETag') or previous['etag'],
+                    'last_modified': res.headers.get('Last-Modified') or previous['last_modified'],
+                    'body_hash': previous['body_hash'],
+                    'analyzed': previous['analyzed'],
+                }
             else:
                 res.encoding = res.apparent_encoding
                 task_domain = urlparse(res.url)
                 res_url = res.url
-                fig = self.get_banner(res)
+                webpage = self.get_webpage(res)
+                fig = self.get_banner(webpage)
                 status_code = res.status_code
-                res_title = self.get_title(markup=res.text)
-                flag, waf = main(res_url)
+                res_title = self.get_title(webpage)
+                # 预算用完或攻击探测请求已经失败时不再发出WAF攻击探测请求
+                flag = False
+                if attack != ATTACK_FAILED and (attack is not None or deadline is None or not deadline.expired()):
+                    flag, waf = main(res_url, response=res,
+                                     text=webpage.html if webpage is not None else None,
+                                     attack=attack, timeout=self.waf_timeout(deadline), session=self.session,
+                                     hooks={'response': self.archive.hook(task_url)} if self.archive else None,
+                                     remaining=deadline.remaining if deadline is not None else None)
                 if not flag:
                     waf = ''
+                # 记下缓存验证信息和内容哈希，供之后的增量扫描使用
+                cache = {
+                    'path': 'new' if previous is None else 'changed',
+                    'etag': res.headers.get('ETag'),
+                    'last_modified': res.headers.get('Last-Modified'),
+                    'body_hash': self.body_hash(res),
+                    'analyzed': datetime.datetime.now().isoformat(' ', 'seconds'),
+                }
 
             if res_title is None:
                 res_title = ""
 
             csv_res = {
+                '目标': task_url,
                 '域名': task_domain.netloc,
                 'url': res_url,
                 '标题': res_title,
                 'http状态码': status_code,
                 'web指纹': fig,
-                'WAF': waf
+                'WAF': waf,
+                '协议': scheme or ''
             }
             print(csv_res)
+            if cache is not None:
+                csv_res['缓存'] = cache
             return csv_res
 
         except Exception as e:
             print(f'{task_url}出错\n错误原因:{e}')
 
 
+worker_scan = None
+
+
+def process_target(task_url, res, scheme=None, attack=None, deadline=None, previous=None):
+    """
+    在进程池中处理一个URL的探测结果，每个进程共用一个 UrlScan（及其连接池）
+    """
+    global worker_scan
+    if worker_scan is None:
+        worker_scan = UrlScan()
+    return worker_scan.process(task_url, res, scheme, attack, deadline, previous)
+
+
 if __name__ == '__main__':
     Scan = UrlScan()
     Scan.main()
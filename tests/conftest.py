@@ -0,0 +1,12 @@
+import pytest
+
+from tests.standin import stand_in_server
+
+
+@pytest.fixture
+def server():
+    """
+    本地 127.0.0.1 上的模拟服务器，见 tests.standin.StandInHandler
+    """
+    with stand_in_server(0) as server:
+        yield server
@@ -0,0 +1,63 @@
+"""
+按正则表达式构造能被它匹配的字符串，用指纹库和WAF签名生成测试页面
+"""
+import re
+import string
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: r'\d', sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_WORD: r'\w', sre_constants.CATEGORY_NOT_WORD: r'\W',
+    sre_constants.CATEGORY_SPACE: r'\s', sre_constants.CATEGORY_NOT_SPACE: r'\S',
+}
+
+
+def in_class(items, char):
+    for op, av in items:
+        if op is sre_constants.LITERAL and char == chr(av):
+            return True
+        if op is sre_constants.RANGE and av[0] <= ord(char) <= av[1]:
+            return True
+        if op is sre_constants.CATEGORY and re.match(CATEGORIES[av], char):
+            return True
+    return False
+
+
+def emit(items):
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            yield chr(av)
+        elif op is sre_constants.NOT_LITERAL:
+            yield 'x' if chr(av) != 'x' else 'y'
+        elif op is sre_constants.ANY:
+            yield 'a'
+        elif op is sre_constants.IN:
+            negate = bool(av) and av[0][0] is sre_constants.NEGATE
+            chars = [c for c in string.ascii_letters + string.digits + ' -_.:/' if in_class(av[negate:], c) != negate]
+            if not chars:
+                raise ValueError(av)
+            yield chars[0]
+        elif op is sre_constants.BRANCH:
+            yield from emit(av[1][0])
+        elif op is sre_constants.SUBPATTERN:
+            yield from emit(av[-1])
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            for _ in range(av[0]):
+                yield from emit(av[2])
+
+
+def example(pattern):
+    """
+    构造一个能被 pattern 匹配的字符串，构造不出时返回 None
+    """
+    try:
+        text = ''.join(emit(sre_parse.parse(pattern, re.I)))
+    except (re.error, ValueError):
+        return None
+    return text if re.search(pattern, text, re.I) else None
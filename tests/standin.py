@@ -0,0 +1,244 @@
+"""
+测试和性能基准测试共用的模拟站点，只监听本地 127.0.0.1，不访问外网
+"""
+import collections
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+from scan import UrlScan
+
+
+def sample_page(size=100 * 1024):
+    """
+    构造一个带常见指纹特征的页面
+    """
+    head = """<!DOCTYPE html>
+<html lang="zh-CN"><head>
+<meta charset="utf-8">
+<title>WgpSec 狼组安全团队</title>
+<meta name="generator" content="WordPress 5.5.3">
+<meta name="description" content="benchmark page">
+<link rel="stylesheet" href="/wp-content/themes/twentytwenty/style.css">
+<script src="/wp-includes/js/jquery/jquery.js?ver=1.12.4-wp"></script>
+<script src="https://cdn.jsdelivr.net/npm/vue@2.6.12/dist/vue.min.js"></script>
+<script src="https://www.googletagmanager.com/gtag/js?id=UA-000000-1"></script>
+</head><body>
+"""
+    row = '<div class="post"><h2><a href="/archives/{0}">文章 {0}</a></h2><p>lorem ipsum dolor sit amet</p></div>\n'
+    body = []
+    length = len(head)
+    i = 0
+    while length < size:
+        line = row.format(i)
+        body.append(line)
+        length += len(line)
+        i += 1
+    return head + ''.join(body) + '</body></html>'
+
+
+SAMPLE_HEADERS = {
+    'Server': 'nginx/1.18.0',
+    'X-Powered-By': 'PHP/7.4.3',
+    'Content-Type': 'text/html; charset=UTF-8',
+    'Set-Cookie': 'PHPSESSID=0123456789abcdef; path=/',
+}
+
+
+def sample_response(url='https://www.wgpsec.org/'):
+    """
+    构造一个未声明字符集的 requests 响应
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response.reason = 'OK'
+    response.headers = requests.structures.CaseInsensitiveDict(SAMPLE_HEADERS)
+    response.headers['Content-Type'] = 'text/html'
+    response._content = sample_page().encode('utf-8')
+    response.encoding = None
+    return response
+
+
+# 模拟站点：路径第一段决定站点特征，(正常响应头, 攻击响应状态码, 攻击响应头, 攻击响应正文)
+STAND_IN_SITES = {
+    'plain': ({}, 200, {}, None),
+    'cloudflare': ({'Server': 'cloudflare', 'CF-RAY': '5f0000000000-LAX'}, 200, {}, None),
+    'modsecurity': ({}, 403, {}, b'This error was generated by Mod_Security'),
+    'sucuri': ({}, 403, {'X-Sucuri-ID': '14016'}, b'Access Denied - Sucuri Website Firewall'),
+    'webknight': ({}, 999, {}, b'WebKnight Application Firewall Alert'),
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'nginx'
+    sys_version = ''
+    delay = 0.005
+    requests = collections.Counter()  # 收到的页面请求和WAF攻击探测请求数
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if not self.path.startswith('/'):
+            # 作为代理收到的请求
+            self.path = urlsplit(self.path)._replace(scheme='', netloc='').geturl()
+        path, _, query = self.path.partition('?')
+        site = path.strip('/').split('/')[0]
+        if site == 'drip':
+            return self.drip()
+        if site == 'drip-attack' and query:
+            # 页面正常返回，WAF 攻击探测的响应一点点发送
+            self.requests['attack'] += 1
+            return self.drip()
+        if site == 's':
+            # 模拟搜索结果页面，第一条结果指向跳转链接
+            keyword = query.partition('wd=')[2].partition('&')[0]
+            self.requests['search'] += 1
+            # missing 开头的关键词没有搜索结果
+            result = '' if keyword.startswith('missing') else \
+                f'<div id="1"><h3><a href="/link?url={keyword}">{keyword}</a></h3></div>'
+            body = f'<html><body>{result}{sample_page(16 * 1024)}</body></html>'.encode('utf-8')
+            time.sleep(self.delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if site == 'link':
+            # 模拟搜索结果的跳转链接
+            self.requests['link'] += 1
+            time.sleep(self.delay)
+            self.send_response(302)
+            self.send_header('Location', f'http://www.{query.partition("url=")[2]}.example:{self.server.server_address[1]}/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if site == 'redirect':
+            # /redirect/<n>/... 经过 n 次重定向
+            parts = path.strip('/').split('/')
+            hops = int(parts[1])
+            location = f'/redirect/{hops - 1}/' + '/'.join(parts[2:]) if hops > 1 else '/' + '/'.join(parts[2:])
+            time.sleep(self.delay)
+            self.send_response(302)
+            self.send_header('Location', location)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        headers, attack_status, attack_headers, attack_body = STAND_IN_SITES.get(site, STAND_IN_SITES['plain'])
+        status, body = 200, sample_page(4 * 1024).encode('utf-8')
+        headers = dict(headers)
+        self.requests['attack' if query else 'page'] += 1
+        if query:
+            # 带参数的请求视为 WAF 攻击探测
+            status = attack_status
+            headers.update(attack_headers)
+            if attack_body is not None:
+                body = attack_body
+        elif site == 'etag':
+            # 支持条件请求的页面
+            headers['ETag'] = '"stand-in"'
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                status, body = 304, b''
+        elif site == 'latin1':
+            # 响应头中有非 ASCII 字节（http.server 按 latin-1 编码）
+            headers['X-Powered-By'] = 'WAF\xe5\xae\x89'
+        elif site == 'changing':
+            # 每次内容都不同的页面
+            body += f'<!-- {time.time_ns()} -->'.encode('utf-8')
+        time.sleep(self.delay)
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def drip(self):
+        # 每隔一段时间只发送一小块内容，每次读取都不会超时，但总耗时很长
+        body = sample_page(64 * 1024).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            for i in range(0, len(body), 1024):
+                self.wfile.write(body[i:i + 1024])
+                self.wfile.flush()
+                time.sleep(0.5)
+        except OSError:
+            pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def base_url(self):
+        return 'http://127.0.0.1:%d' % self.server_address[1]
+
+
+def stand_in_server(delay=None):
+    handler = StandInHandler
+    if delay is not None:
+        handler = type('StandInHandler', (StandInHandler,), {'delay': delay})
+    return StandInServer(('127.0.0.1', 0), handler)
+
+
+class StandInTLSServer(StandInServer):
+    """
+    只提供HTTPS的模拟服务器，明文HTTP连接一直没有响应（类似被防火墙丢弃）
+    """
+    stall = 30
+
+    def __init__(self, handler):
+        StandInServer.__init__(self, ('127.0.0.1', 0), handler)
+        self.cert_dir = tempfile.mkdtemp(prefix='urlscan-bench-')
+        cert = os.path.join(self.cert_dir, 'cert.pem')
+        subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                        '-subj', '/CN=127.0.0.1', '-keyout', cert, '-out', cert],
+                       check=True, capture_output=True)
+        self.context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.context.load_cert_chain(cert)
+
+    def __exit__(self, *exc):
+        StandInServer.__exit__(self, *exc)
+        shutil.rmtree(self.cert_dir, ignore_errors=True)
+
+    def finish_request(self, request, client_address):
+        # TLS 握手的第一个字节是 0x16
+        if request.recv(1, socket.MSG_PEEK) != b'\x16':
+            time.sleep(self.stall)
+            return
+        StandInServer.finish_request(self, self.context.wrap_socket(request, server_side=True), client_address)
+
+
+class StubUrlScan(UrlScan):
+    """
+    不发出请求，只测量读取目标、提交任务、写出结果本身
+    """
+
+    def action(self, task_url):
+        return {'url': task_url}
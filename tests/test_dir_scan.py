@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from scan import UrlScan, aiohttp
+from tests.standin import StandInHandler
+
+
+def keyword_scan(server, monkeypatch, keywords, rate_limit=0):
+    # 搜索到的目标网站也由模拟服务器提供
+    monkeypatch.setenv('http_proxy', server.base_url)
+    monkeypatch.setenv('no_proxy', '127.0.0.1')
+    scan = UrlScan()
+    scan.search_url = server.base_url + '/s?wd={}'
+    scan.dict_url = keywords
+    scan.dir_rate_limit = rate_limit
+    scan.dir_delay = 0
+    return scan
+
+
+def test_keywords_resolved_in_order(server, monkeypatch):
+    """
+    多线程搜索的结果按关键词的顺序保存，只读取跳转地址，不下载目标网站页面
+    """
+    keywords = [f'school{i}' for i in range(20)] + ['missing0']
+    scan = keyword_scan(server, monkeypatch, keywords)
+    StandInHandler.requests.clear()
+    scan.dir_scan()
+    port = server.server_address[1]
+    assert [(row['title'], row['domain']) for row in scan.dir_result] == \
+        [(keyword, f'{keyword}.example:{port}') for keyword in keywords[:-1]] + [('missing0', 'None')]
+    assert scan.url_list[-1] is None
+    assert StandInHandler.requests['page'] == 0
+
+
+def test_rate_limit(server, monkeypatch):
+    """
+    所有线程合计每秒发出的请求不超过 dir_rate_limit 个
+    """
+    scan = keyword_scan(server, monkeypatch, [f'school{i}' for i in range(5)], rate_limit=20)
+    start = time.perf_counter()
+    scan.dir_scan()
+    # 10 个请求，第一个不用等待
+    assert time.perf_counter() - start >= 9 / 20
+
+
+def test_pipeline_probes_discovered_urls(server, monkeypatch, tmp_path):
+    """
+    主域名收集+URL探测：每个搜索到的URL探测一次，没有搜索到的关键词、重复的URL不再探测
+    """
+    keywords = ['school0', 'school1', 'school0', 'missing0', 'school2']
+    scan = keyword_scan(server, monkeypatch, keywords)
+    scan.result_file = str(tmp_path / 'result.csv')
+    StandInHandler.requests.clear()
+    scan.dir_url_scan()
+    assert [row['title'] for row in scan.dir_result] == keywords
+    with open(scan.result_file) as f:
+        assert len(f.readlines()) - 1 == 3
+    assert StandInHandler.requests['page'] == 3
+
+
+@pytest.mark.parametrize('mode', ['threads', 'async'])
+def test_rows_written_while_source_stalls(server, mode):
+    """
+    目标读取很慢（如等待关键词搜索）时，已完成的目标照常写出，不等读取结束
+    """
+    if mode == 'async' and aiohttp is None:
+        pytest.skip('没有安装aiohttp')
+    resume = threading.Event()
+
+    def targets():
+        for index in range(3):
+            yield index, f'{server.base_url}/plain/{index}'
+        resume.wait(10)
+
+    rows = []
+    scan = UrlScan()
+    if mode == 'async':
+        def run():
+            asyncio.run(scan.url_scan_async(targets(), lambda index, row: rows.append(row)))
+    else:
+        def run():
+            scan.url_scan_threads(targets(), lambda index, row: rows.append(row))
+    thread = threading.Thread(target=run)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 3
+        while len(rows) < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(rows) == 3
+    finally:
+        resume.set()
+        thread.join()
@@ -0,0 +1,77 @@
+import pytest
+import requests
+
+from wafw00f.main import WAFW00F
+from wafw00f.signatures import convert_plugins
+from tests.examples import example
+
+
+def response(status=200, reason='OK', headers=(), body=''):
+    r = requests.Response()
+    r.url = 'https://www.wgpsec.org/'
+    r.status_code = status
+    r.reason = reason
+    r.headers = requests.structures.CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8'})
+    r.headers.update(headers)
+    r._content = f'<html><body>{body}</body></html>'.encode('utf-8')
+    r.encoding = 'utf-8'
+    return r
+
+
+def responses(rules):
+    """
+    构造满足 rules 的 (正常响应, 攻击探测响应)
+    """
+    fields = {False: dict(headers={}, body=''), True: dict(headers={}, body='')}
+    for rule in rules:
+        side = fields[rule['attack']]
+        if rule['type'] == 'status':
+            side['status'] = rule['status']
+        elif rule['type'] == 'reason':
+            side['reason'] = rule['reason']
+        else:
+            text = example(rule['regex'])
+            if text is None:
+                return None
+            if rule['type'] == 'header':
+                side['headers'][rule['name']] = text
+            elif rule['type'] == 'cookie':
+                side['headers']['Set-Cookie'] = text
+            else:
+                side['body'] += text
+    return response(**fields[False]), response(**fields[True])
+
+
+def cases():
+    yield 'plain', response(), response()
+    yield 'no attack', response(), None
+    signatures, _ = convert_plugins(WAFW00F.plugin_dict)
+    for signature in signatures:
+        for schema in signature['schemas']:
+            groups = [schema['rules']] if schema['match'] == 'all' else [[rule] for rule in schema['rules']]
+            for rules in groups:
+                pair = responses(rules)
+                if pair is not None:
+                    yield signature['name'], pair[0], pair[1]
+
+
+CASES = list(cases())
+
+
+@pytest.mark.parametrize('findall', [True, False])
+def test_engine_matches_plugins(findall):
+    """
+    用转换后的签名构造响应，DetectionEngine 的识别结果与按 checklist 依次调用插件相同
+    """
+    assert len(CASES) > 300
+    found = 0
+    for name, rq, attackres in CASES:
+        waf = WAFW00F(rq.url)
+        waf.rq, waf.attackres = rq, attackres
+        expected = [vendor for vendor in waf.checklist if waf.wafdetections[vendor](waf)]
+        if not findall:
+            expected = expected[:1]
+        assert waf.engine.detect(waf, findall) == expected, name
+        found += name in expected
+    # 构造的响应基本都能识别出对应的WAF
+    assert found > len(CASES) * (0.9 if findall else 0.5)
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from tests.standin import STAND_IN_SITES, StandInHandler
+from scan import ATTACK_FAILED, UrlScan, aiohttp
+
+pytestmark = pytest.mark.skipif(aiohttp is None, reason='没有安装aiohttp')
+
+
+def scan_rows(scan, urls, mode):
+    rows = []
+    targets = enumerate(urls)
+    if mode == 'async':
+        asyncio.run(scan.url_scan_async(targets, lambda index, row: rows.append(row)))
+    else:
+        scan.url_scan_threads(targets, lambda index, row: rows.append(row))
+    return sorted((row['url'], row['http状态码'], row['WAF']) for row in rows)
+
+
+def test_async_mode_matches_threads(server):
+    """
+    asyncio模式与线程池模式的结果相同
+    """
+    urls = [f'{server.base_url}/{site}/{i}' for i in range(5) for site in STAND_IN_SITES]
+    threads = scan_rows(UrlScan(), urls, 'threads')
+    assert len(threads) == len(urls)
+    assert any(waf for _, _, waf in threads)
+    assert scan_rows(UrlScan(), urls, 'async') == threads
+
+
+class FailingAttackUrlScan(UrlScan):
+    async def async_waf_attack(self, session, url, deadline):
+        return ATTACK_FAILED
+
+
+def test_failed_attack_probe_is_not_resent(server):
+    """
+    asyncio模式的WAF攻击探测请求失败后，进程池中不再发出阻塞的攻击探测请求
+    """
+    StandInHandler.requests.clear()
+    urls = [f'{server.base_url}/cloudflare/{i}' for i in range(5)]
+    rows = scan_rows(FailingAttackUrlScan(), urls, 'async')
+    assert len(rows) == len(urls)
+    assert StandInHandler.requests['attack'] == 0
@@ -0,0 +1,35 @@
+from tests.standin import StandInHandler
+from scan import UrlScan
+
+
+def run(url_file, result_file, sqlite_file, incremental):
+    scan = UrlScan()
+    scan.url_file = url_file
+    scan.result_file = result_file
+    scan.sqlite_file = sqlite_file
+    scan.incremental = incremental
+    scan.get_url_list()
+    scan.url_scan()
+    with open(result_file) as f:
+        return scan, sorted(f)
+
+
+def test_incremental_output_matches_full_scan(server, tmp_path):
+    """
+    增量扫描的结果与完整扫描相同，页面没有变化的目标不再识别、不再发出WAF攻击探测
+    """
+    url_file = tmp_path / 'domain.txt'
+    url_file.write_text(''.join(f'{server.base_url}/{site}/{i}\n'
+                                for i in range(5) for site in ('plain', 'cloudflare', 'etag', 'changing')))
+    sqlite_file = str(tmp_path / 'urlscan.db')
+    _, full = run(str(url_file), str(tmp_path / 'full.csv'), sqlite_file, False)
+
+    StandInHandler.requests.clear()
+    scan, incremental = run(str(url_file), str(tmp_path / 'incremental.csv'), sqlite_file, True)
+    assert incremental == full
+    counts = scan.incremental_stats.counts
+    assert counts['not_modified'] == 5
+    assert counts['same_body'] == 10
+    assert counts['changed'] == 5
+    # 只有内容有变化的页面才重新发出WAF攻击探测
+    assert StandInHandler.requests['attack'] == 5
@@ -0,0 +1,160 @@
+import asyncio
+import contextlib
+import socket
+import struct
+import threading
+
+import pytest
+import requests
+
+from tests.standin import stand_in_server
+from scan import Deadline, Probe, aiohttp, classify_failure, is_read_timeout
+
+
+def closed_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+@contextlib.contextmanager
+def raw_server(reply):
+    """
+    读到请求后回复 reply 的字节；reply 为 None 时用 RST 重置连接
+    """
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(16)
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                conn.recv(65536)
+                if reply is None:
+                    conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+                else:
+                    conn.sendall(reply)
+
+    threading.Thread(target=serve, daemon=True).start()
+    try:
+        yield listener.getsockname()[1]
+    finally:
+        listener.close()
+
+
+@contextlib.contextmanager
+def full_backlog():
+    """
+    连接队列已满、不再接受连接的端口，新的连接一直等不到握手完成
+    """
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(0)
+    port = listener.getsockname()[1]
+    clients = []
+    for _ in range(3):
+        client = socket.socket()
+        client.setblocking(False)
+        client.connect_ex(('127.0.0.1', port))
+        clients.append(client)
+    try:
+        yield port
+    finally:
+        for client in clients:
+            client.close()
+        listener.close()
+
+
+def failure(url, timeout=5):
+    with pytest.raises(Exception) as info:
+        requests.get(url, timeout=timeout, verify=False)
+    return info.value
+
+
+async def async_failure(url, timeout=5):
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        with pytest.raises(Exception) as info:
+            async with session.get(url, ssl=False) as response:
+                await response.read()
+    return info.value
+
+
+def test_classify_failures():
+    """
+    requests 的真实请求异常按失败原因分类
+    """
+    assert classify_failure(failure('http://urlscan-test.invalid/')) == 'dns'
+    assert classify_failure(failure(f'http://127.0.0.1:{closed_port()}/')) == 'refused'
+    with stand_in_server(0) as server:
+        assert classify_failure(failure(server.base_url.replace('http://', 'https://') + '/')) == 'tls'
+    with stand_in_server(3) as server:
+        error = failure(server.base_url + '/', timeout=(2, 0.3))
+        assert classify_failure(error) == 'timeout' and is_read_timeout(error)
+    with full_backlog() as port:
+        error = failure(f'http://127.0.0.1:{port}/', timeout=(0.3, 5))
+        assert classify_failure(error) == 'timeout' and not is_read_timeout(error)
+    with raw_server(None) as port:
+        assert classify_failure(failure(f'http://127.0.0.1:{port}/')) == 'reset'
+    with raw_server(b'SSH-2.0-OpenSSH\r\n\r\n') as port:
+        assert classify_failure(failure(f'http://127.0.0.1:{port}/')) == 'http'
+
+
+@pytest.mark.skipif(aiohttp is None, reason='没有安装aiohttp')
+def test_classify_aiohttp_failures():
+    """
+    aiohttp 的请求异常与 requests 的分类相同
+    """
+    assert classify_failure(asyncio.run(async_failure('http://urlscan-test.invalid/'))) == 'dns'
+    assert classify_failure(asyncio.run(async_failure(f'http://127.0.0.1:{closed_port()}/'))) == 'refused'
+    with stand_in_server(0) as server:
+        url = server.base_url.replace('http://', 'https://') + '/'
+        assert classify_failure(asyncio.run(async_failure(url))) == 'tls'
+    with raw_server(None) as port:
+        assert classify_failure(asyncio.run(async_failure(f'http://127.0.0.1:{port}/'))) == 'reset'
+    with raw_server(b'SSH-2.0-OpenSSH\r\n\r\n') as port:
+        assert classify_failure(asyncio.run(async_failure(f'http://127.0.0.1:{port}/'))) == 'http'
+
+
+def fall_back(target, error):
+    """
+    第一次尝试失败后是否还尝试另一个协议
+    """
+    probe = Probe(target, deadline=Deadline(30))
+    scheme = probe.next_scheme()
+    probe.failed(scheme, error)
+    return probe.next_scheme() is not None and not probe.hopeless
+
+
+def test_probe_fallback_rules():
+    """
+    域名解析失败不再尝试；指定了端口时连接被拒绝、连接超时不再尝试；
+    连接被重置、TLS握手失败、读取超时换协议再试
+    """
+    assert not fall_back('urlscan-test.invalid', failure('http://urlscan-test.invalid/'))
+
+    refused = failure(f'http://127.0.0.1:{closed_port()}/')
+    assert not fall_back('127.0.0.1:8080', refused)
+    assert fall_back('127.0.0.1', refused)
+    with full_backlog() as port:
+        connect_timeout = failure(f'http://127.0.0.1:{port}/', timeout=(0.3, 5))
+    assert not fall_back('127.0.0.1:8080', connect_timeout)
+    assert fall_back('127.0.0.1', connect_timeout)
+
+    with raw_server(None) as port:
+        assert fall_back(f'127.0.0.1:{port}', failure(f'http://127.0.0.1:{port}/'))
+    with stand_in_server(0) as server:
+        location = server.base_url.replace('http://', '')
+        assert fall_back(f'https://{location}', failure(f'https://{location}/'))
+    with stand_in_server(3) as server:
+        location = server.base_url.replace('http://', '')
+        assert fall_back(location, failure(server.base_url + '/', timeout=(2, 0.3)))
+
+    # 预算用完时不再尝试
+    probe = Probe('127.0.0.1', deadline=Deadline(0))
+    assert probe.next_scheme() is None
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import pytest
+
+from tests.standin import StandInHandler, StandInTLSServer
+from scan import UrlScan, aiohttp
+
+
+@pytest.fixture(scope='module')
+def tls_server():
+    """
+    只提供HTTPS的模拟服务器，明文HTTP连接一直没有响应
+    """
+    with StandInTLSServer(StandInHandler) as server:
+        yield server
+
+
+def race(tls_server, mode):
+    scan = UrlScan()
+    scan.scheme_preference = 'http'
+    scan.http_time_out = 10
+    host = tls_server.base_url[len('http://'):]
+    rows = []
+    start = time.monotonic()
+    if mode == 'async':
+        asyncio.run(scan.url_scan_async(enumerate([f'{host}/cloudflare/0']), lambda index, row: rows.append(row)))
+    else:
+        scan.url_scan_threads(enumerate([f'{host}/cloudflare/0']), lambda index, row: rows.append(row))
+    return rows, time.monotonic() - start
+
+
+@pytest.mark.parametrize('mode', ['threads', pytest.param('async', marks=pytest.mark.skipif(
+    aiohttp is None, reason='没有安装aiohttp'))])
+def test_race_returns_the_scheme_that_answers(tls_server, mode):
+    """
+    优先的http一直没有响应时，同时发起的https先成功，协议列记录https，不必等到http超时
+    """
+    rows, elapsed = race(tls_server, mode)
+    assert elapsed < 10
+    assert [(row['url'].split('://')[0], row['协议'], row['http状态码']) for row in rows] == [('https', 'https', 200)]
+    assert rows[0]['WAF']
@@ -0,0 +1,93 @@
+import json
+import multiprocessing
+
+from tests.standin import STAND_IN_SITES, StandInHandler
+from scan import UrlScan, scan_changes
+
+
+def rows(result_file):
+    with open(result_file) as f:
+        return sorted(f)
+
+
+def test_replay_matches_online_scan(server, tmp_path):
+    """
+    离线重新识别 WARC 归档的结果与在线扫描相同，且不发出任何请求
+    """
+    url_file = tmp_path / 'domain.txt'
+    url_file.write_text(''.join(f'{server.base_url}/{site}/{i}\n' for i in range(3) for site in STAND_IN_SITES)
+                        + f'{server.base_url}/redirect/2/cloudflare/0\n')
+    scan = UrlScan()
+    scan.url_file = str(url_file)
+    scan.result_file = str(tmp_path / 'online.csv')
+    scan.sqlite_file = str(tmp_path / 'urlscan.db')
+    scan.warc_file = str(tmp_path / 'urlscan.warc.gz')
+    scan.get_url_list()
+    scan.url_scan()
+
+    StandInHandler.requests.clear()
+    scan.replay_file = scan.warc_file
+    scan.replay_workers = 2
+    scan.result_file = str(tmp_path / 'replay.csv')
+    scan.replay()
+    assert sum(StandInHandler.requests.values()) == 0
+    assert rows(scan.result_file) == rows(str(tmp_path / 'online.csv'))
+    old_run, new_run, changes = scan_changes(scan.sqlite_file)
+    assert old_run is not None
+    assert changes == []
+
+
+def test_replay_after_incremental_scan_keeps_waf(server, tmp_path):
+    """
+    增量扫描中页面没有变化的目标不归档，离线重新识别不会把它们的WAF结果报告为变化
+    """
+    url_file = tmp_path / 'domain.txt'
+    url_file.write_text(''.join(f'{server.base_url}/{site}/{i}\n' for i in range(3) for site in ('cloudflare', 'etag')))
+    scan = UrlScan()
+    scan.url_file = str(url_file)
+    scan.sqlite_file = str(tmp_path / 'urlscan.db')
+    scan.warc_file = str(tmp_path / 'urlscan.warc.gz')
+    scan.result_file = str(tmp_path / 'full.csv')
+    scan.get_url_list()
+    scan.url_scan()
+    scan.incremental = True
+    scan.warc_file = str(tmp_path / 'incremental.warc.gz')
+    scan.result_file = str(tmp_path / 'incremental.csv')
+    scan.get_url_list()
+    scan.url_scan()
+    assert scan.incremental_stats.counts['same_body'] == 3
+
+    scan.replay_file = scan.warc_file
+    scan.result_file = str(tmp_path / 'replay.csv')
+    scan.replay()
+    old_run, new_run, changes = scan_changes(scan.sqlite_file)
+    assert old_run is not None
+    # 没有归档的目标只算未重新识别，不报告WAF变化
+    assert sorted(change[0] for change in changes) == ['gone'] * 6
+
+
+def test_replay_to_stdout_in_spawned_workers(server, tmp_path, capfd):
+    """
+    JSON Lines 结果写到标准输出时，spawn 启动的进程打印的内容不混进结果
+    """
+    url_file = tmp_path / 'domain.txt'
+    url_file.write_text(''.join(f'{server.base_url}/{site}/0\n' for site in STAND_IN_SITES))
+    scan = UrlScan()
+    scan.url_file = str(url_file)
+    scan.result_file = str(tmp_path / 'online.csv')
+    scan.warc_file = str(tmp_path / 'urlscan.warc.gz')
+    scan.get_url_list()
+    scan.url_scan()
+    capfd.readouterr()
+
+    scan.replay_file = scan.warc_file
+    scan.result_file = str(tmp_path / 'replay.csv')
+    scan.jsonl_file = '-'
+    method = multiprocessing.get_start_method()
+    multiprocessing.set_start_method('spawn', force=True)
+    try:
+        scan.replay()
+    finally:
+        multiprocessing.set_start_method(method, force=True)
+    out = capfd.readouterr().out
+    assert len([json.loads(line) for line in out.splitlines()]) == len(STAND_IN_SITES)
@@ -0,0 +1,88 @@
+import collections
+import io
+import os
+import time
+
+from tests.standin import StubUrlScan
+from scan import CompletionJournal
+
+
+class CrashingUrlScan(StubUrlScan):
+    """
+    完成 crash_after 个目标后中断扫描
+    """
+    crash_after = 0
+
+    def action(self, task_url):
+        with self._session_lock:
+            if self.crash_after <= 0:
+                raise KeyboardInterrupt()
+            self.crash_after -= 1
+        return StubUrlScan.action(self, task_url)
+
+
+def run(cls, url_file, result_file, crash_after=0):
+    scan = cls()
+    scan.url_file = url_file
+    scan.result_file = result_file
+    scan.crash_after = crash_after
+    scan.get_url_list()
+    try:
+        scan.url_scan()
+    except KeyboardInterrupt:
+        pass
+
+
+def test_resume_after_crash(tmp_path):
+    """
+    中断后继续扫描，结果没有重复、遗漏，表头只有一行，正常结束后删除完成记录
+    """
+    lines = 5000
+    url_file = tmp_path / 'domain.txt'
+    url_file.write_text(''.join(f'host{i}.example.com\n' for i in range(lines)))
+    result_file = str(tmp_path / 'result.csv')
+    run(CrashingUrlScan, str(url_file), result_file, crash_after=lines // 3)
+    assert os.path.exists(result_file + '.journal')
+    run(StubUrlScan, str(url_file), result_file)
+
+    with open(result_file) as f:
+        rows = f.read().splitlines()
+    assert rows.count(rows[0]) == 1
+    urls = collections.Counter(row.split(',')[1] for row in rows[1:])
+    assert sum(n - 1 for n in urls.values()) == 0
+    assert len(urls) == lines
+    assert not os.path.exists(result_file + '.journal')
+
+
+def test_journal_ignored_after_target_file_changes(tmp_path):
+    """
+    目标文件修改过时不按旧的行号跳过目标
+    """
+    url_file = tmp_path / 'domain.txt'
+    url_file.write_text('a\nb\nc\n')
+    journal = CompletionJournal(str(tmp_path / 'result.csv.journal'), str(url_file)).open()
+    journal.record(0)
+    journal.record(1)
+    journal.close()
+    assert CompletionJournal(journal.path, str(url_file)).open().resumed == 2
+
+    url_file.write_text('x\nb\nc\n')
+    os.utime(url_file, ns=(time.time_ns(), time.time_ns() + 1000000))
+    assert CompletionJournal(journal.path, str(url_file)).open().resumed == 0
+
+
+def test_stdin_is_not_journaled(tmp_path, monkeypatch):
+    """
+    从标准输入读取目标时不记录完成记录
+    """
+    monkeypatch.setattr('sys.stdin', io.StringIO('host0.example.com\nhost1.example.com\n'))
+    scan = CrashingUrlScan()
+    scan.url_file = '-'
+    scan.result_file = str(tmp_path / 'result.csv')
+    scan.crash_after = 1
+    scan.get_url_list()
+    try:
+        scan.url_scan()
+    except KeyboardInterrupt:
+        pass
+    assert not os.path.exists(scan.result_file + '.journal')
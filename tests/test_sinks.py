@@ -0,0 +1,71 @@
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+import scan
+from tests.standin import StubUrlScan
+from scan import JsonlSink, ResultWriter
+
+FIG = [{'icon': 'Nginx.svg', 'name': 'Nginx', 'version': '', 'website': 'http://nginx.org/en'}]
+
+ROWS = [{'目标': f'host{i}.example.com', '域名': f'host{i}.example.com', 'url': f'https://host{i}.example.com/',
+         '标题': f'标题 {i}', 'http状态码': 200, 'web指纹': FIG, 'WAF': 'Cloudflare (Cloudflare Inc.)', '协议': 'https'}
+        for i in range(100)]
+
+
+def read_jsonl(path):
+    if path.endswith('.gz'):
+        f = gzip.open(path, 'rt', encoding='utf-8')
+    elif path.endswith('.zst'):
+        f = io.TextIOWrapper(scan.zstandard.ZstdDecompressor().stream_reader(open(path, 'rb')), encoding='utf-8')
+    else:
+        f = open(path, encoding='utf-8')
+    with f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize('suffix', ['jsonl', 'jsonl.gz', 'jsonl.zst'])
+def test_jsonl_round_trip(tmp_path, suffix):
+    """
+    JSON Lines 结果（包括压缩的）可以读回，指纹和WAF是嵌套的对象，追加写入时保留之前的记录
+    """
+    if suffix.endswith('.zst') and scan.zstandard is None:
+        pytest.skip('没有安装zstandard')
+    path = str(tmp_path / f'result.{suffix}')
+    for rows in (ROWS[:50], ROWS[50:]):
+        sink = JsonlSink(path)
+        result_writer = ResultWriter([sink])
+        for index, row in enumerate(rows):
+            result_writer.put(index, row)
+        result_writer.close()
+        sink.close()
+
+    records = read_jsonl(path)
+    assert [record['target'] for record in records] == [row['目标'] for row in ROWS]
+    assert records[0]['fingerprints'] == FIG
+    assert records[0]['waf'] == {'detected': True, 'firewall': 'Cloudflare', 'manufacturer': 'Cloudflare Inc.'}
+
+
+def test_zst_refused_without_zstandard(tmp_path, monkeypatch):
+    """
+    没有安装 zstandard 时不把未压缩的内容写入 .zst 文件，也不开始扫描
+    """
+    monkeypatch.setattr(scan, 'zstandard', None)
+    path = str(tmp_path / 'result.jsonl.zst')
+    with pytest.raises(RuntimeError):
+        JsonlSink(path)
+    assert not os.path.exists(path)
+
+    url_file = tmp_path / 'domain.txt'
+    url_file.write_text('host0.example.com\n')
+    url_scan = StubUrlScan()
+    url_scan.url_file = str(url_file)
+    url_scan.result_file = str(tmp_path / 'result.csv')
+    url_scan.jsonl_file = path
+    url_scan.get_url_list()
+    with pytest.raises(RuntimeError):
+        url_scan.url_scan()
+    assert os.listdir(tmp_path) == ['domain.txt']
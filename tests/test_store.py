@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+from scan import ResultWriter, SqliteSink, scan_changes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def store_run(path, rows):
+    store = SqliteSink(path, 'domain.txt')
+    result_writer = ResultWriter([store])
+    for index, row in enumerate(rows):
+        result_writer.put(index, row)
+    result_writer.close()
+    store.finish()
+    store.close()
+    return store.run_id
+
+
+def row(target, status=200, waf='', fig=()):
+    return {'目标': target, '域名': target, 'url': f'https://{target}/', '标题': target, 'http状态码': status,
+            'web指纹': [{'name': name, 'version': ''} for name in fig], 'WAF': waf, '协议': 'https'}
+
+
+def test_changes_between_runs(tmp_path):
+    """
+    对比最近两次扫描：新出现、消失以及状态码、WAF、指纹有变化的目标
+    """
+    path = str(tmp_path / 'urlscan.db')
+    old_run = store_run(path, [row('same'), row('status'), row('waf'), row('fig', fig=['Nginx']), row('gone')])
+    new_run = store_run(path, [row('same'), row('status', status=500), row('waf', waf='Cloudflare (Cloudflare Inc.)'),
+                               row('fig', fig=['Nginx', 'PHP']), row('new')])
+
+    found_old, found_new, changes = scan_changes(path)
+    assert (found_old, found_new) == (old_run, new_run)
+    kinds = {change[1]: change[0] for change in changes}
+    assert kinds == {'status': 'changed', 'waf': 'changed', 'fig': 'changed', 'gone': 'gone', 'new': 'new'}
+
+    db = sqlite3.connect(path)
+    names = db.execute("SELECT name FROM technologies WHERE target = 'fig' AND run_id = ? ORDER BY name",
+                       (new_run,)).fetchall()
+    db.close()
+    assert names == [('Nginx',), ('PHP',)]
+
+
+def test_fingerprint_order_does_not_count_as_change(tmp_path):
+    """
+    指纹顺序不同（旧版本写入的、未排序的指纹）不算变化
+    """
+    path = str(tmp_path / 'urlscan.db')
+    store_run(path, [row('order', fig=['PHP', 'Nginx'])])
+    db = sqlite3.connect(path)
+    with db:
+        db.execute('UPDATE results SET fingerprints = ?', ('[{"name":"PHP","version":""},{"name":"Nginx","version":""}]',))
+    db.close()
+    store_run(path, [row('order', fig=['Nginx', 'PHP'])])
+    assert scan_changes(path)[2] == []
+
+
+def test_fingerprints_stable_across_hash_seeds():
+    """
+    不同哈希种子的进程识别同一页面，指纹顺序相同
+    """
+    script = ('from tests.standin import SAMPLE_HEADERS, sample_page\n'
+              'from Wappalyzer.Wappalyzer import WebPage\n'
+              'import json\n'
+              'from scan import UrlScan\n'
+              'webpage = WebPage("https://www.wgpsec.org/", sample_page(), dict(SAMPLE_HEADERS))\n'
+              'print(json.dumps(UrlScan().get_banner(webpage)))\n')
+    outputs = set()
+    for seed in ('1', '4'):
+        result = subprocess.run([sys.executable, '-W', 'ignore', '-c', script], capture_output=True, text=True,
+                                cwd=ROOT, env=dict(os.environ, PYTHONHASHSEED=seed), check=True)
+        outputs.add(result.stdout.splitlines()[-1])
+    assert len(outputs) == 1
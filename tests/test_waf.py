@@ -0,0 +1,44 @@
+import time
+from concurrent import futures
+
+import requests
+
+from tests.standin import STAND_IN_SITES, StandInHandler
+from scan import UrlScan
+from wafw00f.main import main as waf_main
+
+
+def detect(url):
+    response = requests.get(url, timeout=10)
+    found, waf = waf_main(url, response=response, text=response.text)
+    return waf if found else None
+
+
+def test_concurrent_detection_has_no_cross_talk(server):
+    """
+    多个线程同时识别不同站点的WAF，每个目标的结果与单独识别时相同
+    """
+    expected = {site: detect(f'{server.base_url}/{site}/') for site in STAND_IN_SITES}
+    assert expected['plain'] is None
+    assert all(expected[site] for site in STAND_IN_SITES if site != 'plain')
+
+    targets = [(site, f'{server.base_url}/{site}/{i}') for i in range(20) for site in STAND_IN_SITES]
+    with futures.ThreadPoolExecutor(max_workers=UrlScan().pool_max_workers) as pool:
+        results = list(pool.map(lambda target: detect(target[1]), targets))
+    wrong = [(url, waf) for (site, url), waf in zip(targets, results) if waf != expected[site]]
+    assert wrong == []
+
+
+def test_attack_probe_keeps_target_deadline(server):
+    """
+    线程池模式下WAF攻击探测的响应一点点发送时，目标的总耗时仍不超过 target_time_out
+    """
+    StandInHandler.requests.clear()
+    scan = UrlScan()
+    scan.target_time_out = 2
+    rows = []
+    start = time.monotonic()
+    scan.url_scan_threads(enumerate([f'{server.base_url}/drip-attack/0']), lambda index, row: rows.append(row))
+    assert time.monotonic() - start < scan.target_time_out + 1
+    assert StandInHandler.requests['attack'] == 1
+    assert [(row['http状态码'], row['WAF']) for row in rows] == [(200, '')]
@@ -0,0 +1,155 @@
+import html
+import json
+
+import pytest
+
+from Wappalyzer import Wappalyzer as wappalyzer_module
+from Wappalyzer.Wappalyzer import LiteralScanner, Wappalyzer, WebPage, fold, required_literals
+from tests.examples import example
+
+# re.IGNORECASE 认为与 ASCII 字母相同的非 ASCII 字符
+FOLDS = str.maketrans({'s': 'ſ', 'k': 'K', 'K': 'K'})
+
+
+@pytest.fixture(scope='module')
+def wappalyzer():
+    return Wappalyzer.latest(cache_dir=None)
+
+
+@pytest.fixture(params=['ahocorasick', 'regex'])
+def backend(request, monkeypatch):
+    """
+    LiteralScanner 的两种实现：安装了 pyahocorasick 时用自动机，否则用正则表达式
+    """
+    if request.param == 'ahocorasick':
+        if wappalyzer_module.ahocorasick is None:
+            pytest.skip('没有安装pyahocorasick')
+    else:
+        monkeypatch.setattr(wappalyzer_module, 'ahocorasick', None)
+    return request.param
+
+
+def examples(patterns):
+    return [text for text in (example(regex.pattern) for regex in patterns) if text]
+
+
+def app_page(app, translate=None):
+    """
+    按 app 的签名构造一个页面：HTML、脚本地址、meta、响应头和 cookie 都取能匹配的字符串
+    """
+    body = ' '.join(examples(app['html']))
+    scripts = ''.join(f'<script src="{html.escape(src)}"></script>' for src in examples(app['script']))
+    meta = ''.join(f'<meta name="{html.escape(name)}" content="{html.escape(example(regex.pattern) or "")}">'
+                   for name, regex in app['meta'].items())
+    page = f'<html><head>{meta}{scripts}</head><body>{body}</body></html>'
+    headers = {name: example(regex.pattern) or '' for name, regex in app['headers'].items()}
+    cookies = {name: example(regex.pattern) or '' for name, regex in app['cookies'].items()}
+    if translate is not None:
+        page = page.translate(translate)
+    return WebPage('https://www.wgpsec.org/', page, headers, cookies)
+
+
+def analyze_all(wappalyzer, webpage):
+    """
+    不用前置过滤和候选索引，逐个检查所有指纹
+    """
+    _detected_apps = set()
+    detected_apps = []
+    app_version = {}
+    for app_name, app in wappalyzer.apps.items():
+        is_match, version = wappalyzer._has_app(app, webpage)
+        if is_match:
+            _detected_apps.add(app_name)
+            detected_apps = wappalyzer._get_implied_apps(_detected_apps, version, app_version)
+    return detected_apps
+
+
+def normalized(apps):
+    return sorted(json.dumps(app, sort_keys=True) for app in apps)
+
+
+def test_required_literals():
+    """
+    必需字面量：不区分大小写、分支取并集、可选部分不算
+    """
+    assert required_literals('jquery[.-]([\\d.]+)\\.js') == (frozenset(['jquery']), frozenset(['.js']))
+    assert required_literals('WordPress') == (frozenset(['wordpress']),)
+    assert required_literals('(?:drupal|joomla)\\.js') == (frozenset(['drupal', 'joomla']), frozenset(['.js']))
+    assert required_literals('(?:Powered by )?Discuz') == (frozenset(['discuz']),)
+    assert required_literals('ab') is None
+    assert required_literals('[a-z]+') is None
+    assert required_literals('(') is None
+
+
+def test_literal_scanner_finds_overlapping_literals(backend):
+    """
+    LiteralScanner 找出文本中出现的所有字面量，包括互相重叠、互为前缀的
+    """
+    literals = ['jquery', 'jquery.min', 'query', 'ery.m', 'wordpress', 'press', 'nginx']
+    scanner = LiteralScanner(literals)
+    for text in ('<script src="/jquery.min.js">', 'wordpress jquery', 'jquer', ''):
+        assert scanner.scan(text) == {literal for literal in literals if literal in text}
+
+
+def test_required_literals_occur_in_matches(wappalyzer, backend):
+    """
+    指纹库中每个能构造出匹配字符串的 HTML、脚本规则，其必需字面量都在匹配的字符串中（包括非 ASCII 的等价字母）
+    """
+    checked = 0
+    for app in wappalyzer.apps.values():
+        for regex in app['html'] + app['script']:
+            text = example(regex.pattern)
+            if text is None or regex.literals is None:
+                continue
+            for variant in (text, text.upper(), text.translate(FOLDS)):
+                if regex.search(variant):
+                    assert regex.possible(wappalyzer._scanner.scan(fold(variant))), (regex.pattern, variant)
+                    checked += 1
+    assert checked > 500
+
+
+@pytest.mark.parametrize('translate', [None, FOLDS], ids=['ascii', 'folded'])
+def test_prefilter_matches_full_scan(wappalyzer, backend, translate):
+    """
+    analyze() 用前置过滤和候选索引的结果，与逐个检查所有指纹的结果相同
+    """
+    apps = list(wappalyzer.apps.values())
+    for i in range(0, len(apps), 25):
+        pages = [app_page(app, translate) for app in apps[i:i + 25]]
+        merged = WebPage('https://www.wgpsec.org/', '\n'.join(page.html for page in pages),
+                         {k: v for page in pages for k, v in page.headers.items()},
+                         {k: v for page in pages for k, v in page.cookies.items()})
+        assert normalized(wappalyzer.analyze(merged)) == normalized(analyze_all(wappalyzer, merged))
+
+
+def source_page(app, source):
+    """
+    只用 app 的响应头、meta 或 cookie 签名构造页面，cookie 名大小写与签名不同
+    """
+    pairs = {name: example(regex.pattern) or '' for name, regex in app[source].items()}
+    if source == 'meta':
+        meta = ''.join(f'<meta name="{html.escape(name)}" content="{html.escape(value)}">'
+                       for name, value in pairs.items())
+        return WebPage('https://www.wgpsec.org/', f'<html><head>{meta}</head></html>', {})
+    if source == 'headers':
+        return WebPage('https://www.wgpsec.org/', '<html></html>', pairs)
+    return WebPage('https://www.wgpsec.org/', '<html></html>', {},
+                   {name.upper(): value for name, value in pairs.items()})
+
+
+@pytest.mark.parametrize('source', ['headers', 'meta', 'cookies'])
+def test_app_found_by_name_only(wappalyzer, source):
+    """
+    只能通过响应头、meta 或 cookie 识别的指纹仍在候选中，结果与逐个检查所有指纹相同
+    """
+    checked = 0
+    for name, app in wappalyzer.apps.items():
+        if not app[source]:
+            continue
+        webpage = source_page(app, source)
+        if not wappalyzer._has_app(app, webpage)[0]:
+            continue
+        assert name in [candidate for candidate, _ in wappalyzer._candidates(webpage, set())]
+        assert normalized(wappalyzer.analyze(webpage)) == normalized(analyze_all(wappalyzer, webpage)), name
+        checked += 1
+    assert checked > 50
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+import requests
+
+from scan import UrlScan, WarcWriter, aiohttp, read_warc, warc_response
+
+
+def archived_response(path, url):
+    for headers, block in read_warc(path):
+        if headers.get('WARC-Type') == 'response' and headers.get('WARC-Target-URI') == url:
+            return block
+    raise AssertionError(f'{url} 没有归档')
+
+
+def test_archive_keeps_wire_bytes_of_headers(server, tmp_path):
+    """
+    响应头中的非 ASCII 字节原样归档，离线还原出的响应头与在线时相同
+    """
+    url = f'{server.base_url}/latin1/'
+    response = requests.get(url)
+    path = str(tmp_path / 'urlscan.warc')
+    archive = WarcWriter(path)
+    archive.archive(url, response)
+    archive.close()
+
+    block = archived_response(path, url)
+    assert b'X-Powered-By: WAF\xe5\xae\x89\r\n' in block
+    assert warc_response(block, url, rewritten=True).headers['X-Powered-By'] == response.headers['X-Powered-By']
+
+
+@pytest.mark.skipif(aiohttp is None, reason='没有安装aiohttp')
+def test_archive_keeps_wire_bytes_of_aiohttp_headers(server, tmp_path):
+    """
+    asyncio模式的响应头按 aiohttp 的解码方式还原，归档的同样是收到的字节
+    """
+    url = f'{server.base_url}/latin1/'
+
+    async def fetch():
+        async with aiohttp.ClientSession() as session:
+            return await UrlScan().async_get(session, url, {})
+
+    response = asyncio.run(fetch())
+    path = str(tmp_path / 'urlscan.warc')
+    archive = WarcWriter(path)
+    archive.archive(url, response)
+    archive.close()
+    assert b'X-Powered-By: WAF\xe5\xae\x89\r\n' in archived_response(path, url)
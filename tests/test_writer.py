@@ -0,0 +1,27 @@
+import csv
+
+from scan import CompletionJournal, CsvSink, ResultWriter
+
+
+def test_writer_writes_every_row_and_records_completion(tmp_path):
+    """
+    写入线程写出全部结果，出错的目标（结果为 None）没有结果行，但同样记入完成记录
+    """
+    path = str(tmp_path / 'result.csv')
+    sink = CsvSink(path)
+    journal = CompletionJournal(path + '.journal', __file__).open()
+    result_writer = ResultWriter([sink], journal, batch_size=64, flush_interval=0.05)
+    for index in range(1000):
+        row = None if index % 100 == 0 else {'域名': f'host{index}.example.com', 'http状态码': 200}
+        result_writer.put(index, row)
+    result_writer.close()
+    sink.close()
+    journal.close()
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 990
+    assert len({row['域名'] for row in rows}) == 990
+    resumed = CompletionJournal(path + '.journal', __file__).open()
+    assert all(resumed.done(index) for index in range(1000))
+    assert result_writer.rows == 990
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+'''
+Copyright (C) 2020, WAFW00F Developers.
+See the LICENSE file for copying permission.
+'''
+
+import os
+import re
+from operator import attrgetter
+
+from wafw00f.signatures import convert_plugins, load_signatures
+
+# Extra declarative signatures (a JSON file or a directory of them) loaded
+# next to the converted plugins when present
+SIGNATURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'signatures')
+
+# Relative cost of each rule type, cheapest first
+RULE_COST = {'status': 0, 'reason': 1, 'header': 2, 'cookie': 2, 'content': 3}
+
+# Which response a rule looks at when the signature does not say, matching
+# the defaults of the WAFW00F matchers
+RULE_ATTACK = {'status': True, 'reason': True, 'header': False, 'cookie': False, 'content': True}
+
+
+class Rule(object):
+    """
+    A single signature rule, evaluated with the WAFW00F matchers.
+    """
+    __slots__ = ('type', 'attack', 'args', 'cost', 'key')
+
+    def __init__(self, rule):
+        self.type = rule['type']
+        self.attack = rule.get('attack', RULE_ATTACK[self.type])
+        self.cost = RULE_COST[self.type]
+        if self.type == 'header':
+            self.args = ((rule['name'], rule['regex']),)
+            self.key = ('header', self.attack, rule['name'].lower())
+        elif self.type == 'cookie':
+            self.args = (rule['regex'],)
+            self.key = ('header', self.attack, 'set-cookie')
+        elif self.type == 'status':
+            self.args = (rule['status'],)
+            self.key = ('status', self.attack, rule['status'])
+        elif self.type == 'reason':
+            self.args = (rule['reason'],)
+            self.key = ('reason', self.attack, rule['reason'])
+        else:
+            self.args = (rule['regex'],)
+            # Content can be anywhere in the body, so it cannot be indexed
+            self.key = None
+
+    @property
+    def regex(self):
+        if self.type == 'header':
+            return self.args[0][1]
+        if self.type in ('cookie', 'content'):
+            return self.args[0]
+        return None
+
+    def matches(self, waf):
+        matcher = getattr(waf, 'match' + self.type.capitalize())
+        return matcher(*self.args, attack=self.attack)
+
+
+class Entry(object):
+    """
+    A group of rules of one vendor that matches when any or all of them do.
+    """
+    __slots__ = ('vendor', 'mode', 'rules', 'cost')
+
+    def __init__(self, vendor, mode, rules):
+        self.vendor = vendor
+        self.mode = mode
+        self.rules = sorted(rules, key=attrgetter('cost'))
+        self.cost = self.rules[0].cost if self.rules else 0
+
+    def matches(self, waf):
+        if self.mode == 'any':
+            for rule in self.rules:
+                if rule.matches(waf):
+                    return True
+            return False
+        for rule in self.rules:
+            if not rule.matches(waf):
+                return False
+        return True
+
+
+class PluginEntry(object):
+    """
+    A plugin that could not be converted into a signature, run as is.
+    """
+    __slots__ = ('vendor', 'is_waf', 'cost')
+
+    def __init__(self, vendor, is_waf):
+        self.vendor = vendor
+        self.is_waf = is_waf
+        self.cost = RULE_COST['content']
+
+    def matches(self, waf):
+        return self.is_waf(waf)
+
+
+class DetectionEngine(object):
+    """
+    All WAF signatures compiled into one index.
+
+    Rules are indexed by the response they look at and by status code,
+    reason phrase or header name, so a response is only checked against
+    the rules that can match it; content rules are always checked. Vendors
+    are reported in the order of `priority`, followed by any others.
+    """
+
+    def __init__(self, signatures, priority=(), plugins=()):
+        by_name = dict((signature['name'], signature) for signature in signatures)
+        plugin_names = dict((plugin_module.NAME, plugin_module) for plugin_module in plugins)
+        names = [name for name in priority if name in by_name or name in plugin_names]
+        known = set(names)
+        for name in list(by_name) + list(plugin_names):
+            if name not in known:
+                names.append(name)
+                known.add(name)
+
+        self.vendors = names
+        self.index = {}
+        self.unindexed = []
+        self.patterns = {}
+        for vendor, name in enumerate(names):
+            if name in by_name:
+                for schema in by_name[name]['schemas']:
+                    self._add_schema(vendor, schema)
+            else:
+                self.unindexed.append(PluginEntry(vendor, plugin_names[name].is_waf))
+
+    def _add_schema(self, vendor, schema):
+        rules = [Rule(rule) for rule in schema['rules']]
+        for rule in rules:
+            pattern = rule.regex
+            if pattern is not None and pattern not in self.patterns:
+                try:
+                    self.patterns[pattern] = re.compile(pattern, re.I)
+                except re.error:
+                    # Reported when the rule is evaluated, as before
+                    pass
+        if schema['match'] == 'any':
+            # Each rule of an "any" schema can match on its own
+            entries = [Entry(vendor, 'any', [rule]) for rule in rules]
+        else:
+            entries = [Entry(vendor, 'all', rules)]
+        for entry in entries:
+            # An "all" schema cannot match without its cheapest indexed rule
+            keys = [rule.key for rule in entry.rules if rule.key is not None]
+            if keys:
+                self.index.setdefault(keys[0], []).append(entry)
+            else:
+                self.unindexed.append(entry)
+
+    @staticmethod
+    def _keys(waf):
+        for attack, r in ((False, waf.rq), (True, waf.attackres)):
+            if r is None:
+                continue
+            yield ('status', attack, r.status_code)
+            yield ('reason', attack, str(r.reason))
+            for name in r.headers:
+                yield ('header', attack, name.lower())
+
+    def detect(self, waf, findall=False):
+        """
+        Return the names of the WAFs whose signatures match the responses
+        held by `waf`, a WAFW00F instance.
+        """
+        candidates = {}
+        for entry in self.unindexed:
+            candidates.setdefault(entry.vendor, []).append(entry)
+        for key in set(self._keys(waf)):
+            for entry in self.index.get(key, ()):
+                candidates.setdefault(entry.vendor, []).append(entry)
+
+        detected = []
+        for vendor in sorted(candidates):
+            for entry in sorted(candidates[vendor], key=attrgetter('cost')):
+                if entry.matches(waf):
+                    detected.append(self.vendors[vendor])
+                    break
+            if detected and not findall:
+                break
+        return detected
+
+
+def build_engine(plugin_dict, priority, signature_path=SIGNATURE_PATH):
+    """
+    Build the detection engine from the plugins, converted to signatures,
+    and the signature files found at `signature_path`.
+    """
+    signatures, unconverted = convert_plugins(plugin_dict)
+    if signature_path and os.path.exists(signature_path):
+        signatures.extend(load_signatures(signature_path))
+    return DetectionEngine(signatures, priority, unconverted)
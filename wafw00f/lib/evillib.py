@@ -6,11 +6,14 @@ See the LICENSE file for copying permission.
 
 import logging
 import random
+import socket
+import threading
 import time
 from copy import copy
 
 import requests
 import urllib3
+from requests.hooks import dispatch_hook
 
 try:
     from urlparse import urlparse, urlunparse
@@ -43,7 +46,6 @@ def_headers = {
         'Accept-Encoding': 'gzip, deflate, br',
         'Accept-Language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
         'Cache-Control': 'max-age=0',
-        'Connection': 'close',
         'DNT': '1',
         'Referer': 'https://www.baidu.com/',
         'Upgrade-Insecure-Requests': '1',
@@ -76,6 +78,17 @@ def urlParser(target):
     return (hostname, port, path, query, ssl)
 
 
+def abortResponse(response):
+    # Shut down the connection of a response from another thread, so that
+    # the thread still reading its body fails at once
+    sock = getattr(getattr(response.raw, '_connection', None), 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
 class waftoolsengine:
     def __init__(self, target='https://example.com', debuglevel=0, path='/', proxies=None,
                  redir=True, head=None):
@@ -86,21 +99,59 @@ class waftoolsengine:
         self.redirectno = 0
         self.allowredir = False
         self.proxies = proxies
+        # Default timeout of Request, seconds or a (connect, read) tuple
+        self.timeout = 7
+        # A requests.Session to send the requests through, so that they can
+        # reuse the caller's pooled connections
+        self.session = None
+        # requests event hooks, e.g. {'response': [callback]}, added to every
+        # request so that the caller can see the raw responses
+        self.hooks = None
+        # A callable returning the seconds left for the whole target; a
+        # request is not sent once they run out, and a response still being
+        # read when they run out is aborted. None means no limit
+        self.remaining = None
         self.log = logging.getLogger('wafw00f')
         if head:
             self.headers = head
         else:
             self.headers = copy(def_headers)  # copy object by value not reference. Fix issue #90
 
-    def Request(self, headers=None, path=None, params={}, delay=0, timeout=7):
+    def Request(self, headers=None, path=None, params={}, delay=0, timeout=None):
+        if timeout is None:
+            timeout = self.timeout
         try:
             time.sleep(delay)
             if not headers:
                 h = self.headers
             else:
                 h = headers
-            req = requests.get(self.target, proxies=self.proxies, headers=h, timeout=timeout,
-                               allow_redirects=self.allowredir, params=params, verify=False)
+            get = requests.get if self.session is None else self.session.get
+            if self.remaining is None:
+                req = get(self.target, proxies=self.proxies, headers=h, timeout=timeout,
+                          allow_redirects=self.allowredir, params=params, verify=False, hooks=self.hooks)
+            else:
+                left = self.remaining()
+                if left <= 0:
+                    return None
+                if isinstance(timeout, tuple):
+                    timeout = tuple(min(t, left) for t in timeout)
+                else:
+                    timeout = min(timeout, left)
+                req = get(self.target, proxies=self.proxies, headers=h, timeout=timeout,
+                          allow_redirects=self.allowredir, params=params, verify=False, stream=True)
+                # The read timeout only bounds each read, a body that trickles
+                # in would hold the caller well past its limit
+                watchdog = threading.Timer(self.remaining(), abortResponse, (req,))
+                watchdog.daemon = True
+                watchdog.start()
+                try:
+                    req.content
+                finally:
+                    watchdog.cancel()
+                    req.close()
+                # Hooks see the response only once its body has been read
+                req = dispatch_hook('response', self.hooks, req)
             self.log.info('Request Succeeded')
             self.log.debug('Headers: %s\n' % req.headers)
             self.log.debug('Content: %s\n' % req.content)
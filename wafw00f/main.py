@@ -13,12 +13,30 @@ import os
 import random
 import re
 import sys
+from operator import attrgetter
 
 from wafw00f.lib.evillib import waftoolsengine, def_headers
+from wafw00f.engine import build_engine
 from wafw00f.manager import load_plugins
 from wafw00f.wafprio import wafdetectionsprio
 
 
+class Check(object):
+    """
+    A deferred call to one of the WAFW00F matchers. Plugins build schemas
+    out of checks, and matchAny/matchAll only evaluate the checks they need.
+    """
+    __slots__ = ('cost', 'matcher', 'args')
+
+    def __init__(self, cost, matcher, *args):
+        self.cost = cost
+        self.matcher = matcher
+        self.args = args
+
+    def __call__(self):
+        return self.matcher(*self.args)
+
+
 class WAFW00F(waftoolsengine):
     xsstring = '<script>alert("XSS");</script>'
     sqlistring = "UNION SELECT ALL FROM information_schema AND ' or SLEEP(5) or '"
@@ -30,9 +48,13 @@ class WAFW00F(waftoolsengine):
                  followredirect=True, extraheaders={}, proxies=None):
 
         self.log = logging.getLogger('wafw00f')
+        # Baseline and attack responses of this target; matchers only ever
+        # read these, so instances can be used from concurrent threads
+        self.rq = None
         self.attackres = None
         waftoolsengine.__init__(self, target, debuglevel, path, proxies, followredirect, extraheaders)
         self.knowledge = dict(generic=dict(found=False, reason=''), wafname=list())
+        self.textcache = []
 
     def normalRequest(self):
         return self.Request()
@@ -52,8 +74,11 @@ class WAFW00F(waftoolsengine):
     def lfiAttack(self):
         return self.Request(path=self.path + self.lfistring)
 
+    def centralAttackParams(self):
+        return {'a': self.xsstring, 'b': self.sqlistring, 'c': self.lfistring}
+
     def centralAttack(self):
-        return self.Request(path=self.path, params={'a': self.xsstring, 'b': self.sqlistring, 'c': self.lfistring})
+        return self.Request(path=self.path, params=self.centralAttackParams())
 
     def sqliAttack(self):
         return self.Request(path=self.path, params={'s': self.sqlistring})
@@ -155,11 +180,51 @@ class WAFW00F(waftoolsengine):
             return True
         return False
 
+    # Relative cost of the checks; matchAny and matchAll evaluate the
+    # cheapest first and full-body content searches last
+    COST_STATUS = 0
+    COST_REASON = 1
+    COST_HEADER = 2
+    COST_CONTENT = 3
+
+    def checkHeader(self, headermatch, attack=False):
+        return Check(self.COST_HEADER, self.matchHeader, headermatch, attack)
+
+    def checkCookie(self, match, attack=False):
+        return Check(self.COST_HEADER, self.matchCookie, match, attack)
+
+    def checkStatus(self, statuscode, attack=True):
+        return Check(self.COST_STATUS, self.matchStatus, statuscode, attack)
+
+    def checkReason(self, reasoncode, attack=True):
+        return Check(self.COST_REASON, self.matchReason, reasoncode, attack)
+
+    def checkContent(self, regex, attack=True):
+        return Check(self.COST_CONTENT, self.matchContent, regex, attack)
+
+    def matchAny(self, checks):
+        """
+        Return True as soon as one of the checks matches.
+        """
+        for check in sorted(checks, key=attrgetter('cost')):
+            if check():
+                return True
+        return False
+
+    def matchAll(self, checks):
+        """
+        Return False as soon as one of the checks fails to match.
+        """
+        for check in sorted(checks, key=attrgetter('cost')):
+            if not check():
+                return False
+        return True
+
     def matchHeader(self, headermatch, attack=False):
         if attack:
             r = self.attackres
         else:
-            r = rq
+            r = self.rq
         if r is None:
             return
         header, match = headermatch
@@ -171,8 +236,9 @@ class WAFW00F(waftoolsengine):
                 headervals = headerval.split(', ')
             else:
                 headervals = [headerval]
+            regex = self.compiled(match)
             for headerval in headervals:
-                if re.search(match, headerval, re.I):
+                if regex.search(headerval):
                     return True
         return False
 
@@ -180,7 +246,7 @@ class WAFW00F(waftoolsengine):
         if attack:
             r = self.attackres
         else:
-            r = rq
+            r = self.rq
         if r is None:
             return
         if r.status_code == statuscode:
@@ -194,7 +260,7 @@ class WAFW00F(waftoolsengine):
         if attack:
             r = self.attackres
         else:
-            r = rq
+            r = self.rq
         if r is None:
             return
         # We may need to match multiline context in response body
@@ -202,15 +268,31 @@ class WAFW00F(waftoolsengine):
             return True
         return False
 
+    def compiled(self, pattern):
+        regex = self.patterns.get(pattern)
+        if regex is None:
+            regex = self.patterns[pattern] = re.compile(pattern, re.I)
+        return regex
+
+    def responseText(self, r):
+        # requests decodes the body, and may sniff its charset, on every
+        # access to Response.text, so decode each response only once
+        for response, text in self.textcache:
+            if response is r:
+                return text
+        text = r.text
+        self.textcache.append((r, text))
+        return text
+
     def matchContent(self, regex, attack=True):
         if attack:
             r = self.attackres
         else:
-            r = rq
+            r = self.rq
         if r is None:
             return
         # We may need to match multiline context in response body
-        if re.search(regex, r.text, re.I):
+        if self.compiled(regex).search(self.responseText(r)):
             return True
         return False
 
@@ -223,19 +305,19 @@ class WAFW00F(waftoolsengine):
     # Check for prioritized ones first, then check those added externally
     checklist = wafdetectionsprio
     checklist += list(set(wafdetections.keys()) - set(checklist))
+    # All plugins as declarative signatures in one index, and every distinct
+    # regex they use, compiled once and shared by all instances
+    engine = build_engine(plugin_dict, checklist)
+    patterns = engine.patterns
 
     def identwaf(self, findall=False):
         detected = list()
-        try:
-            self.attackres = self.performCheck(self.centralAttack)
-        except RequestBlocked:
-            return detected
-        for wafvendor in self.checklist:
-            self.log.info('Checking for %s' % wafvendor)
-            if self.wafdetections[wafvendor](self):
-                detected.append(wafvendor)
-                if not findall:
-                    break
+        if self.attackres is None:
+            try:
+                self.attackres = self.performCheck(self.centralAttack)
+            except RequestBlocked:
+                return detected
+        detected = self.engine.detect(self, findall)
         self.knowledge['wafname'] = detected
         return detected
 
@@ -257,8 +339,9 @@ def buildResultRecord(url, waf):
             result['firewall'] = 'Generic'
             result['manufacturer'] = 'Unknown'
         else:
-            result['firewall'] = waf.split('(')[0].strip()
-            result['manufacturer'] = waf.split('(')[1].replace(')', '').strip()
+            firewall, _, manufacturer = waf.partition('(')
+            result['firewall'] = firewall.strip()
+            result['manufacturer'] = manufacturer.replace(')', '').strip() or 'Unknown'
     else:
         result['detected'] = False
         result['firewall'] = 'None'
@@ -315,15 +398,39 @@ class RequestBlocked(Exception):
     pass
 
 
-def main(target):
+def main(target, response=None, text=None, attack=None, timeout=None, session=None, hooks=None,
+         remaining=None):
+    """
+    Detect the WAF in front of `target`.
+
+    `response` is an already fetched response for `target` to use as the
+    baseline instead of requesting the page again, and `text` its decoded
+    body if the caller has it. `attack` is likewise an already fetched
+    response to the central attack probe. `timeout` overrides the timeout
+    of the requests that still have to be made, and `session` is a
+    requests.Session to make them with. `hooks` are requests event hooks
+    added to those requests. `remaining` is a callable returning the seconds
+    left for the target: no request is sent once they run out, and a response
+    still being read when they do is aborted. Returns ``(found, waf_name)``.
+    """
     attacker = WAFW00F(target)
-    global rq
-    try:
-        rq = attacker.normalRequest()
-    except Exception as e:
-        # print(f'waf检测：[{target}]访问出错{e}')
-        return False, None
-    if rq is None:
+    attacker.attackres = attack
+    attacker.session = session
+    attacker.hooks = hooks
+    attacker.remaining = remaining
+    if timeout is not None:
+        attacker.timeout = timeout
+    if response is not None:
+        attacker.rq = response
+        if text is not None:
+            attacker.textcache.append((response, text))
+    else:
+        try:
+            attacker.rq = attacker.normalRequest()
+        except Exception as e:
+            # print(f'waf检测：[{target}]访问出错{e}')
+            return False, None
+    if attacker.rq is None:
         print(f'waf检测：[{target}]无法访问')
         return False, None
     try:
@@ -444,9 +551,8 @@ def main(target):
     #     attacker = WAFW00F(target, debuglevel=options.verbose, path=path,
     #                 followredirect=options.followredirect, extraheaders=extraheaders,
     #                     proxies=proxies)
-    #     global rq
-    #     rq = attacker.normalRequest()
-    #     if rq is None:
+    #     attacker.rq = attacker.normalRequest()
+    #     if attacker.rq is None:
     #         log.error('Site %s appears to be down' % hostname)
     #         continue
     #     if options.test:
@@ -9,9 +9,9 @@ NAME = 'aeSecure (aeSecure)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('aeSecure-code', '.+?')),
-        self.matchContent(r'aesecure_denied\.png')
+        self.checkHeader(('aeSecure-code', '.+?')),
+        self.checkContent(r'aesecure_denied\.png')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'AireeCDN (Airee)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'Airee')),
-        self.matchHeader(('X-Cache', r'(\w+\.)?airee\.cloud')),
-        self.matchContent(r'airee\.cloud')
+        self.checkHeader(('Server', 'Airee')),
+        self.checkHeader(('X-Cache', r'(\w+\.)?airee\.cloud')),
+        self.checkContent(r'airee\.cloud')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,12 +9,12 @@ NAME = 'Alert Logic (Alert Logic)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'<(title|h\d{1})>requested url cannot be found'),
-        self.matchContent(r'we are sorry.{0,10}?but the page you are looking for cannot be found'),
-        self.matchContent(r'back to previous page'),
-        self.matchContent(r'proceed to homepage'),
-        self.matchContent(r'reference id'),
+        self.checkContent(r'<(title|h\d{1})>requested url cannot be found'),
+        self.checkContent(r'we are sorry.{0,10}?but the page you are looking for cannot be found'),
+        self.checkContent(r'back to previous page'),
+        self.checkContent(r'proceed to homepage'),
+        self.checkContent(r'reference id'),
     ]
-    if all(i for i in schemes):
+    if self.matchAll(schemes):
         return True
     return False
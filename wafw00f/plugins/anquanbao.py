@@ -9,9 +9,9 @@ NAME = 'Anquanbao (Anquanbao)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Powered-By-Anquanbao', '.+?')),
-        self.matchContent(r'aqb_cc/error/')
+        self.checkHeader(('X-Powered-By-Anquanbao', '.+?')),
+        self.checkContent(r'aqb_cc/error/')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
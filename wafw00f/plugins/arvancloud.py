@@ -9,8 +9,8 @@ NAME = 'ArvanCloud (ArvanCloud)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'ArvanCloud'))
+        self.checkHeader(('Server', 'ArvanCloud'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
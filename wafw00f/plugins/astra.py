@@ -9,10 +9,10 @@ NAME = 'Astra (Czar Securities)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^cz_astra_csrf_cookie'),
-        self.matchContent(r'astrawebsecurity\.freshdesk\.com'),
-        self.matchContent(r'www\.getastra\.com/assets/images')
+        self.checkCookie(r'^cz_astra_csrf_cookie'),
+        self.checkContent(r'astrawebsecurity\.freshdesk\.com'),
+        self.checkContent(r'www\.getastra\.com/assets/images')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,11 +9,11 @@ NAME = 'AWS Elastic Load Balancer (Amazon)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-AMZ-ID', '.+?')),
-        self.matchHeader(('X-AMZ-Request-ID', '.+?')),
-        self.matchCookie(r'^aws.?alb='),
-        self.matchHeader(('Server', r'aws.?elb'), attack=True)
+        self.checkHeader(('X-AMZ-ID', '.+?')),
+        self.checkHeader(('X-AMZ-Request-ID', '.+?')),
+        self.checkCookie(r'^aws.?alb='),
+        self.checkHeader(('Server', r'aws.?elb'), attack=True)
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
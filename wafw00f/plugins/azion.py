@@ -9,8 +9,8 @@ NAME = 'AzionCDN (AzionCDN)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'Azion([-_]CDN)?'))
+        self.checkHeader(('Server', r'Azion([-_]CDN)?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'Yunjiasu (Baidu Cloud Computing)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'Yunjiasu(.+)?'))
+        self.checkHeader(('Server', r'Yunjiasu(.+)?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'Barikode (Ethic Ninja)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'<strong>barikode<.strong>'),
+        self.checkContent(r'<strong>barikode<.strong>'),
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
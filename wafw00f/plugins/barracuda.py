@@ -9,12 +9,12 @@ NAME = 'Barracuda (Barracuda Networks)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^barra_counter_session='),
-        self.matchCookie(r'^BNI__BARRACUDA_LB_COOKIE='),
-        self.matchCookie(r'^BNI_persistence='),
-        self.matchCookie(r'^BN[IE]S_.*?='),
-        self.matchContent(r'Barracuda.Networks')
+        self.checkCookie(r'^barra_counter_session='),
+        self.checkCookie(r'^BNI__BARRACUDA_LB_COOKIE='),
+        self.checkCookie(r'^BNI_persistence='),
+        self.checkCookie(r'^BN[IE]S_.*?='),
+        self.checkContent(r'Barracuda.Networks')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -13,9 +13,9 @@ def is_waf(self):
         # Sometimes I observed that there is an XHR request being being made to submit the 
         # report data automatically upon page load. In those cases a missing https is causing
         # false negatives.
-        self.matchContent(r'Bekchy.{0,10}?Access Denied'),
-        self.matchContent(r'bekchy\.com/report')
+        self.checkContent(r'Bekchy.{0,10}?Access Denied'),
+        self.checkContent(r'bekchy\.com/report')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
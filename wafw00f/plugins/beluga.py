@@ -9,9 +9,9 @@ NAME = 'Beluga CDN (Beluga)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'Beluga')),
-        self.matchCookie(r'^beluga_request_trail=')
+        self.checkHeader(('Server', r'Beluga')),
+        self.checkCookie(r'^beluga_request_trail=')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'BinarySec (BinarySec)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'BinarySec')),
-        self.matchHeader(('x-binarysec-via', '.+')),
-        self.matchHeader(('x-binarysec-nocache', '.+'))
+        self.checkHeader(('Server', 'BinarySec')),
+        self.checkHeader(('x-binarysec-via', '.+')),
+        self.checkHeader(('x-binarysec-nocache', '.+'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
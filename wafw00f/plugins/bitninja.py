@@ -9,9 +9,9 @@ NAME = 'BitNinja (BitNinja)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'Security check by BitNinja'),
-        self.matchContent(r'Visitor anti-robot validation')
+        self.checkContent(r'Security check by BitNinja'),
+        self.checkContent(r'Visitor anti-robot validation')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'BlockDoS (BlockDoS)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'blockdos\.net'))
+        self.checkHeader(('Server', r'blockdos\.net'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
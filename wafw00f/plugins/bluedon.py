@@ -10,9 +10,9 @@ NAME = 'Bluedon (Bluedon IST)'
 def is_waf(self):
     schemes = [
         # Found sample servers returning 'Server: BDWAF/2.0'
-        self.matchHeader(('Server', r'BDWAF')),
-        self.matchContent(r'bluedon web application firewall')
+        self.checkHeader(('Server', r'BDWAF')),
+        self.checkContent(r'bluedon web application firewall')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,9 +9,9 @@ NAME = 'CacheFly CDN (CacheFly)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('BestCDN', r'Cachefly')),
-        self.matchCookie(r'^cfly_req.*=')
+        self.checkHeader(('BestCDN', r'Cachefly')),
+        self.checkCookie(r'^cfly_req.*=')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,14 +9,14 @@ NAME = 'CacheWall (Varnish)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'Varnish')),
-        self.matchHeader(('X-Varnish', '.+')),
-        self.matchHeader(('X-Cachewall-Action', '.+?')),
-        self.matchHeader(('X-Cachewall-Reason', '.+?')),
-        self.matchContent(r'security by cachewall'),
-        self.matchContent(r'403 naughty.{0,10}?not nice!'),
-        self.matchContent(r'varnish cache server')
+        self.checkHeader(('Server', 'Varnish')),
+        self.checkHeader(('X-Varnish', '.+')),
+        self.checkHeader(('X-Cachewall-Action', '.+?')),
+        self.checkHeader(('X-Cachewall-Reason', '.+?')),
+        self.checkContent(r'security by cachewall'),
+        self.checkContent(r'403 naughty.{0,10}?not nice!'),
+        self.checkContent(r'varnish cache server')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'CdnNS Application Gateway (CdnNs/WdidcNet)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'cdnnswaf application gateway')
+        self.checkContent(r'cdnnswaf application gateway')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,12 +9,12 @@ NAME = 'WP Cerber Security (Cerber Tech)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'your request looks suspicious or similar to automated'),
-        self.matchContent(r'our server stopped processing your request'),
-        self.matchContent(r'We.re sorry.{0,10}?you are not allowed to proceed'),
-        self.matchContent(r'requests from spam posting software'),
-        self.matchContent(r'<title>403 Access Forbidden')
+        self.checkContent(r'your request looks suspicious or similar to automated'),
+        self.checkContent(r'our server stopped processing your request'),
+        self.checkContent(r'We.re sorry.{0,10}?you are not allowed to proceed'),
+        self.checkContent(r'requests from spam posting software'),
+        self.checkContent(r'<title>403 Access Forbidden')
     ]
-    if all(i for i in schemes):
+    if self.matchAll(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'ChinaCache Load Balancer (ChinaCache)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Powered-By-ChinaCache', '.+'))
+        self.checkHeader(('Powered-By-ChinaCache', '.+'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
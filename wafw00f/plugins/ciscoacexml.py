@@ -9,8 +9,8 @@ NAME = 'ACE XML Gateway (Cisco)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'ACE XML Gateway'))
+        self.checkHeader(('Server', 'ACE XML Gateway'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
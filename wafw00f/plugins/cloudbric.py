@@ -9,14 +9,14 @@ NAME = 'Cloudbric (Penta Security)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'<title>Cloudbric.{0,5}?ERROR!'),
-        self.matchContent(r'Your request was blocked by Cloudbric'),
-        self.matchContent(r'please contact Cloudbric Support'),
-        self.matchContent(r'cloudbric\.zendesk\.com'),
-        self.matchContent(r'Cloudbric Help Center'),
-        self.matchContent(
+        self.checkContent(r'<title>Cloudbric.{0,5}?ERROR!'),
+        self.checkContent(r'Your request was blocked by Cloudbric'),
+        self.checkContent(r'please contact Cloudbric Support'),
+        self.checkContent(r'cloudbric\.zendesk\.com'),
+        self.checkContent(r'Cloudbric Help Center'),
+        self.checkContent(
             r'malformed request syntax.{0,4}?invalid request message framing.{0,4}?or deceptive request routing')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
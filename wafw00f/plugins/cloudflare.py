@@ -9,11 +9,11 @@ NAME = 'Cloudflare (Cloudflare Inc.)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('server', 'cloudflare')),
-        self.matchHeader(('server', r'cloudflare[-_]nginx')),
-        self.matchHeader(('cf-ray', r'.+?')),
-        self.matchCookie('__cfduid')
+        self.checkHeader(('server', 'cloudflare')),
+        self.checkHeader(('server', r'cloudflare[-_]nginx')),
+        self.checkHeader(('cf-ray', r'.+?')),
+        self.checkCookie('__cfduid')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'Comodo cWatch (Comodo CyberSecurity)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'Protected by COMODO WAF(.+)?'))
+        self.checkHeader(('Server', r'Protected by COMODO WAF(.+)?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'CrawlProtect (Jean-Denis Brun)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^crawlprotecttag='),
-        self.matchContent(r'<title>crawlprotect'),
-        self.matchContent(r'this site is protected by crawlprotect')
+        self.checkCookie(r'^crawlprotecttag='),
+        self.checkContent(r'<title>crawlprotect'),
+        self.checkContent(r'this site is protected by crawlprotect')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
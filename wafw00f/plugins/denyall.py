@@ -9,9 +9,9 @@ NAME = 'DenyALL (Rohde & Schwarz CyberSecurity)'
 
 def is_waf(self):
     schemes = [
-        self.matchStatus(200),
-        self.matchReason('Condition Intercepted')
+        self.checkStatus(200),
+        self.checkReason('Condition Intercepted')
     ]
-    if all(i for i in schemes):
+    if self.matchAll(schemes):
         return True
     return False
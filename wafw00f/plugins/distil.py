@@ -9,10 +9,10 @@ NAME = 'Distil (Distil Networks)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'cdn\.distilnetworks\.com/images/anomaly\.detected\.png'),
-        self.matchContent(r'distilCaptchaForm'),
-        self.matchContent(r'distilCallbackGuard')
+        self.checkContent(r'cdn\.distilnetworks\.com/images/anomaly\.detected\.png'),
+        self.checkContent(r'distilCaptchaForm'),
+        self.checkContent(r'distilCallbackGuard')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
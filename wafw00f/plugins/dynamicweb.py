@@ -9,9 +9,9 @@ NAME = 'DynamicWeb Injection Check (DynamicWeb)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-403-Status-By', r'dw.inj.check'), attack=True),
-        self.matchContent(r'by dynamic check(.{0,10}?module)?')
+        self.checkHeader(('X-403-Status-By', r'dw.inj.check'), attack=True),
+        self.checkContent(r'by dynamic check(.{0,10}?module)?')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,9 +9,9 @@ NAME = 'Edgecast (Verizon Digital Media)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'^ECD(.+)?')),
-        self.matchHeader(('Server', r'^ECS(.*)?'))
+        self.checkHeader(('Server', r'^ECD(.+)?')),
+        self.checkHeader(('Server', r'^ECS(.*)?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
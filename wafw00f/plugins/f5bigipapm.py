@@ -9,22 +9,22 @@ NAME = 'BIG-IP AP Manager (F5 Networks)'
 
 def is_waf(self):
     schema1 = [
-        self.matchCookie('^LastMRH_Session'),
-        self.matchCookie('^MRHSession')
+        self.checkCookie('^LastMRH_Session'),
+        self.checkCookie('^MRHSession')
     ]
     schema2 = [
-        self.matchCookie('^MRHSession'),
-        self.matchHeader(('Server', r'Big([-_])?IP'), attack=True)
+        self.checkCookie('^MRHSession'),
+        self.checkHeader(('Server', r'Big([-_])?IP'), attack=True)
     ]
     schema3 = [
-        self.matchCookie('^F5_fullWT'),
-        self.matchCookie('^F5_fullWT'),
-        self.matchCookie('^F5_HT_shrinked')
+        self.checkCookie('^F5_fullWT'),
+        self.checkCookie('^F5_fullWT'),
+        self.checkCookie('^F5_HT_shrinked')
     ]
-    if all(i for i in schema1):
+    if self.matchAll(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
-    if any(i for i in schema3):
+    if self.matchAny(schema3):
         return True
     return False
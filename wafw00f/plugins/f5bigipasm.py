@@ -9,9 +9,9 @@ NAME = 'BIG-IP AppSec Manager (F5 Networks)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent('the requested url was rejected'),
-        self.matchContent('please consult with your administrator')
+        self.checkContent('the requested url was rejected'),
+        self.checkContent('please consult with your administrator')
     ]
-    if all(i for i in schemes):
+    if self.matchAll(schemes):
         return True
     return False
@@ -9,15 +9,15 @@ NAME = 'FirePass (F5 Networks)'
 
 def is_waf(self):
     schema1 = [
-        self.matchCookie('^VHOST'),
-        self.matchHeader(('Location', r'\/my\.logon\.php3'))
+        self.checkCookie('^VHOST'),
+        self.checkHeader(('Location', r'\/my\.logon\.php3'))
     ]
     schema2 = [
-        self.matchCookie(r'^F5_fire.+?'),
-        self.matchCookie('^F5_passid_shrinked')
+        self.checkCookie(r'^F5_fire.+?'),
+        self.checkCookie('^F5_passid_shrinked')
     ]
-    if all(i for i in schema1):
+    if self.matchAll(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
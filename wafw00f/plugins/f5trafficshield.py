@@ -9,9 +9,9 @@ NAME = 'Trafficshield (F5 Networks)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie('^ASINFO='),
-        self.matchHeader(('Server', 'F5-TrafficShield'))
+        self.checkCookie('^ASINFO='),
+        self.checkHeader(('Server', 'F5-TrafficShield'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
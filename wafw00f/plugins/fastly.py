@@ -9,8 +9,8 @@ NAME = 'Fastly (Fastly CDN)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Fastly-Request-ID', r'\w+'))
+        self.checkHeader(('X-Fastly-Request-ID', r'\w+'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,19 +9,19 @@ NAME = 'FortiWeb (Fortinet)'
 
 def is_waf(self):
     schema1 = [
-        self.matchCookie(r'^FORTIWAFSID='),
-        self.matchContent('.fgd_icon')
+        self.checkCookie(r'^FORTIWAFSID='),
+        self.checkContent('.fgd_icon')
     ]
     schema2 = [
-        self.matchContent('fgd_icon'),
-        self.matchContent('web.page.blocked'),
-        self.matchContent('url'),
-        self.matchContent('attack.id'),
-        self.matchContent('message.id'),
-        self.matchContent('client.ip')
+        self.checkContent('fgd_icon'),
+        self.checkContent('web.page.blocked'),
+        self.checkContent('url'),
+        self.checkContent('attack.id'),
+        self.checkContent('message.id'),
+        self.checkContent('client.ip')
     ]
-    if any(i for i in schema1):
+    if self.matchAny(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
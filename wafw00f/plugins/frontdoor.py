@@ -9,8 +9,8 @@ NAME = 'Azure Front Door (Microsoft)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Azure-Ref', '.+?')),
+        self.checkHeader(('X-Azure-Ref', '.+?')),
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
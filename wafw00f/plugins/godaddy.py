@@ -9,8 +9,8 @@ NAME = 'GoDaddy Website Protection (GoDaddy)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'GoDaddy (security|website firewall)')
+        self.checkContent(r'GoDaddy (security|website firewall)')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,11 +9,11 @@ NAME = 'Huawei Cloud Firewall (Huawei)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^HWWAFSESID='),
-        self.matchHeader(('Server', r'HuaweiCloudWAF')),
-        self.matchContent(r'hwclouds\.com'),
-        self.matchContent(r'hws_security@')
+        self.checkCookie(r'^HWWAFSESID='),
+        self.checkHeader(('Server', r'HuaweiCloudWAF')),
+        self.checkContent(r'hwclouds\.com'),
+        self.checkContent(r'hws_security@')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'HyperGuard (Art of Defense)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie('^WODSESSION=')
+        self.checkCookie('^WODSESSION=')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'DataPower (IBM)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Backside-Transport', r'(OK|FAIL)'))
+        self.checkHeader(('X-Backside-Transport', r'(OK|FAIL)'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
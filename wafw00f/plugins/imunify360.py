@@ -9,11 +9,11 @@ NAME = 'Imunify360 (CloudLinux)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'imunify360.{0,10}?')),
-        self.matchContent(r'protected.by.{0,10}?imunify360'),
-        self.matchContent(r'powered.by.{0,10}?imunify360'),
-        self.matchContent(r'imunify360.preloader')
+        self.checkHeader(('Server', r'imunify360.{0,10}?')),
+        self.checkContent(r'protected.by.{0,10}?imunify360'),
+        self.checkContent(r'powered.by.{0,10}?imunify360'),
+        self.checkContent(r'imunify360.preloader')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,12 +9,12 @@ NAME = 'Incapsula (Imperva Inc.)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^incap_ses.*?='),
-        self.matchCookie(r'^visid_incap.*?='),
-        self.matchContent(r'incapsula incident id'),
-        self.matchContent(r'powered by incapsula'),
-        self.matchContent(r'/_Incapsula_Resource')
+        self.checkCookie(r'^incap_ses.*?='),
+        self.checkCookie(r'^visid_incap.*?='),
+        self.checkContent(r'incapsula incident id'),
+        self.checkContent(r'powered by incapsula'),
+        self.checkContent(r'/_Incapsula_Resource')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,17 +9,17 @@ NAME = 'Instart DX (Instart Logic)'
 
 def is_waf(self):
     schema1 = [
-        self.matchHeader(('X-Instart-Request-ID', '.+')),
-        self.matchHeader(('X-Instart-Cache', '.+')),
-        self.matchHeader(('X-Instart-WL', '.+'))
+        self.checkHeader(('X-Instart-Request-ID', '.+')),
+        self.checkHeader(('X-Instart-Cache', '.+')),
+        self.checkHeader(('X-Instart-WL', '.+'))
     ]
     schema2 = [
-        self.matchContent(r'the requested url was rejected'),
-        self.matchContent(r'please consult with your administrator'),
-        self.matchContent(r'your support id is')
+        self.checkContent(r'the requested url was rejected'),
+        self.checkContent(r'please consult with your administrator'),
+        self.checkContent(r'your support id is')
     ]
-    if any(i for i in schema1):
+    if self.matchAny(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'Janusec Application Gateway (Janusec)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'janusec application gateway')
+        self.checkContent(r'janusec application gateway')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,12 +9,12 @@ NAME = 'Jiasule (Jiasule)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'jiasule\-waf')),
-        self.matchCookie(r'^jsl_tracking(.+)?='),
-        self.matchCookie(r'__jsluid='),
-        self.matchContent(r'notice\-jiasule'),
-        self.matchContent(r'static\.jiasule\.com')
+        self.checkHeader(('Server', r'jiasule\-waf')),
+        self.checkCookie(r'^jsl_tracking(.+)?='),
+        self.checkCookie(r'__jsluid='),
+        self.checkContent(r'notice\-jiasule'),
+        self.checkContent(r'static\.jiasule\.com')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'KeyCDN (KeyCDN)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'KeyCDN'))
+        self.checkHeader(('Server', 'KeyCDN'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'KS-WAF (KnownSec)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'/ks[-_]waf[-_]error\.png')
+        self.checkContent(r'/ks[-_]waf[-_]error\.png')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -12,9 +12,9 @@ NAME = 'Kona SiteDefender (Akamai)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'AkamaiGHost')),
-        self.matchHeader(('Server', 'AkamaiGHost'), attack=True)
+        self.checkHeader(('Server', 'AkamaiGHost')),
+        self.checkHeader(('Server', 'AkamaiGHost'), attack=True)
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,9 +9,9 @@ NAME = 'LimeLight CDN (LimeLight)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^limelight'),
-        self.matchCookie(r'^l[mg]_sessid=')
+        self.checkCookie(r'^limelight'),
+        self.checkCookie(r'^l[mg]_sessid=')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,15 +9,15 @@ NAME = 'LiteSpeed (LiteSpeed Technologies)'
 
 def is_waf(self):
     schema1 = [
-        self.matchHeader(('Server', 'LiteSpeed')),
-        self.matchStatus(403)
+        self.checkHeader(('Server', 'LiteSpeed')),
+        self.checkStatus(403)
     ]
     schema2 = [
-        self.matchContent(r'Proudly powered by litespeed web server'),
-        self.matchContent(r'www\.litespeedtech\.com/error\-page')
+        self.checkContent(r'Proudly powered by litespeed web server'),
+        self.checkContent(r'www\.litespeedtech\.com/error\-page')
     ]
-    if all(i for i in schema1):
+    if self.matchAll(schema1):
         return True
-    if any(i for i in schema2):
+    if self.matchAny(schema2):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'MaxCDN (MaxCDN)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-CDN', r'maxcdn'))
+        self.checkHeader(('X-CDN', r'maxcdn'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'Mission Control Shield (Mission Control)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'Mission Control Application Shield'))
+        self.checkHeader(('Server', 'Mission Control Application Shield'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
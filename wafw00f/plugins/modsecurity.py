@@ -9,26 +9,26 @@ NAME = 'ModSecurity (SpiderLabs)'
 
 def is_waf(self):
     schema1 = [
-        self.matchHeader(('Server', r'(mod_security|Mod_Security|NOYB)')),
-        self.matchContent(r'This error was generated by Mod.?Security'),
-        self.matchContent(r'rules of the mod.security.module'),
-        self.matchContent(r'mod.security.rules triggered'),
-        self.matchContent(r'Protected by Mod.?Security'),
-        self.matchContent(r'/modsecurity[\-_]errorpage/'),
-        self.matchContent(r'modsecurity iis')
+        self.checkHeader(('Server', r'(mod_security|Mod_Security|NOYB)')),
+        self.checkContent(r'This error was generated by Mod.?Security'),
+        self.checkContent(r'rules of the mod.security.module'),
+        self.checkContent(r'mod.security.rules triggered'),
+        self.checkContent(r'Protected by Mod.?Security'),
+        self.checkContent(r'/modsecurity[\-_]errorpage/'),
+        self.checkContent(r'modsecurity iis')
     ]
     schema2 = [
-        self.matchReason('ModSecurity Action'),
-        self.matchStatus(403)
+        self.checkReason('ModSecurity Action'),
+        self.checkStatus(403)
     ]
     schema3 = [
-        self.matchReason('ModSecurity Action'),
-        self.matchStatus(406)
+        self.checkReason('ModSecurity Action'),
+        self.checkStatus(406)
     ]
-    if any(i for i in schema1):
+    if self.matchAny(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
-    if all(i for i in schema3):
+    if self.matchAll(schema3):
         return True
     return False
@@ -9,11 +9,11 @@ NAME = 'NAXSI (NBS Systems)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Data-Origin', r'^naxsi(.+)?')),
-        self.matchHeader(('Server', r'naxsi(.+)?')),
-        self.matchContent(r'blocked by naxsi'),
-        self.matchContent(r'naxsi blocked information')
+        self.checkHeader(('X-Data-Origin', r'^naxsi(.+)?')),
+        self.checkHeader(('Server', r'naxsi(.+)?')),
+        self.checkContent(r'blocked by naxsi'),
+        self.checkContent(r'naxsi blocked information')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'NetContinuum (Barracuda Networks)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^NCI__SessionId=')
+        self.checkCookie(r'^NCI__SessionId=')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
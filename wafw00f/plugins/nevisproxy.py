@@ -9,9 +9,9 @@ NAME = 'NevisProxy (AdNovum)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^Navajo'),
-        self.matchCookie(r'^NP_ID')
+        self.checkCookie(r'^Navajo'),
+        self.checkCookie(r'^NP_ID')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
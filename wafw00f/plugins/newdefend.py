@@ -11,11 +11,11 @@ def is_waf(self):
     schemes = [
         # This header can be obtained without attack mode
         # Most reliable fingerprint
-        self.matchHeader(('Server', 'Newdefend')),
+        self.checkHeader(('Server', 'Newdefend')),
         # Reliable ones within blockpage
-        self.matchContent(r'www\.newdefend\.com/feedback'),
-        self.matchContent(r'/nd\-block/')
+        self.checkContent(r'www\.newdefend\.com/feedback'),
+        self.checkContent(r'/nd\-block/')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
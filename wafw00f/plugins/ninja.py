@@ -9,9 +9,9 @@ NAME = 'NinjaFirewall (NinTechNet)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'<title>NinjaFirewall.{0,10}?\d{3}.forbidden'),
-        self.matchContent(r'For security reasons?.{0,10}?it was blocked and logged')
+        self.checkContent(r'<title>NinjaFirewall.{0,10}?\d{3}.forbidden'),
+        self.checkContent(r'For security reasons?.{0,10}?it was blocked and logged')
     ]
-    if all(i for i in schemes):
+    if self.matchAll(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'NSFocus (NSFocus Global Inc.)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'NSFocus'))
+        self.checkHeader(('Server', 'NSFocus'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'NullDDoS Protection (NullDDoS)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'NullDDoS(.System)?'))
+        self.checkHeader(('Server', r'NullDDoS(.System)?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,12 +9,12 @@ NAME = 'OnMessage Shield (BlackBaud)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Engine', 'onMessage Shield')),
-        self.matchContent(r'Blackbaud K\-12 conducts routine maintenance'),
-        self.matchContent(r'onMessage SHEILD'),
-        self.matchContent(r'maintenance\.blackbaud\.com'),
-        self.matchContent(r'status\.blackbaud\.com')
+        self.checkHeader(('X-Engine', 'onMessage Shield')),
+        self.checkContent(r'Blackbaud K\-12 conducts routine maintenance'),
+        self.checkContent(r'onMessage SHEILD'),
+        self.checkContent(r'maintenance\.blackbaud\.com'),
+        self.checkContent(r'status\.blackbaud\.com')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
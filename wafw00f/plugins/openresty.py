@@ -9,15 +9,15 @@ NAME = 'Open-Resty Lua Nginx (FLOSS)'
 
 def is_waf(self):
     schema1 = [
-        self.matchHeader(('Server', r'^openresty/[0-9\.]+?')),
-        self.matchStatus(403)
+        self.checkHeader(('Server', r'^openresty/[0-9\.]+?')),
+        self.checkStatus(403)
     ]
     schema2 = [
-        self.matchContent(r'openresty/[0-9\.]+?'),
-        self.matchStatus(406)
+        self.checkContent(r'openresty/[0-9\.]+?'),
+        self.checkStatus(406)
     ]
-    if all(i for i in schema1):
+    if self.matchAll(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'PowerCDN (PowerCDN)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Via', r'(.*)?powercdn.com(.*)?')),
-        self.matchHeader(('X-Cache', r'(.*)?powercdn.com(.*)?')),
-        self.matchHeader(('X-CDN', r'PowerCDN'))
+        self.checkHeader(('Via', r'(.*)?powercdn.com(.*)?')),
+        self.checkHeader(('X-Cache', r'(.*)?powercdn.com(.*)?')),
+        self.checkHeader(('X-CDN', r'PowerCDN'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,9 +9,9 @@ NAME = 'Profense (ArmorLogic)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'Profense')),
-        self.matchCookie(r'^PLBSID=')
+        self.checkHeader(('Server', 'Profense')),
+        self.checkCookie(r'^PLBSID=')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
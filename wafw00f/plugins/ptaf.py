@@ -9,9 +9,9 @@ NAME = 'PT Application Firewall (Positive Technologies)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'<h1.{0,10}?Forbidden'),
-        self.matchContent(r'<pre>Request.ID:.{0,10}?\d{4}\-(\d{2})+.{0,15}?pre>')
+        self.checkContent(r'<h1.{0,10}?Forbidden'),
+        self.checkContent(r'<pre>Request.ID:.{0,10}?\d{4}\-(\d{2})+.{0,15}?pre>')
     ]
-    if all(i for i in schemes):
+    if self.matchAll(schemes):
         return True
     return False
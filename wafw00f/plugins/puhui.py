@@ -9,8 +9,8 @@ NAME = 'Puhui (Puhui)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'Puhui[\-_]?WAF'))
+        self.checkHeader(('Server', r'Puhui[\-_]?WAF'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
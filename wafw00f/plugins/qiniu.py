@@ -9,8 +9,8 @@ NAME = 'Qiniu (Qiniu CDN)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Qiniu-CDN', r'\d+?'))
+        self.checkHeader(('X-Qiniu-CDN', r'\d+?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,17 +9,17 @@ NAME = 'AppWall (Radware)'
 
 def is_waf(self):
     schema1 = [
-        self.matchContent(r'CloudWebSec\.radware\.com'),
-        self.matchHeader(('X-SL-CompState', '.+'))
+        self.checkContent(r'CloudWebSec\.radware\.com'),
+        self.checkHeader(('X-SL-CompState', '.+'))
     ]
     schema2 = [
-        self.matchContent(r'because we have detected unauthorized activity'),
-        self.matchContent(r'<title>Unauthorized Request Blocked'),
-        self.matchContent(r'if you believe that there has been some mistake'),
-        self.matchContent(r'\?Subject=Security Page.{0,10}?Case Number')
+        self.checkContent(r'because we have detected unauthorized activity'),
+        self.checkContent(r'<title>Unauthorized Request Blocked'),
+        self.checkContent(r'if you believe that there has been some mistake'),
+        self.checkContent(r'\?Subject=Security Page.{0,10}?Case Number')
     ]
-    if any(i for i in schema1):
+    if self.matchAny(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
@@ -9,16 +9,16 @@ NAME = 'Reblaze (Reblaze)'
 
 def is_waf(self):
     schema1 = [
-        self.matchCookie(r'^rbzid'),
-        self.matchHeader(('Server', 'Reblaze Secure Web Gateway'))
+        self.checkCookie(r'^rbzid'),
+        self.checkHeader(('Server', 'Reblaze Secure Web Gateway'))
     ]
     schema2 = [
-        self.matchContent(r'current session has been terminated'),
-        self.matchContent(r'do not hesitate to contact us'),
-        self.matchContent(r'access denied \(\d{3}\)')
+        self.checkContent(r'current session has been terminated'),
+        self.checkContent(r'do not hesitate to contact us'),
+        self.checkContent(r'access denied \(\d{3}\)')
     ]
-    if any(i for i in schema1):
+    if self.matchAny(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
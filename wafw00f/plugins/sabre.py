@@ -9,14 +9,14 @@ NAME = 'Sabre Firewall (Sabre)'
 
 def is_waf(self):
     schema1 = [
-        self.matchContent(r'dxsupport\.sabre\.com')
+        self.checkContent(r'dxsupport\.sabre\.com')
     ]
     schema2 = [
-        self.matchContent(r'<title>Application Firewall Error'),
-        self.matchContent(r'add some important details to the email for us to investigate')
+        self.checkContent(r'<title>Application Firewall Error'),
+        self.checkContent(r'add some important details to the email for us to investigate')
     ]
-    if any(i for i in schema1):
+    if self.matchAny(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'Safe3 Web Firewall (Safe3)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'Safe3 Web Firewall')),
-        self.matchHeader(('X-Powered-By', r'Safe3WAF/[\.0-9]+?')),
-        self.matchContent(r'Safe3waf/[0-9\.]+?')
+        self.checkHeader(('Server', 'Safe3 Web Firewall')),
+        self.checkHeader(('X-Powered-By', r'Safe3WAF/[\.0-9]+?')),
+        self.checkContent(r'Safe3waf/[0-9\.]+?')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,12 +9,12 @@ NAME = 'Safedog (SafeDog)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^safedog\-flow\-item='),
-        self.matchHeader(('Server', 'Safedog')),
-        self.matchContent(r'safedogsite/broswer_logo\.jpg'),
-        self.matchContent(r'404\.safedog\.cn/sitedog_stat.html'),
-        self.matchContent(r'404\.safedog\.cn/images/safedogsite/head\.png')
+        self.checkCookie(r'^safedog\-flow\-item='),
+        self.checkHeader(('Server', 'Safedog')),
+        self.checkContent(r'safedogsite/broswer_logo\.jpg'),
+        self.checkContent(r'404\.safedog\.cn/sitedog_stat.html'),
+        self.checkContent(r'404\.safedog\.cn/images/safedogsite/head\.png')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
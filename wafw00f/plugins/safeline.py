@@ -9,8 +9,8 @@ NAME = 'Safeline (Chaitin Tech.)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'safeline|<!\-\-\sevent id:')
+        self.checkContent(r'safeline|<!\-\-\sevent id:')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'SecKing (SecKing)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'secking(.?waf)?'))
+        self.checkHeader(('Server', r'secking(.?waf)?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
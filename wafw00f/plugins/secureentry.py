@@ -9,8 +9,8 @@ NAME = 'Secure Entry (United Security Providers)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'Secure Entry Server'))
+        self.checkHeader(('Server', 'Secure Entry Server'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
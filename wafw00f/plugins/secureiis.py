@@ -9,10 +9,10 @@ NAME = 'eEye SecureIIS (BeyondTrust)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'SecureIIS is an internet security application'),
-        self.matchContent(r'Download SecureIIS Personal Edition'),
-        self.matchContent(r'https?://www\.eeye\.com/Secure\-?IIS')
+        self.checkContent(r'SecureIIS is an internet security application'),
+        self.checkContent(r'Download SecureIIS Personal Edition'),
+        self.checkContent(r'https?://www\.eeye\.com/Secure\-?IIS')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
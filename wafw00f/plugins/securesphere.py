@@ -9,11 +9,11 @@ NAME = 'SecureSphere (Imperva Inc.)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'<(title|h2)>Error'),
-        self.matchContent(r'The incident ID is'),
-        self.matchContent(r"This page can't be displayed"),
-        self.matchContent(r'Contact support for additional information')
+        self.checkContent(r'<(title|h2)>Error'),
+        self.checkContent(r'The incident ID is'),
+        self.checkContent(r"This page can't be displayed"),
+        self.checkContent(r'Contact support for additional information')
     ]
-    if all(i for i in schemes):
+    if self.matchAll(schemes):
         return True
     return False
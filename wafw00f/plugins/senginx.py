@@ -9,8 +9,8 @@ NAME = 'SEnginx (Neusoft)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'SENGINX\-ROBOT\-MITIGATION')
+        self.checkContent(r'SENGINX\-ROBOT\-MITIGATION')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'Shield Security (One Dollar Plugin)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r"You were blocked by the Shield"),
-        self.matchContent(r"remaining transgression\(s\) against this site"),
-        self.matchContent(r"Something in the URL.{0,5}?Form or Cookie data wasn\'t appropriate")
+        self.checkContent(r"You were blocked by the Shield"),
+        self.checkContent(r"remaining transgression\(s\) against this site"),
+        self.checkContent(r"Something in the URL.{0,5}?Form or Cookie data wasn\'t appropriate")
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
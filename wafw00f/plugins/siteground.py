@@ -9,9 +9,9 @@ NAME = 'SiteGround (SiteGround)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r"Our system thinks you might be a robot!"),
-        self.matchContent(r'access is restricted due to a security rule')
+        self.checkContent(r"Our system thinks you might be a robot!"),
+        self.checkContent(r'access is restricted due to a security rule')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'SonicWall (Dell)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'SonicWALL')),
-        self.matchContent(r"<(title|h\d{1})>Web Site Blocked"),
-        self.matchContent(r'\+?nsa_banner')
+        self.checkHeader(('Server', 'SonicWALL')),
+        self.checkContent(r"<(title|h\d{1})>Web Site Blocked"),
+        self.checkContent(r'\+?nsa_banner')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,14 +9,14 @@ NAME = 'Squarespace (Squarespace)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'Squarespace')),
-        self.matchCookie(r'^SS_ANALYTICS_ID='),
-        self.matchCookie(r'^SS_MATTR='),
-        self.matchCookie(r'^SS_MID='),
-        self.matchCookie(r'SS_CVT='),
-        self.matchContent(r'status\.squarespace\.com'),
-        self.matchContent(r'BRICK\-\d{2}')
+        self.checkHeader(('Server', 'Squarespace')),
+        self.checkCookie(r'^SS_ANALYTICS_ID='),
+        self.checkCookie(r'^SS_MATTR='),
+        self.checkCookie(r'^SS_MID='),
+        self.checkCookie(r'SS_CVT='),
+        self.checkContent(r'status\.squarespace\.com'),
+        self.checkContent(r'BRICK\-\d{2}')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,16 +9,16 @@ NAME = 'Sucuri CloudProxy (Sucuri Inc.)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Sucuri-ID', r'.+?')),
-        self.matchHeader(('X-Sucuri-Cache', r'.+?')),
-        self.matchHeader(('Server', r'Sucuri(\-Cloudproxy)?')),
-        self.matchHeader(('X-Sucuri-Block', r'.+?'), attack=True),
-        self.matchContent(r"Access Denied.{0,6}?Sucuri Website Firewall"),
-        self.matchContent(r"<title>Sucuri WebSite Firewall.{0,6}?(CloudProxy)?.{0,6}?Access Denied"),
-        self.matchContent(r"sucuri\.net/privacy\-policy"),
-        self.matchContent(r"cdn\.sucuri\.net/sucuri[-_]firewall[-_]block\.css"),
-        self.matchContent(r'cloudproxy@sucuri\.net')
+        self.checkHeader(('X-Sucuri-ID', r'.+?')),
+        self.checkHeader(('X-Sucuri-Cache', r'.+?')),
+        self.checkHeader(('Server', r'Sucuri(\-Cloudproxy)?')),
+        self.checkHeader(('X-Sucuri-Block', r'.+?'), attack=True),
+        self.checkContent(r"Access Denied.{0,6}?Sucuri Website Firewall"),
+        self.checkContent(r"<title>Sucuri WebSite Firewall.{0,6}?(CloudProxy)?.{0,6}?Access Denied"),
+        self.checkContent(r"sucuri\.net/privacy\-policy"),
+        self.checkContent(r"cdn\.sucuri\.net/sucuri[-_]firewall[-_]block\.css"),
+        self.checkContent(r'cloudproxy@sucuri\.net')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
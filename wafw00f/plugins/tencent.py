@@ -9,8 +9,8 @@ NAME = 'Tencent Cloud Firewall (Tencent Technologies)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'waf\.tencent\-?cloud\.com/')
+        self.checkContent(r'waf\.tencent\-?cloud\.com/')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'Teros (Citrix Systems)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^st8id=')
+        self.checkCookie(r'^st8id=')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,9 +9,9 @@ NAME = 'TransIP Web Firewall (TransIP)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-TransIP-Backend', '.+')),
-        self.matchHeader(('X-TransIP-Balancer', '.+'))
+        self.checkHeader(('X-TransIP-Backend', '.+')),
+        self.checkHeader(('X-TransIP-Balancer', '.+'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,15 +9,15 @@ NAME = 'URLMaster SecurityCheck (iFinity/DotNetNuke)'
 
 def is_waf(self):
     schema1 = [
-        self.matchHeader(('X-UrlMaster-Debug', '.+')),
-        self.matchHeader(('X-UrlMaster-Ex', '.+')),
+        self.checkHeader(('X-UrlMaster-Debug', '.+')),
+        self.checkHeader(('X-UrlMaster-Ex', '.+')),
     ]
     schema2 = [
-        self.matchContent(r"Ur[li]RewriteModule"),
-        self.matchContent(r'SecurityCheck')
+        self.checkContent(r"Ur[li]RewriteModule"),
+        self.checkContent(r'SecurityCheck')
     ]
-    if any(i for i in schema1):
+    if self.matchAny(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
     return False
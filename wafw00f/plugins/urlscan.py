@@ -9,9 +9,9 @@ NAME = 'URLScan (Microsoft)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r"Rejected[-_]By[_-]UrlScan"),
-        self.matchContent(r'A custom filter or module.{0,4}?such as URLScan')
+        self.checkContent(r"Rejected[-_]By[_-]UrlScan"),
+        self.checkContent(r'A custom filter or module.{0,4}?such as URLScan')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
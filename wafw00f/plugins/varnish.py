@@ -9,8 +9,8 @@ NAME = 'Varnish (OWASP)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r'Request rejected by xVarnish\-WAF')
+        self.checkContent(r'Request rejected by xVarnish\-WAF')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
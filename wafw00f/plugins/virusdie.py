@@ -9,9 +9,9 @@ NAME = 'VirusDie (VirusDie LLC)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r"cdn\.virusdie\.ru/splash/firewallstop\.png"),
-        self.matchContent(r'copy.{0,10}?Virusdie\.ru')
+        self.checkContent(r"cdn\.virusdie\.ru/splash/firewallstop\.png"),
+        self.checkContent(r'copy.{0,10}?Virusdie\.ru')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
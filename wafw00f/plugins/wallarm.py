@@ -9,8 +9,8 @@ NAME = 'Wallarm (Wallarm Inc.)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'nginx[\-_]wallarm'))
+        self.checkHeader(('Server', r'nginx[\-_]wallarm'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
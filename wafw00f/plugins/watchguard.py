@@ -9,10 +9,10 @@ NAME = 'WatchGuard (WatchGuard Technologies)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'WatchGuard')),
-        self.matchContent(r"Request denied by WatchGuard Firewall"),
-        self.matchContent(r'WatchGuard Technologies Inc\.')
+        self.checkHeader(('Server', 'WatchGuard')),
+        self.checkContent(r"Request denied by WatchGuard Firewall"),
+        self.checkContent(r'WatchGuard Technologies Inc\.')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'WebARX (WebARX Security Solutions)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r"WebARX.{0,10}?Web Application Firewall"),
-        self.matchContent(r"www\.webarxsecurity\.com"),
-        self.matchContent(r'/wp\-content/plugins/webarx/includes/')
+        self.checkContent(r"WebARX.{0,10}?Web Application Firewall"),
+        self.checkContent(r"www\.webarxsecurity\.com"),
+        self.checkContent(r'/wp\-content/plugins/webarx/includes/')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
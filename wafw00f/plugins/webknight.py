@@ -9,25 +9,25 @@ NAME = 'WebKnight (AQTRONIX)'
 
 def is_waf(self):
     schema1 = [
-        self.matchStatus(999),
-        self.matchReason('No Hacking')
+        self.checkStatus(999),
+        self.checkReason('No Hacking')
     ]
     schema2 = [
-        self.matchStatus(404),
-        self.matchReason('Hack Not Found')
+        self.checkStatus(404),
+        self.checkReason('Hack Not Found')
     ]
     schema3 = [
-        self.matchContent(r'WebKnight Application Firewall Alert'),
-        self.matchContent(r'What is webknight\?'),
-        self.matchContent(r'AQTRONIX WebKnight is an application firewall'),
-        self.matchContent(r'WebKnight will take over and protect'),
-        self.matchContent(r'aqtronix\.com/WebKnight'),
-        self.matchContent(r'AQTRONIX.{0,10}?WebKnight'),
+        self.checkContent(r'WebKnight Application Firewall Alert'),
+        self.checkContent(r'What is webknight\?'),
+        self.checkContent(r'AQTRONIX WebKnight is an application firewall'),
+        self.checkContent(r'WebKnight will take over and protect'),
+        self.checkContent(r'aqtronix\.com/WebKnight'),
+        self.checkContent(r'AQTRONIX.{0,10}?WebKnight'),
     ]
-    if all(i for i in schema1):
+    if self.matchAll(schema1):
         return True
-    if all(i for i in schema2):
+    if self.matchAll(schema2):
         return True
-    if any(i for i in schema3):
+    if self.matchAny(schema3):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'WebLand (WebLand)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'protected by webland'))
+        self.checkHeader(('Server', r'protected by webland'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
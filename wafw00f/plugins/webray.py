@@ -9,9 +9,9 @@ NAME = 'RayWAF (WebRay Solutions)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'WebRay\-WAF')),
-        self.matchHeader(('DrivedBy', r'RaySrv.RayEng/[0-9\.]+?'))
+        self.checkHeader(('Server', r'WebRay\-WAF')),
+        self.checkHeader(('DrivedBy', r'RaySrv.RayEng/[0-9\.]+?'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'WebTotem (WebTotem)'
 
 def is_waf(self):
     schemes = [
-        self.matchContent(r"The current request was blocked.{0,8}?>WebTotem")
+        self.checkContent(r"The current request was blocked.{0,8}?>WebTotem")
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,8 +9,8 @@ NAME = 'West263 CDN (West263CDN)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-Cache', r'WS?T263CDN'))
+        self.checkHeader(('X-Cache', r'WS?T263CDN'))
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
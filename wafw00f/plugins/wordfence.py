@@ -9,11 +9,11 @@ NAME = 'Wordfence (Defiant)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'wf[_\-]?WAF')),
-        self.matchContent(r"Generated by Wordfence"),
-        self.matchContent(r'broke one of (the )?Wordfence (advanced )?blocking rules'),
-        self.matchContent(r"/plugins/wordfence")
+        self.checkHeader(('Server', r'wf[_\-]?WAF')),
+        self.checkContent(r"Generated by Wordfence"),
+        self.checkContent(r'broke one of (the )?Wordfence (advanced )?blocking rules'),
+        self.checkContent(r"/plugins/wordfence")
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
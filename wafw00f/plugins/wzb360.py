@@ -9,13 +9,13 @@ NAME = '360WangZhanBao (360 Technologies)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'qianxin\-waf')),
-        self.matchHeader(('WZWS-Ray', r'.+?')),
-        self.matchHeader(('X-Powered-By-360WZB', r'.+?')),
-        self.matchContent(r'wzws\-waf\-cgi/'),
-        self.matchContent(r'wangshan\.360\.cn'),
-        self.matchStatus(493)
+        self.checkHeader(('Server', r'qianxin\-waf')),
+        self.checkHeader(('WZWS-Ray', r'.+?')),
+        self.checkHeader(('X-Powered-By-360WZB', r'.+?')),
+        self.checkContent(r'wzws\-waf\-cgi/'),
+        self.checkContent(r'wangshan\.360\.cn'),
+        self.checkStatus(493)
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'XLabs Security WAF (XLabs)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('X-CDN', r'XLabs Security')),
-        self.matchHeader(('Secured', r'^By XLabs Security')),
-        self.matchHeader(('Server', r'XLabs[-_]?.?WAF'), attack=True)
+        self.checkHeader(('X-CDN', r'XLabs Security')),
+        self.checkHeader(('Secured', r'^By XLabs Security')),
+        self.checkHeader(('Server', r'XLabs[-_]?.?WAF'), attack=True)
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
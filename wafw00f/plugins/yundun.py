@@ -9,13 +9,13 @@ NAME = 'Yundun (Yundun)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'YUNDUN')),
-        self.matchHeader(('X-Cache', 'YUNDUN')),
-        self.matchCookie(r'^yd_cookie='),
-        self.matchContent(r'Blocked by YUNDUN Cloud WAF'),
-        self.matchContent(r'yundun\.com/yd[-_]http[_-]error/'),
-        self.matchContent(r'www\.yundun\.com/(static/js/fingerprint\d{1}?\.js)?')
+        self.checkHeader(('Server', 'YUNDUN')),
+        self.checkHeader(('X-Cache', 'YUNDUN')),
+        self.checkCookie(r'^yd_cookie='),
+        self.checkContent(r'Blocked by YUNDUN Cloud WAF'),
+        self.checkContent(r'yundun\.com/yd[-_]http[_-]error/'),
+        self.checkContent(r'www\.yundun\.com/(static/js/fingerprint\d{1}?\.js)?')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,9 +9,9 @@ NAME = 'Yunsuo (Yunsuo)'
 
 def is_waf(self):
     schemes = [
-        self.matchCookie(r'^yunsuo_session='),
-        self.matchContent(r'class=\"yunsuologo\"')
+        self.checkCookie(r'^yunsuo_session='),
+        self.checkContent(r'class=\"yunsuologo\"')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
@@ -9,10 +9,10 @@ NAME = 'Zenedge (Zenedge)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', 'ZENEDGE')),
-        self.matchHeader(('X-Zen-Fury', r'.+?')),
-        self.matchContent(r'/__zenedge/')
+        self.checkHeader(('Server', 'ZENEDGE')),
+        self.checkHeader(('X-Zen-Fury', r'.+?')),
+        self.checkContent(r'/__zenedge/')
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
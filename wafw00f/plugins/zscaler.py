@@ -9,14 +9,14 @@ NAME = 'ZScaler (Accenture)'
 
 def is_waf(self):
     schemes = [
-        self.matchHeader(('Server', r'ZScaler')),
-        self.matchContent(r"Access Denied.{0,10}?Accenture Policy"),
-        self.matchContent(r'policies\.accenture\.com'),
-        self.matchContent(r'login\.zscloud\.net/img_logo_new1\.png'),
-        self.matchContent(r'Zscaler to protect you from internet threats'),
-        self.matchContent(r"Internet Security by ZScaler"),
-        self.matchContent(r"Accenture.{0,10}?webfilters indicate that the site likely contains")
+        self.checkHeader(('Server', r'ZScaler')),
+        self.checkContent(r"Access Denied.{0,10}?Accenture Policy"),
+        self.checkContent(r'policies\.accenture\.com'),
+        self.checkContent(r'login\.zscloud\.net/img_logo_new1\.png'),
+        self.checkContent(r'Zscaler to protect you from internet threats'),
+        self.checkContent(r"Internet Security by ZScaler"),
+        self.checkContent(r"Accenture.{0,10}?webfilters indicate that the site likely contains")
     ]
-    if any(i for i in schemes):
+    if self.matchAny(schemes):
         return True
     return False
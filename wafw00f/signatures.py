@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+'''
+Copyright (C) 2020, WAFW00F Developers.
+See the LICENSE file for copying permission.
+'''
+
+# Declarative WAF signatures.
+#
+# A signature describes one WAF the way a plugin's is_waf() does, as data:
+#
+#   {
+#     "name": "ModSecurity (SpiderLabs)",
+#     "schemas": [
+#       {"match": "any", "rules": [
+#         {"type": "header", "name": "Server", "regex": "mod_security", "attack": false},
+#         {"type": "content", "regex": "This error was generated by Mod.?Security", "attack": true}
+#       ]},
+#       {"match": "all", "rules": [
+#         {"type": "reason", "reason": "ModSecurity Action", "attack": true},
+#         {"type": "status", "status": 403, "attack": true}
+#       ]}
+#     ]
+#   }
+#
+# The WAF is detected when any schema matches; a schema matches when any or
+# all of its rules do. "attack" selects the response to the attack probe
+# instead of the normal response. Rule types are "header" (name, regex),
+# "cookie" (regex, matched against Set-Cookie), "status", "reason" and
+# "content" (regex, matched against the body). Regexes are case-insensitive.
+#
+# Run `python -m wafw00f.signatures` to convert the bundled plugins.
+
+import io
+import json
+import os
+import sys
+
+from wafw00f.manager import load_plugins
+
+RULE_FIELDS = {
+    'header': ('name', 'regex'),
+    'cookie': ('regex',),
+    'status': ('status',),
+    'reason': ('reason',),
+    'content': ('regex',),
+}
+
+
+class SchemaRecorder(object):
+    """
+    Stand-in for a WAFW00F instance that records the schemas a plugin's
+    is_waf() builds instead of evaluating them. Every schema is reported as
+    not matching, so all of them are visited.
+    """
+
+    def __init__(self):
+        self.schemas = []
+
+    def checkHeader(self, headermatch, attack=False):
+        header, match = headermatch
+        return dict(type='header', name=header, regex=match, attack=attack)
+
+    def checkCookie(self, match, attack=False):
+        return dict(type='cookie', regex=match, attack=attack)
+
+    def checkStatus(self, statuscode, attack=True):
+        return dict(type='status', status=statuscode, attack=attack)
+
+    def checkReason(self, reasoncode, attack=True):
+        return dict(type='reason', reason=reasoncode, attack=attack)
+
+    def checkContent(self, regex, attack=True):
+        return dict(type='content', regex=regex, attack=attack)
+
+    def matchAny(self, checks):
+        self.schemas.append(dict(match='any', rules=list(checks)))
+        return False
+
+    def matchAll(self, checks):
+        self.schemas.append(dict(match='all', rules=list(checks)))
+        return False
+
+    def __getattr__(self, name):
+        # Anything else (eager matchers, requests, ...) cannot be expressed
+        # declaratively
+        raise NotImplementedError(name)
+
+
+def convert_plugin(plugin_module):
+    """
+    Convert a plugin module into a signature, or return None if its
+    is_waf() does more than combine checks with matchAny/matchAll.
+    """
+    recorder = SchemaRecorder()
+    try:
+        if plugin_module.is_waf(recorder) is not False:
+            return None
+    except Exception:
+        return None
+    signature = dict(name=plugin_module.NAME, schemas=recorder.schemas)
+    validate_signature(signature)
+    return signature
+
+
+def convert_plugins(plugin_dict):
+    """
+    Convert all plugins, returning the signatures and the plugin modules
+    that could not be converted.
+    """
+    signatures = []
+    unconverted = []
+    for plugin_module in plugin_dict.values():
+        signature = convert_plugin(plugin_module)
+        if signature is None:
+            unconverted.append(plugin_module)
+        else:
+            signatures.append(signature)
+    return signatures, unconverted
+
+
+def validate_signature(signature):
+    """
+    Raise ValueError if `signature` is not a well-formed signature.
+    """
+    name = signature.get('name')
+    if not name:
+        raise ValueError('Signature without a name: %r' % (signature,))
+    for schema in signature.get('schemas', ()):
+        if schema.get('match') not in ('any', 'all'):
+            raise ValueError('%s: schema match must be "any" or "all"' % name)
+        for rule in schema.get('rules', ()):
+            fields = RULE_FIELDS.get(rule.get('type'))
+            if fields is None:
+                raise ValueError('%s: unknown rule type %r' % (name, rule.get('type')))
+            for field in fields:
+                if field not in rule:
+                    raise ValueError('%s: %s rule without %r' % (name, rule['type'], field))
+
+
+def load_signatures(path):
+    """
+    Load the signatures from a JSON file, or from every JSON file in a
+    directory.
+    """
+    if os.path.isdir(path):
+        signatures = []
+        for filename in sorted(os.listdir(path)):
+            if filename.endswith('.json'):
+                signatures.extend(load_signatures(os.path.join(path, filename)))
+        return signatures
+    with io.open(path, 'r', encoding='utf-8') as f:
+        signatures = json.load(f)
+    if isinstance(signatures, dict):
+        signatures = [signatures]
+    for signature in signatures:
+        validate_signature(signature)
+    return signatures
+
+
+def dump_signatures(signatures, f):
+    json.dump(signatures, f, indent=2, ensure_ascii=False)
+    f.write('\n')
+
+
+if __name__ == '__main__':
+    signatures, unconverted = convert_plugins(load_plugins())
+    dump_signatures(signatures, sys.stdout)
+    for plugin_module in unconverted:
+        sys.stderr.write('Could not convert %s\n' % plugin_module.NAME)